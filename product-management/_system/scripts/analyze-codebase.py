@@ -2,26 +2,70 @@
 """
 Codebase Analysis Script with Intelligent Caching
 Analyzes TERP codebase incrementally to minimize cost
+
+Usage:
+    python3 analyze-codebase.py
+    python3 analyze-codebase.py --jobs 8
+    python3 analyze-codebase.py impact server/_core/db.ts --depth 2
+    python3 analyze-codebase.py queries --rule query-in-loop
+    python3 analyze-codebase.py watch
 """
 
+import argparse
+import bisect
+import ctypes
+import ctypes.util
+import errno
 import json
 import hashlib
+import mmap
 import os
+import posixpath
+import re
+import select
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Set
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Callable, Iterable, Tuple, Optional
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Cross-platform file locking
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    # Windows doesn't have fcntl, use msvcrt instead
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
 
 # Configuration
 PROJECT_ROOT = Path("/home/ubuntu/TERP")
 PM_ROOT = PROJECT_ROOT / "product-management"
-CACHE_FILE = PM_ROOT / "_system/cache/analysis-cache.json"
+CACHE_DIR = PM_ROOT / "_system/cache/analysis"
+MANIFEST_FILE = CACHE_DIR / "manifest.json"
+ANALYSIS_LOCK = CACHE_DIR / ".analysis.lock"
 OUTPUT_FILE = PM_ROOT / "codebase/snapshot.json"
+SNAPSHOT_META_FILE = PM_ROOT / "codebase/snapshot.meta.json"
+DELTA_DIR = PM_ROOT / "codebase/deltas"
+GRAPH_FILE = PM_ROOT / "codebase/import-graph.json"
 
 # Directories to analyze
 ANALYZE_DIRS = [
     "client/src",
     "server",
     "drizzle",
+    "shared",
     "docs"
 ]
 
@@ -32,6 +76,54 @@ ANALYZE_EXTENSIONS = {
     ".sql"
 }
 
+# Files per task handed to a worker process
+MAX_BATCH_SIZE = 256
+
+# Content digest; xxhash is used when installed, BLAKE2b otherwise
+HASH_ALGORITHM = "xxh3_128" if xxhash else "blake2b"
+
+# Bump when analyze_file_lightweight output changes; results stored under
+# another version are never reused
+ANALYZER_VERSION = "5"
+
+# Analysis results live in <OBJECTS_DIR>/<hash prefix>.json
+OBJECTS_DIR = CACHE_DIR / "objects" / f"{HASH_ALGORITHM}-v{ANALYZER_VERSION}"
+SHARD_PREFIX_LENGTH = 2
+
+# Days a result with no file pointing at it is kept (reverts stay hits)
+CACHE_RETENTION_DAYS = 30
+
+# Import path aliases (tsconfig.json "paths" / vite.config.ts "alias")
+IMPORT_ALIASES = {
+    "@/": "client/src/",
+    "@shared/": "shared/",
+    "@assets/": "attached_assets/"
+}
+
+# Candidates tried, in order, when resolving an import to a project file
+RESOLVE_SUFFIXES = (
+    "", ".ts", ".tsx", ".js", ".jsx", ".json",
+    "/index.ts", "/index.tsx", "/index.js", "/index.jsx"
+)
+
+# Watch mode: seconds of quiet before a burst of events is processed, and
+# the longest a burst may be held back
+WATCH_DEBOUNCE = 0.5
+WATCH_MAX_DELAY = 5.0
+# Stat-scan interval when inotify is unavailable or out of watches
+WATCH_POLL_INTERVAL = 5.0
+
+# Deltas kept in DELTA_DIR; consumers further behind reload the snapshot
+DELTA_RETENTION = 100
+
+# Analysis fields that depend on the path or stat, not on file content;
+# they are rebuilt on every run instead of being stored
+PATH_FIELDS = ("path", "type", "size", "modified")
+
+# Files at least this large are hashed through mmap instead of read() calls
+MMAP_THRESHOLD = 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+
 # Ignore patterns
 IGNORE_PATTERNS = {
     "node_modules",
@@ -43,40 +135,148 @@ IGNORE_PATTERNS = {
 }
 
 
-def load_cache() -> Dict:
-    """Load existing analysis cache"""
-    if CACHE_FILE.exists():
-        with open(CACHE_FILE) as f:
-            return json.load(f)
-    return {
-        "schema_version": "1.0",
-        "last_full_analysis": None,
-        "last_incremental_update": None,
-        "file_hashes": {},
-        "analysis_results": {},
-        "metadata": {
-            "total_files": 0,
-            "analyzed_files": 0,
-            "cache_hit_rate": 0,
-            "last_analysis_duration": None
+class AnalysisStore:
+    """
+    Content-addressed analysis results, sharded by hash prefix
+
+    Results are keyed by file content hash, so renames and reverts hit the
+    cache. Only shards that received new entries are rewritten on save.
+    """
+    
+    def __init__(self, root: Path):
+        self.root = root
+        self._shards = {}
+        self._dirty = set()
+    
+    def _load_shard(self, prefix: str) -> Dict:
+        if prefix not in self._shards:
+            shard_file = self.root / f"{prefix}.json"
+            try:
+                with open(shard_file) as f:
+                    self._shards[prefix] = json.load(f)
+            except (OSError, ValueError):
+                self._shards[prefix] = {}
+        return self._shards[prefix]
+    
+    def get(self, file_hash: str) -> Optional[Dict]:
+        entry = self._load_shard(file_hash[:SHARD_PREFIX_LENGTH]).get(file_hash)
+        return entry["analysis"] if entry else None
+    
+    def put(self, file_hash: str, analysis: Dict):
+        prefix = file_hash[:SHARD_PREFIX_LENGTH]
+        self._load_shard(prefix)[file_hash] = {
+            "stored": datetime.now().date().isoformat(),
+            "analysis": analysis
         }
-    }
+        self._dirty.add(prefix)
+    
+    def save(self, referenced: Set[str]) -> int:
+        """
+        Write shards that changed; returns how many were written
+
+        Entries no file points at are kept for CACHE_RETENTION_DAYS so a
+        revert is still a hit, then dropped the next time their shard is
+        rewritten.
+        """
+        if not self._dirty:
+            return 0
+        
+        self.root.mkdir(parents=True, exist_ok=True)
+        cutoff = (datetime.now() - timedelta(days=CACHE_RETENTION_DAYS)).date().isoformat()
+        for prefix in sorted(self._dirty):
+            shard = {
+                file_hash: entry
+                for file_hash, entry in sorted(self._shards[prefix].items())
+                if file_hash in referenced or entry.get("stored", "") >= cutoff
+            }
+            write_json_atomic(self.root / f"{prefix}.json", shard, separators=(',', ':'))
+        
+        written = len(self._dirty)
+        self._dirty.clear()
+        return written
+
+
+@contextmanager
+def locked(f):
+    """Hold an exclusive lock on an open file (cross-platform)"""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    elif msvcrt:
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield f
+    finally:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        elif msvcrt:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json_atomic(path: Path, data, **dump_args):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file"""
+    tmp_file = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(data, f, **dump_args)
+    os.replace(tmp_file, path)
+
+
+def load_manifest() -> Dict:
+    """Load the path -> (hash, stat) manifest"""
+    try:
+        with open(MANIFEST_FILE) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    
+    if (not manifest
+            or manifest.get("hash_algorithm") != HASH_ALGORITHM
+            or manifest.get("analyzer_version") != ANALYZER_VERSION):
+        # Hashes from another algorithm can't be compared with ours
+        return {
+            "schema_version": "2.0",
+            "hash_algorithm": HASH_ALGORITHM,
+            "analyzer_version": ANALYZER_VERSION,
+            "last_incremental_update": None,
+            "files": {}
+        }
+    return manifest
 
 
-def save_cache(cache: Dict):
-    """Save analysis cache"""
-    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(CACHE_FILE, 'w') as f:
-        json.dump(cache, f, indent=2)
+def save_manifest(manifest: Dict):
+    """Save the manifest atomically"""
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(MANIFEST_FILE, manifest, separators=(',', ':'))
+
+
+def new_hasher():
+    """Create a digest object for HASH_ALGORITHM"""
+    if xxhash:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=32)
 
 
 def get_file_hash(filepath: Path) -> str:
-    """Calculate SHA256 hash of file"""
-    sha256 = hashlib.sha256()
+    """Calculate content hash of file (see HASH_ALGORITHM)"""
+    hasher = new_hasher()
     with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+        else:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_file_stat(filepath: Path) -> Optional[List[int]]:
+    """Stat signature used to skip hashing: [mtime_ns, size, inode]"""
+    try:
+        st = filepath.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
 
 
 def should_ignore(path: Path) -> bool:
@@ -98,7 +298,815 @@ def get_files_to_analyze() -> List[Path]:
                 if not should_ignore(filepath):
                     files.append(filepath)
     
-    return files
+    # Sorted so every run (and every worker split) sees the same order
+    return sorted(files)
+
+
+def is_analyzed_path(path: Path) -> bool:
+    """Whether a path falls inside the set get_files_to_analyze walks"""
+    if path.suffix not in ANALYZE_EXTENSIONS or should_ignore(path):
+        return False
+    return any(path.is_relative_to(PROJECT_ROOT / dir_name) for dir_name in ANALYZE_DIRS)
+
+
+def files_after_events(old_files: Dict, touched: Set[str]) -> List[Path]:
+    """
+    File list from the manifest plus touched paths, without walking the tree
+
+    Touched paths that no longer exist drop out; new ones that fall inside
+    the analyzed set are added.
+    """
+    paths = set(old_files)
+    for path_str in touched:
+        filepath = PROJECT_ROOT / path_str
+        if filepath.is_file() and is_analyzed_path(filepath):
+            paths.add(path_str)
+        else:
+            paths.discard(path_str)
+    return sorted(PROJECT_ROOT / p for p in paths)
+
+
+# ---------------------------------------------------------------------------
+# Streaming TypeScript/JavaScript extractor
+# ---------------------------------------------------------------------------
+
+_COMMENT = rb"//[^\n]*|/\*.*?(?:\*/|\Z)"
+_STRING = rb"""'(?:\\.|[^'\\\n])*'?|"(?:\\.|[^"\\\n])*"?"""
+_TEMPLATE = rb"`(?:\\.|[^`\\])*`?"
+# A regex literal, recognised by the punctuator or `return` before it (a
+# `/` after an identifier or `)` is division). The match includes that
+# prefix; JSX closing tags (`</`) are not mistaken for a regex.
+_REGEX = rb"(?:[(,=:\[!&|?{};]|\breturn)[ \t]*/(?![/*])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/"
+
+# Any comment, string, template or regex literal, used to tell whether a position
+# on a line is code
+LITERAL_TOKEN_RE = re.compile(
+    rb"(?P<comment>" + _COMMENT + rb")"
+    rb"|(?P<string>" + _STRING + rb")"
+    rb"|(?P<template>" + _TEMPLATE + rb")"
+    rb"|(?P<regex>" + _REGEX + rb")",
+    re.DOTALL
+)
+
+# Top-level statements start at column 0 (prettier-formatted sources indent
+# everything nested). Both patterns begin with a literal, which the regex
+# engine searches for at memchr speed.
+STATEMENT_RE = re.compile(rb"\n(?P<keyword>import|export|function|async|class|const|let|var)(?![\w$])")
+FIRST_STATEMENT_RE = re.compile(rb"(?P<keyword>import|export|function|async|class|const|let|var)(?![\w$])")
+DYNAMIC_IMPORT_RE = re.compile(rb"import(?=\s*\()")
+
+# Fine scan: every token, used only inside a declaration
+FINE_TOKEN_RE = re.compile(
+    rb"\s*(?:(?P<comment>" + _COMMENT + rb")"
+    rb"|(?P<string>" + _STRING + rb")"
+    rb"|(?P<template>" + _TEMPLATE + rb")"
+    rb"|(?P<name>[A-Za-z_$][\w$]*)"
+    rb"|(?P<punct>=>|\.\.\.|[^\s\w$]))",
+    re.DOTALL
+)
+
+JS_EXTENSIONS = {".ts", ".tsx", ".js", ".jsx"}
+JSX_EXTENSIONS = {".tsx", ".jsx"}
+
+# Calls whose result is a component: const Foo = memo(...)
+COMPONENT_WRAPPERS = {b"memo", b"forwardRef", b"React", b"lazy"}
+
+# Keywords after `export` that declare a single named type-level entity
+NAMED_DECLARATIONS = {b"interface", b"type", b"enum", b"namespace", b"module"}
+
+
+def _inside_literal(content: bytes, line_start: int, pos: int) -> bool:
+    """Whether pos falls inside a comment, string or regex that starts on its line"""
+    for match in LITERAL_TOKEN_RE.finditer(content, line_start):
+        if match.start() >= pos:
+            return False
+        if match.end() > pos:
+            return True
+    return False
+
+
+def _template_end(content: bytes, start: int) -> int:
+    """End offset of the template literal opening at start"""
+    pos = start + 1
+    while True:
+        close = content.find(b"`", pos)
+        if close == -1:
+            return len(content)
+        backslashes = 0
+        while content[close - 1 - backslashes] == 0x5C:
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return close + 1
+        pos = close + 1
+
+
+def multiline_literals(content: bytes) -> List[Tuple[int, int]]:
+    """
+    Spans of block comments and template literals, the only tokens that can
+    hide a line start
+
+    Openers are found with bytes.find; only the line prefix before an opener
+    is tokenized, to rule out a backtick or /* inside a string, regex literal
+    or // comment.
+    """
+    spans = []
+    length = len(content)
+    pos = 0
+    next_tick = content.find(b"`")
+    next_block = content.find(b"/*")
+    
+    while next_tick != -1 or next_block != -1:
+        if next_block == -1 or (next_tick != -1 and next_tick < next_block):
+            opener, is_block = next_tick, False
+        else:
+            opener, is_block = next_block, True
+        
+        line_start = max(pos, content.rfind(b"\n", 0, opener) + 1)
+        if _inside_literal(content, line_start, opener):
+            end = opener + 1
+        else:
+            if is_block:
+                close = content.find(b"*/", opener + 2)
+                end = length if close == -1 else close + 2
+            else:
+                end = _template_end(content, opener)
+            spans.append((opener, end))
+            pos = end
+        
+        if next_tick != -1 and next_tick < end:
+            next_tick = content.find(b"`", end)
+        if next_block != -1 and next_block < end:
+            next_block = content.find(b"/*", end)
+    
+    return spans
+
+
+class _Scanner:
+    """Cursor over a source buffer; offsets are byte offsets"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.pos = 0
+        self._line = 1
+        self._line_pos = 0
+
+    def statements(self):
+        """
+        Top-level statement keywords and dynamic imports, in order, as
+        (kind, value, offset)
+
+        Candidates inside block comments or template literals are dropped,
+        as are ones already consumed by the previous statement.
+        """
+        content = self.content
+        spans = multiline_literals(content)
+        span_starts = [start for start, _ in spans]
+        
+        def hidden(offset):
+            i = bisect.bisect_right(span_starts, offset) - 1
+            return i >= 0 and offset < spans[i][1]
+        
+        candidates = []
+        first = FIRST_STATEMENT_RE.match(content)
+        if first:
+            candidates.append((0, "keyword", first.group("keyword"), first.end()))
+        for match in STATEMENT_RE.finditer(content):
+            candidates.append((match.start("keyword"), "keyword", match.group("keyword"), match.end()))
+        for match in DYNAMIC_IMPORT_RE.finditer(content):
+            offset = match.start()
+            if offset and (content[offset - 1:offset].isalnum() or content[offset - 1:offset] in b"_$."):
+                continue
+            line_start = max(0, content.rfind(b"\n", 0, offset) + 1)
+            if not _inside_literal(content, line_start, offset):
+                candidates.append((offset, "dynamic", b"import", match.end()))
+        candidates.sort()
+        
+        for offset, kind, value, end in candidates:
+            if offset < self.pos or hidden(offset):
+                continue
+            self.pos = end
+            yield kind, value, offset
+
+    def fine(self):
+        """Next token of any kind, skipping comments"""
+        while True:
+            match = FINE_TOKEN_RE.match(self.content, self.pos)
+            if not match or match.lastgroup is None:
+                self.pos = len(self.content)
+                return None
+            self.pos = match.end()
+            kind = match.lastgroup
+            if kind != "comment":
+                return kind, match.group(kind), match.start(kind)
+
+    def peek(self, n: int = 1):
+        """Look n fine tokens ahead without consuming them"""
+        saved = self.pos
+        token = None
+        for _ in range(n):
+            token = self.fine()
+            if token is None:
+                break
+        self.pos = saved
+        return token
+
+    def accept(self, value: bytes) -> bool:
+        """Consume the next fine token if it is value"""
+        token = self.peek()
+        if token and token[1] == value:
+            self.fine()
+            return True
+        return False
+
+    def line_of(self, offset: int) -> int:
+        """1-based line of an offset; cheap for non-decreasing offsets"""
+        if offset < self._line_pos:
+            self._line, self._line_pos = 1, 0
+        self._line += self.content.count(b"\n", self._line_pos, offset)
+        self._line_pos = offset
+        return self._line
+
+
+def _text(value: bytes) -> str:
+    return value.decode("utf-8", "replace")
+
+
+def _unquote(value: bytes) -> str:
+    return _text(value[1:-1] if len(value) >= 2 and value[-1:] == value[:1] else value[1:])
+
+
+class _Extractor:
+    """Single pass over a TS/JS buffer collecting imports, exports and components"""
+
+    def __init__(self, content: bytes, jsx: bool):
+        self.scan = _Scanner(content)
+        self.jsx = jsx
+        self.result = {
+            "imports": [],
+            "exports": [],
+            "components": [],
+            "functions": [],
+            "symbols": []
+        }
+        self._sources = set()
+
+    def record(self, kind: str, offset: int, **fields):
+        symbol = {"kind": kind, **fields, "offset": offset, "line": self.scan.line_of(offset)}
+        self.result["symbols"].append(symbol)
+        if kind in ("import", "reexport"):
+            if fields["source"] not in self._sources:
+                self._sources.add(fields["source"])
+                self.result["imports"].append(fields["source"])
+        elif kind == "export":
+            self.result["exports"].append(fields["name"])
+        elif kind == "component":
+            self.result["components"].append(fields["name"])
+        elif kind == "function":
+            self.result["functions"].append(fields["name"])
+
+    def run(self) -> Dict:
+        scan = self.scan
+        for kind, value, offset in scan.statements():
+            if value == b"import":
+                self.parse_import(offset, dynamic=kind == "dynamic")
+            elif value == b"export":
+                self.parse_export(offset)
+            elif value in (b"function", b"async"):
+                self.parse_function(value, offset, exported=False)
+            elif value == b"class":
+                self.parse_class(offset, exported=False)
+            else:
+                self.parse_declaration(offset, exported=False)
+        return self.result
+
+    def parse_import(self, offset: int, dynamic: bool):
+        """import ... from 'x' | import 'x' | import('x')"""
+        scan = self.scan
+        nxt = scan.peek()
+        if nxt is None or nxt[1] == b".":
+            return  # import.meta
+        if nxt[1] == b"(":
+            after = scan.peek(2)
+            if after and after[0] == "string":
+                self.record("import", offset, source=_unquote(after[1]), dynamic=True)
+            return
+        if dynamic:
+            return
+        while True:
+            token = scan.fine()
+            if token is None or token[1] == b";":
+                return
+            if token[0] == "string":
+                self.record("import", offset, source=_unquote(token[1]))
+                return
+
+    def parse_export(self, offset: int):
+        scan = self.scan
+        token = scan.fine()
+        if token is None:
+            return
+        kind, value, _ = token
+        
+        if value == b"*":
+            # export * from 'x' | export * as ns from 'x'
+            name = None
+            if scan.accept(b"as"):
+                name = _text(scan.fine()[1])
+            self.parse_reexport_source(offset, [name] if name else [])
+        elif value == b"{":
+            names = self.parse_export_list()
+            if scan.peek() and scan.peek()[1] == b"from":
+                self.parse_reexport_source(offset, names)
+            else:
+                for name in names:
+                    self.record("export", offset, name=name)
+        elif value == b"default":
+            nxt = scan.peek()
+            if nxt and nxt[1] in (b"function", b"async"):
+                self.parse_function(scan.fine()[1], offset, exported=True, default=True)
+            elif nxt and nxt[1] in (b"class", b"abstract"):
+                scan.accept(b"abstract")
+                scan.fine()
+                self.parse_class(offset, exported=True, default=True)
+            else:
+                self.record("export", offset, name="default", default=True)
+        elif value in (b"function", b"async"):
+            self.parse_function(value, offset, exported=True)
+        elif value in (b"class", b"abstract"):
+            if value == b"abstract":
+                scan.accept(b"class")
+            self.parse_class(offset, exported=True)
+        elif value in (b"const", b"let", b"var"):
+            self.parse_declaration(offset, exported=True)
+        elif value == b"declare":
+            # export declare const|function|class|... : treat like the bare form
+            nxt = scan.peek()
+            if nxt and nxt[1] in (b"const", b"let", b"var"):
+                scan.fine()
+                self.parse_declaration(offset, exported=True)
+            elif nxt and nxt[1] in (b"function", b"async"):
+                self.parse_function(scan.fine()[1], offset, exported=True)
+            elif nxt and nxt[1] == b"class":
+                scan.fine()
+                self.parse_class(offset, exported=True)
+            elif nxt and nxt[1] in NAMED_DECLARATIONS:
+                scan.fine()
+                self.parse_named(offset)
+        elif value in NAMED_DECLARATIONS:
+            if value == b"type" and scan.peek() and scan.peek()[1] in (b"{", b"*"):
+                # export type { A } [from 'x']
+                return self.parse_export(offset)
+            self.parse_named(offset)
+
+    def parse_named(self, offset: int):
+        """interface X / type X / enum X / namespace X"""
+        token = self.scan.peek()
+        if token and token[0] == "name":
+            self.scan.fine()
+            self.record("export", offset, name=_text(token[1]))
+
+    def parse_export_list(self) -> List[str]:
+        """{ a, b as c, type D } -> exported names; consumes the closing brace"""
+        scan = self.scan
+        names = []
+        while True:
+            token = scan.fine()
+            if token is None or token[1] == b"}":
+                return names
+            if token[0] not in ("name", "string"):
+                continue
+            name = token[1]
+            if name == b"type" and scan.peek() and scan.peek()[0] == "name" and scan.peek()[1] != b"as":
+                name = scan.fine()[1]
+            if scan.accept(b"as"):
+                name = scan.fine()[1]
+            names.append(_unquote(name) if name[:1] in (b"'", b'"') else _text(name))
+
+    def parse_reexport_source(self, offset: int, names: List[str]):
+        scan = self.scan
+        if not scan.accept(b"from"):
+            return
+        token = scan.fine()
+        if token and token[0] == "string":
+            source = _unquote(token[1])
+            self.record("reexport", offset, source=source, names=names)
+            for name in names:
+                self.record("export", offset, name=name)
+
+    def parse_function(self, keyword: bytes, offset: int, exported: bool, default: bool = False):
+        """[async] function [*] name(...)"""
+        scan = self.scan
+        if keyword == b"async" and not scan.accept(b"function"):
+            return
+        scan.accept(b"*")
+        token = scan.peek()
+        if token and token[0] == "name":
+            scan.fine()
+            name = _text(token[1])
+        else:
+            name = None
+        
+        if exported:
+            self.record("export", offset, name=name or "default", **({"default": True} if default else {}))
+        if name:
+            self.record_callable(name, offset)
+
+    def parse_class(self, offset: int, exported: bool, default: bool = False):
+        """class Name [extends React.Component]"""
+        scan = self.scan
+        token = scan.peek()
+        name = None
+        if token and token[0] == "name" and token[1] not in (b"extends", b"implements"):
+            scan.fine()
+            name = _text(token[1])
+        
+        if exported:
+            self.record("export", offset, name=name or "default", **({"default": True} if default else {}))
+        
+        if name and self.jsx and name[0].isupper() and scan.accept(b"extends"):
+            base = scan.fine()
+            while scan.accept(b"."):
+                base = scan.fine()
+            if base and base[1] in (b"Component", b"PureComponent"):
+                self.record("component", offset, name=name)
+
+    def parse_declaration(self, offset: int, exported: bool):
+        """const name [: Type] = value  |  const { a, b } = value"""
+        scan = self.scan
+        token = scan.fine()
+        if token is None:
+            return
+        
+        if token[1] in (b"{", b"["):
+            # Destructuring: every bound name is exported
+            names = self.parse_binding_pattern(token[1])
+            if exported:
+                for name in names:
+                    self.record("export", offset, name=name)
+            return
+        
+        if token[1] == b"enum":
+            # const enum X
+            return self.parse_named(offset) if exported else None
+        
+        if token[0] != "name":
+            return
+        name = _text(token[1])
+        if exported:
+            self.record("export", offset, name=name)
+        
+        # Skip a type annotation up to the top-level '='
+        nested = 0
+        while True:
+            nxt = scan.peek()
+            if nxt is None or (nested == 0 and nxt[1] in (b";", b",")):
+                return
+            if nested == 0 and nxt[1] == b"=":
+                scan.fine()
+                break
+            if nested == 0 and nxt[0] == "name" and nxt[1] in (b"const", b"let", b"var", b"export", b"function"):
+                return
+            if nxt[1] in (b"{", b"(", b"[", b"<"):
+                nested += 1
+            elif nxt[1] in (b"}", b")", b"]", b">"):
+                if nested == 0:
+                    return
+                nested -= 1
+            scan.fine()
+        
+        # Classify the initializer without consuming it
+        value = scan.peek()
+        if value is None:
+            return
+        callable_value = (
+            value[1] in (b"(", b"<", b"async", b"function")
+            or (value[0] == "name" and scan.peek(2) and scan.peek(2)[1] == b"=>")
+        )
+        if callable_value:
+            self.record_callable(name, offset)
+        elif self.jsx and name[0].isupper() and value[1] in COMPONENT_WRAPPERS:
+            self.record("component", offset, name=name)
+
+    def parse_binding_pattern(self, opener: bytes) -> List[str]:
+        """Names bound by { a, b: c, ...d } or [a, b]; consumes the pattern"""
+        scan = self.scan
+        names = []
+        nested = 1
+        previous = opener
+        while nested:
+            token = scan.fine()
+            if token is None:
+                break
+            kind, value, _ = token
+            if value in (b"{", b"["):
+                nested += 1
+            elif value in (b"}", b"]"):
+                nested -= 1
+            elif kind == "name":
+                nxt = scan.peek()
+                if not (nxt and nxt[1] == b":") and previous != b"=":
+                    names.append(_text(value))
+            previous = value
+        return names
+
+    def record_callable(self, name: str, offset: int):
+        """A function-valued declaration: a component in JSX files if capitalized"""
+        if self.jsx and name[0].isupper():
+            self.record("component", offset, name=name)
+        else:
+            self.record("function", offset, name=name)
+
+
+def extract_symbols(content: bytes, jsx: bool = False) -> Dict:
+    """
+    Extract imports, exports, components and functions from a TS/JS buffer
+
+    The buffer is walked once; comments, strings and template literals are
+    skipped as whole tokens. Every entry in "symbols" carries its byte offset
+    and line.
+    """
+    return _Extractor(content, jsx).run()
+
+
+# Query detector: drizzle calls awaited on a db / transaction handle
+QUERY_GATE_RE = re.compile(rb"await\s+(?:db|tx|trx)\s*\.")
+# Every alternative starts with a literal byte so the scan can skip ahead
+# by first character; tokens are told apart by that byte
+SCOPE_TOKEN_RE = re.compile(
+    rb"/(?:/[^\n]*|\*.*?(?:\*/|\Z))|'(?:\\.|[^'\\\n])*'?|\"(?:\\.|[^\"\\\n])*\"?|`(?:\\.|[^`\\])*`?"
+    rb"|a(?<![\w$]a)wait\s+(db|tx|trx)\s*\.\s*"
+    rb"(select|selectDistinct|insert|update|delete|execute|query)\b"
+    rb"|f(?<![\w$]f)or\s*(?:await\s*)?\(|w(?<![\w$]w)hile\s*\("
+    rb"|\.\s*(?:map|forEach|flatMap)\s*\(|\(|\)|\{|\}|;",
+    re.S
+)
+READ_METHODS = {b"select", b"selectDistinct", b"query"}
+BINDING_RE = re.compile(rb"^\s*(?:export\s+)?(?:const|let|var)\s+([^=]+?)\s*=", re.S)
+IDENTIFIER_RE = re.compile(rb"[A-Za-z_$][\w$]*")
+AGGREGATE_RE = re.compile(rb"\b(?:count|sum|avg|min|max)\s*\(")
+# Keyed reads are bounded by their keys: primary-key or foreign-key
+# equality, and inArray() batch lookups (the query-in-loop fix)
+ID_LOOKUP_RE = re.compile(rb"\beq\(\s*[\w$.]*\.(?:id|[a-z]\w*Id)\s*,|(?:\binArray|InArray)\s*\(")
+
+QUERY_RULES = {
+    "query-in-loop": "query inside a loop (N+1); batch it with inArray() or a join",
+    "sequential-queries": "independent queries awaited one after another; run them with Promise.all",
+    "unbounded-query": "read without a limit; add .limit() or paginate"
+}
+
+
+class _QueryDetector:
+    """Single pass over a TS buffer tracking block, paren and loop nesting"""
+    
+    def __init__(self, content: bytes):
+        self.content = content
+        self.findings = []
+        # Frames: [kind, statement start, queries in statement, run]
+        # kind is "block", "loop" (loop body or iterator callback),
+        # "paren" or "loophead"
+        self.stack = [["block", 0, [], None]]
+        self.loop_depth = 0
+    
+    def line_of(self, offset: int) -> int:
+        return self.content.count(b"\n", 0, offset) + 1
+    
+    def report(self, rule: str, offset: int, detail: str = ""):
+        self.findings.append({
+            "rule": rule,
+            "line": self.line_of(offset),
+            "message": QUERY_RULES[rule] + detail
+        })
+    
+    def brace_frame(self) -> List:
+        for frame in reversed(self.stack):
+            if frame[0] in ("block", "loop") and frame[1] is not None:
+                return frame
+        return self.stack[0]
+    
+    def run(self) -> List[Dict]:
+        if not QUERY_GATE_RE.search(self.content):
+            return []
+        
+        pending_loop = False
+        for m in SCOPE_TOKEN_RE.finditer(self.content):
+            first = m.group()[:1]
+            if first in b"/'\"`" and first:
+                continue
+            
+            body_follows = pending_loop
+            pending_loop = False
+            if first == b"a":
+                if self.loop_depth or body_follows:
+                    self.report("query-in-loop", m.start())
+                self.brace_frame()[2].append((m.start(), m.group(1), m.group(2)))
+            elif first == b"{":
+                self.stack.append(["loop" if body_follows else "block", m.end(), [], None])
+                self.loop_depth += body_follows
+            elif first == b"(":
+                self.stack.append(["paren", None, [], None])
+            elif first in b"fw":
+                self.stack.append(["loophead", None, [], None])
+            elif first == b".":
+                self.stack.append(["loop", None, [], None])
+                self.loop_depth += 1
+            elif first in b")}":
+                if len(self.stack) == 1:
+                    continue
+                frame = self.stack.pop()
+                if frame[0] == "loop":
+                    self.loop_depth -= 1
+                if frame[1] is not None:
+                    self.end_statement(frame, m.start())
+                    self.end_run(frame)
+                    parent = self.stack[-1]
+                    if parent[1] is not None:
+                        self.end_statement(parent, m.end())
+                pending_loop = frame[0] == "loophead"
+            else:
+                frame = self.stack[-1]
+                if frame[1] is not None:
+                    self.end_statement(frame, m.end())
+        
+        self.end_statement(self.stack[0], len(self.content))
+        self.end_run(self.stack[0])
+        return sorted(self.findings, key=lambda f: f["line"])
+    
+    def end_statement(self, frame: List, end: int):
+        start, queries = frame[1], frame[2]
+        frame[1] = end
+        frame[2] = []
+        if not queries:
+            self.end_run(frame)
+            return
+        
+        for offset, _, method in queries:
+            tail = self.content[offset:end]
+            if method == b"query":
+                unbounded = b".findMany(" in tail and b"limit:" not in tail
+            else:
+                unbounded = (method in READ_METHODS and b".limit(" not in tail
+                             and not AGGREGATE_RE.search(tail) and not ID_LOOKUP_RE.search(tail))
+            if unbounded:
+                self.report("unbounded-query", offset)
+        
+        # Reads on db (not a transaction, which runs on one connection)
+        # whose statement doesn't use the previous read's bindings
+        offset, receiver, method = queries[0]
+        text = self.content[start:end]
+        if len(queries) != 1 or receiver != b"db" or method not in READ_METHODS:
+            self.end_run(frame)
+            return
+        
+        run = frame[3]
+        if run and any(re.search(rb"(?<![\w$])" + re.escape(name) + rb"(?![\w$])", text)
+                       for name in run[2]):
+            self.end_run(frame)
+            run = None
+        binding = BINDING_RE.match(text)
+        names = set(IDENTIFIER_RE.findall(binding.group(1))) if binding else set()
+        if run:
+            run[1] += 1
+            run[2] |= names
+        else:
+            frame[3] = [offset, 1, names]
+    
+    def end_run(self, frame: List):
+        run = frame[3]
+        frame[3] = None
+        if run and run[1] >= 2:
+            self.report("sequential-queries", run[0], f" ({run[1]} queries)")
+
+
+def detect_query_patterns(content: bytes) -> List[Dict]:
+    """
+    Flag N+1 queries, sequential independent reads and unbounded selects
+
+    Works on drizzle calls awaited on db / tx handles. Findings carry the
+    rule, line and a short fix hint.
+    """
+    return _QueryDetector(content).run()
+
+
+# tRPC routers: `name = router({ ... })` / `key: router({ ... })`
+ROUTER_RE = re.compile(rb"(?:\b(?:const|let)\s+(\w+)\s*=\s*|\b(\w+)\s*:\s*)(?:\w+\.)?router\(\s*\{")
+ROUTER_TOKEN_RE = re.compile(
+    rb"/(?:/[^\n]*|\*.*?(?:\*/|\Z))|'(?:\\.|[^'\\\n])*'?|\"(?:\\.|[^\"\\\n])*\"?|`(?:\\.|[^`\\])*`?"
+    rb"|\.\s*(\w+)\s*\(|\(|\)|\{|\}|\[|\]|,",
+    re.S
+)
+ENTRY_KEY_RE = re.compile(rb"(?:\s|//[^\n]*|/\*.*?\*/)*[\"']?([\w$]+)[\"']?\s*:\s*", re.S)
+PROCEDURE_BASE_RE = re.compile(rb"(\w*[Pp]rocedure)\b")
+PROCEDURE_TYPES = (b"query", b"mutation", b"subscription")
+PERMISSION_RE = re.compile(rb"[\"']([\w:.*-]+)[\"']")
+
+
+def _router_entries(content: bytes, start: int) -> Tuple[List[Tuple[int, int, List]], int]:
+    """
+    Split the router object opening at start into top-level entries
+
+    Returns ([(entry_start, entry_end, chain_calls)], object_end) where
+    chain_calls lists (method, args_start, args_end) for `.method(...)`
+    calls made directly on the entry's value.
+    """
+    entries = []
+    depth = 0
+    entry_start = start + 1
+    calls = []
+    open_calls = []
+    for m in ROUTER_TOKEN_RE.finditer(content, start):
+        first = m.group()[:1]
+        if first in b"/'\"`" and first:
+            continue
+        if first == b"." or first in b"({[":
+            depth += 1
+            if first == b"." and depth == 2:
+                open_calls.append((m.group(1), m.end()))
+        elif first in b")}]":
+            depth -= 1
+            if depth == 1 and first == b")" and open_calls:
+                method, args_start = open_calls.pop()
+                calls.append((method, args_start, m.start()))
+            if depth == 0:
+                entries.append((entry_start, m.start(), calls))
+                return [e for e in entries if content[e[0]:e[1]].strip()], m.end()
+        elif first == b"," and depth == 1:
+            entries.append((entry_start, m.start(), calls))
+            entry_start = m.end()
+            calls = []
+            open_calls = []
+    entries.append((entry_start, len(content), calls))
+    return [e for e in entries if content[e[0]:e[1]].strip()], len(content)
+
+
+def extract_trpc(content: bytes) -> List[Dict]:
+    """
+    Extract tRPC routers and their procedures
+
+    Each router lists its procedures (name, query / mutation, access level
+    from the base procedure, input schema reference, required permissions,
+    line), the sub-routers mounted on its keys, and keys that re-export
+    another router's procedure (`list: coreRouter.list`). Routers declared
+    inline on a key are named "<parent>.<key>".
+    """
+    routers = []
+    by_offset = {}
+    for m in ROUTER_RE.finditer(content):
+        name = (m.group(1) or m.group(2)).decode()
+        router = {"name": name, "line": content.count(b"\n", 0, m.start()) + 1,
+                  "procedures": [], "mounts": {}, "reexports": {}}
+        by_offset[m.end() - 1] = router
+        routers.append(router)
+    
+    for open_brace, router in by_offset.items():
+        entries, _ = _router_entries(content, open_brace)
+        for entry_start, entry_end, calls in entries:
+            key = ENTRY_KEY_RE.match(content, entry_start)
+            if not key or key.end() > entry_end:
+                continue
+            name = key.group(1).decode()
+            value = content[key.end():entry_end].strip()
+            line = content.count(b"\n", 0, key.start(1)) + 1
+            
+            nested = by_offset.get(key.end() + value.find(b"{"))
+            if nested is not None and re.match(rb"(?:\w+\.)?router\(", value):
+                nested["name"] = f"{router['name']}.{name}"
+                router["mounts"][name] = nested["name"]
+                continue
+            if re.fullmatch(rb"[\w$]+", value):
+                router["mounts"][name] = value.decode()
+                continue
+            if re.fullmatch(rb"[\w$]+\.[\w$]+", value):
+                router["reexports"][name] = value.decode()
+                continue
+            
+            base = PROCEDURE_BASE_RE.match(value)
+            methods = [method for method, _, _ in calls]
+            kind = next((t.decode() for t in PROCEDURE_TYPES if t in methods), None)
+            if not base or not kind:
+                continue
+            
+            procedure = {
+                "name": name,
+                "type": kind,
+                "access": base.group(1)[:-len(b"Procedure")].decode() or "custom",
+                "input": None,
+                "permissions": [],
+                "line": line
+            }
+            for method, args_start, args_end in calls:
+                args = b" ".join(content[args_start:args_end].split())
+                if method == b"input":
+                    args = re.sub(rb"\s*\.\s*", b".", args)
+                    callee = re.match(rb"[\w$.]+", args)
+                    if callee and callee.end() == len(args):
+                        procedure["input"] = args.decode()
+                    elif callee:
+                        procedure["input"] = callee.group().decode() + "(...)"
+                elif method == b"use" and b"ermission" in args:
+                    procedure["permissions"].extend(p.decode() for p in PERMISSION_RE.findall(args))
+            router["procedures"].append(procedure)
+    
+    return [r for r in routers if r["procedures"] or r["mounts"] or r["reexports"]]
 
 
 def analyze_file_lightweight(filepath: Path) -> Dict:
@@ -111,8 +1119,8 @@ def analyze_file_lightweight(filepath: Path) -> Dict:
     analysis = {
         "path": str(relative_path),
         "type": filepath.suffix,
-        "size": filepath.stat().st_size,
-        "modified": datetime.fromtimestamp(filepath.stat().st_mtime).isoformat(),
+        "size": 0,
+        "modified": None,
         "lines": 0,
         "imports": [],
         "exports": [],
@@ -122,39 +1130,22 @@ def analyze_file_lightweight(filepath: Path) -> Dict:
     
     # Read file
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.split('\n')
-            analysis["lines"] = len(lines)
-            
-            # Extract imports (simple regex-like parsing)
-            for line in lines:
-                line = line.strip()
-                if line.startswith('import '):
-                    # Extract import source
-                    if 'from ' in line:
-                        parts = line.split('from ')
-                        if len(parts) > 1:
-                            source = parts[1].strip().strip("';\"")
-                            analysis["imports"].append(source)
-                
-                # Extract exports
-                if line.startswith('export '):
-                    if 'function ' in line or 'const ' in line or 'class ' in line:
-                        # Extract name
-                        parts = line.split()
-                        if len(parts) > 2:
-                            name = parts[2].split('(')[0].split('=')[0].strip()
-                            analysis["exports"].append(name)
-                
-                # Detect React components (simple heuristic)
-                if filepath.suffix in {'.tsx', '.jsx'}:
-                    if 'function ' in line and line.endswith('{'):
-                        parts = line.split('function ')
-                        if len(parts) > 1:
-                            name = parts[1].split('(')[0].strip()
-                            if name and name[0].isupper():
-                                analysis["components"].append(name)
+        stat = filepath.stat()
+        analysis["size"] = stat.st_size
+        analysis["modified"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
+        
+        content = filepath.read_bytes()
+        analysis["lines"] = content.count(b"\n") + 1
+        
+        if filepath.suffix in JS_EXTENSIONS:
+            analysis.update(extract_symbols(content, jsx=filepath.suffix in JSX_EXTENSIONS))
+            findings = detect_query_patterns(content)
+            if findings:
+                analysis["query_findings"] = findings
+            if b"router(" in content:
+                routers = extract_trpc(content)
+                if routers:
+                    analysis["trpc_routers"] = routers
     
     except Exception as e:
         analysis["error"] = str(e)
@@ -162,6 +1153,45 @@ def analyze_file_lightweight(filepath: Path) -> Dict:
     return analysis
 
 
+def chunked(items: List, size: int) -> Iterable[List]:
+    """Split a list into consecutive batches"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _hash_batch(paths: List[Path]) -> List[Tuple[str, str]]:
+    """Worker task: hash a batch of files"""
+    return [(str(p.relative_to(PROJECT_ROOT)), get_file_hash(p)) for p in paths]
+
+
+def _analyze_batch(paths: List[Path]) -> List[Tuple[str, Dict]]:
+    """Worker task: run lightweight analysis on a batch of files"""
+    return [(str(p.relative_to(PROJECT_ROOT)), analyze_file_lightweight(p)) for p in paths]
+
+
+def run_batched(task: Callable, paths: List[Path], jobs: int) -> Dict:
+    """
+    Run a batch task over paths, fanned out across worker processes
+
+    Batches are sized so each worker gets several, which evens out slow
+    files. Results are merged in path order, so the output is the same for
+    any number of jobs.
+    """
+    if not paths:
+        return {}
+    
+    if jobs <= 1 or len(paths) < 2:
+        pairs = task(paths)
+    else:
+        batch_size = max(1, min(MAX_BATCH_SIZE, len(paths) // (jobs * 4)))
+        pairs = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for batch_result in executor.map(task, chunked(paths, batch_size)):
+                pairs.extend(batch_result)
+    
+    return dict(sorted(pairs))
+
+
 def detect_module(filepath: Path) -> str:
     """Detect which module a file belongs to"""
     parts = filepath.parts
@@ -214,55 +1244,379 @@ def detect_module(filepath: Path) -> str:
     return 'other'
 
 
-def incremental_analysis() -> Dict:
+def load_snapshot_meta() -> Dict:
+    """Load the snapshot generation counter"""
+    try:
+        with open(SNAPSHOT_META_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"generation": 0, "generated": None}
+
+
+def delta_file(generation: int) -> Path:
+    """Path of the delta that produces the given generation"""
+    return DELTA_DIR / f"{generation:08d}.json"
+
+
+def diff_manifests(old_files: Dict, new_files: Dict) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Split paths into added, changed and removed between two manifests
+
+    A file record changes when its hash, mtime or size does.
+    """
+    added = [p for p in new_files if p not in old_files]
+    removed = [p for p in old_files if p not in new_files]
+    changed = [p for p in new_files if p in old_files and old_files[p][:3] != new_files[p][:3]]
+    return added, changed, removed
+
+
+def build_delta(added: List[str], changed: List[str], removed: List[str],
+                relinked: Set[str], snapshot: Dict) -> Optional[Dict]:
+    """
+    Build a delta against the previous snapshot
+
+    Module membership only changes when files are added or removed;
+    dependency entries are carried for every file whose import links moved,
+    including untouched files whose imports now resolve differently.
+    Returns None when no record changed.
+    """
+    if not (added or removed or changed):
+        return None
+    
+    files = snapshot["files"]
+    modules = {}
+    for key, paths in (("added", added), ("removed", removed)):
+        for path_str in paths:
+            module = detect_module(PROJECT_ROOT / path_str)
+            modules.setdefault(module, {"added": [], "removed": []})[key].append(path_str)
+    
+    return {
+        "schema_version": "1.0",
+        "generated": snapshot["generated"],
+        "added": {p: files[p] for p in added if p in files},
+        "changed": {p: files[p] for p in changed if p in files},
+        "removed": removed,
+        "modules": modules,
+        "dependencies": {
+            p: snapshot["dependencies"].get(p)
+            for p in sorted(set(added) | set(changed) | set(removed) | relinked)
+        },
+        "project": snapshot["project"],
+        "statistics": snapshot["statistics"],
+        "query_findings": snapshot["query_findings"]
+    }
+
+
+def apply_delta(snapshot: Dict, delta: Dict) -> Dict:
+    """Apply a delta to the snapshot of its base generation, in place"""
+    if snapshot.get("generation") != delta["base_generation"]:
+        raise ValueError(
+            f"Delta for generation {delta['generation']} needs base "
+            f"{delta['base_generation']}, snapshot is at {snapshot.get('generation')}"
+        )
+    
+    files = snapshot["files"]
+    for path_str in delta["removed"]:
+        files.pop(path_str, None)
+    files.update(delta["changed"])
+    if delta["added"]:
+        files.update(delta["added"])
+        snapshot["files"] = dict(sorted(files.items()))
+    
+    for path_str, deps in delta["dependencies"].items():
+        if deps:
+            snapshot["dependencies"][path_str] = deps
+        else:
+            snapshot["dependencies"].pop(path_str, None)
+    
+    for module, change in delta["modules"].items():
+        entry = snapshot["modules"].setdefault(module, {"file_count": 0, "files": []})
+        removed = set(change["removed"])
+        entry["files"] = sorted([p for p in entry["files"] if p not in removed] + change["added"])
+        entry["file_count"] = len(entry["files"])
+        if not entry["files"]:
+            del snapshot["modules"][module]
+    
+    for key in ("generated", "project", "statistics", "query_findings", "generation"):
+        snapshot[key] = delta[key]
+    return snapshot
+
+
+def load_snapshot(base: Optional[Dict] = None) -> Dict:
+    """
+    Return the current snapshot, reusing a cached copy when possible
+
+    If base is an earlier snapshot and every delta since its generation is
+    still on disk, the deltas are applied to it (mutating it); otherwise
+    snapshot.json is read in full.
+    """
+    current = load_snapshot_meta()["generation"]
+    if base is not None and base.get("generation") is not None:
+        pending = [delta_file(g) for g in range(base["generation"] + 1, current + 1)]
+        if base["generation"] <= current and all(p.exists() for p in pending):
+            for path in pending:
+                with open(path) as f:
+                    apply_delta(base, json.load(f))
+            return base
+    
+    with open(OUTPUT_FILE) as f:
+        return json.load(f)
+
+
+def write_delta(delta: Dict):
+    """Write a delta and prune ones older than DELTA_RETENTION generations"""
+    DELTA_DIR.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(delta_file(delta["generation"]), delta, indent=2)
+    
+    for path in DELTA_DIR.glob("*.json"):
+        if path.stem.isdigit() and int(path.stem) <= delta["generation"] - DELTA_RETENTION:
+            path.unlink()
+
+
+def link_file(path_str: str, imports: List[str], known: Set[str], roots: Set[str]) -> Dict:
+    """
+    Resolve a file's import specifiers against the analyzed file set
+
+    Relative, aliased and baseUrl-rooted imports that match a known file
+    become internal edges; bare specifiers are packages; anything else that
+    looks like a project path is kept as unresolved so it can be retried
+    when new files appear.
+    """
+    internal, external, unresolved = set(), [], []
+    for spec in imports:
+        if spec.startswith('.'):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(path_str), spec))
+        elif spec.split('/', 1)[0] in roots:
+            base = spec
+        else:
+            base = next((target + spec[len(alias):]
+                         for alias, target in IMPORT_ALIASES.items()
+                         if spec.startswith(alias)), None)
+        if base is None:
+            external.append(spec)
+            continue
+        
+        for suffix in RESOLVE_SUFFIXES:
+            if base + suffix in known:
+                internal.add(base + suffix)
+                break
+        else:
+            unresolved.append(spec)
+    
+    return {"internal": sorted(internal), "external": external, "unresolved": unresolved}
+
+
+def load_graph() -> Dict:
+    """Load the persisted import graph (forward links and reverse index)"""
+    try:
+        with open(GRAPH_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"schema_version": "1.0", "generation": None, "files": {}, "reverse": {}}
+
+
+def save_graph(graph: Dict):
+    """Save the import graph atomically"""
+    graph["files"] = dict(sorted(graph["files"].items()))
+    graph["reverse"] = dict(sorted(graph["reverse"].items()))
+    GRAPH_FILE.parent.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(GRAPH_FILE, graph, separators=(',', ':'))
+
+
+def update_graph(graph: Dict, results: Dict, relink: Iterable[str], removed: Iterable[str]) -> Set[str]:
+    """
+    Relink files and drop removed ones, keeping the reverse index in step
+
+    Returns the paths whose links changed.
+    """
+    known = set(results)
+    roots = {p.split('/', 1)[0] for p in known}
+    files = graph["files"]
+    reverse = graph["reverse"]
+    changed = set()
+    
+    def unlink(src: str):
+        for target in files[src]["internal"]:
+            sources = reverse.get(target, [])
+            index = bisect.bisect_left(sources, src)
+            if index < len(sources) and sources[index] == src:
+                del sources[index]
+            if not sources:
+                reverse.pop(target, None)
+    
+    for src in removed:
+        if src in files:
+            unlink(src)
+            del files[src]
+            changed.add(src)
+    
+    for src in relink:
+        if src not in results:
+            continue
+        links = link_file(src, results[src].get("imports", []), known, roots)
+        if files.get(src) == links:
+            continue
+        if src in files:
+            unlink(src)
+        files[src] = links
+        for target in links["internal"]:
+            bisect.insort(reverse.setdefault(target, []), src)
+        changed.add(src)
+    
+    return changed
+
+
+def impact(path: str, depth: Optional[int] = None) -> List[Tuple[int, str]]:
+    """
+    Files that import path, directly or transitively, from the reverse index
+
+    Returns (distance, path) pairs in breadth-first order, up to depth hops
+    (unlimited when None).
+    """
+    graph = load_graph()
+    if not graph["files"]:
+        raise FileNotFoundError(f"No import graph at {GRAPH_FILE}; run the analysis first")
+    
+    target = Path(path)
+    if target.is_absolute():
+        target = target.relative_to(PROJECT_ROOT)
+    target = posixpath.normpath(str(target))
+    if target not in graph["files"] and target not in graph["reverse"]:
+        raise KeyError(f"{target} is not in the import graph")
+    
+    reverse = graph["reverse"]
+    seen = {target}
+    frontier = [target]
+    found = []
+    distance = 0
+    while frontier and (depth is None or distance < depth):
+        distance += 1
+        next_frontier = []
+        for node in frontier:
+            for src in reverse.get(node, []):
+                if src not in seen:
+                    seen.add(src)
+                    next_frontier.append(src)
+        found.extend((distance, src) for src in sorted(next_frontier))
+        frontier = next_frontier
+    
+    return found
+
+
+def incremental_analysis(jobs: int = None, touched: Optional[Set[str]] = None) -> Dict:
     """
     Perform incremental codebase analysis
     Only re-analyze files that have changed
+    
+    Runs are serialised on ANALYSIS_LOCK: watch mode, a manual run and
+    system-context's refresh all read and bump the same generation,
+    manifest and deltas.
+    
+    Args:
+        jobs: Worker processes for hashing and analysis (default: all cores)
+        touched: Paths reported changed by a watcher; when given, the tree
+            is not walked and only these paths are stat'ed
     """
-    print("🔍 Starting incremental codebase analysis...")
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(ANALYSIS_LOCK, 'a') as lock, locked(lock):
+        return _incremental_analysis(jobs, touched)
+
+
+def _incremental_analysis(jobs: Optional[int], touched: Optional[Set[str]]) -> Dict:
+    jobs = jobs or os.cpu_count() or 1
+    print(f"🔍 Starting incremental codebase analysis ({jobs} job{'s' if jobs != 1 else ''})...")
     start_time = datetime.now()
     
-    # Load cache
-    cache = load_cache()
-    old_hashes = cache.get("file_hashes", {})
-    old_results = cache.get("analysis_results", {})
+    # Load manifest and content-addressed results
+    manifest = load_manifest()
+    old_files = manifest["files"]
+    store = AnalysisStore(OBJECTS_DIR)
     
     # Get all files to analyze
-    files = get_files_to_analyze()
-    print(f"📁 Found {len(files)} files to check")
+    if touched is None:
+        files = get_files_to_analyze()
+        print(f"📁 Found {len(files)} files to check")
+    else:
+        files = files_after_events(old_files, touched)
+        print(f"📁 {len(touched)} touched path(s), {len(files)} files tracked")
     
-    # Calculate new hashes and detect changes
+    # Tier 1: files whose (mtime_ns, size, inode) match the manifest are
+    # unchanged without reading them
     new_hashes = {}
+    new_stats = {}
+    to_hash = []
+    for filepath in files:
+        path_str = str(filepath.relative_to(PROJECT_ROOT))
+        entry = old_files.get(path_str)
+        if touched is not None and entry and path_str not in touched:
+            new_stats[path_str] = entry[1:]
+            new_hashes[path_str] = entry[0]
+            continue
+        stat = get_file_stat(filepath)
+        if stat is None:
+            continue
+        new_stats[path_str] = stat
+        if entry and entry[1:] == stat:
+            new_hashes[path_str] = entry[0]
+        else:
+            to_hash.append(filepath)
+    
+    # Tier 2: hash only files whose stat signature moved
+    print(f"#️⃣  Hashing {len(to_hash)} file(s) with changed stat signatures")
+    new_hashes.update(run_batched(_hash_batch, to_hash, jobs))
+    new_hashes = dict(sorted(new_hashes.items()))
+    
+    # Results are looked up by content, so a renamed or reverted file is a
+    # hit; identical files are analyzed once
+    content_results = {}
     changed_files = []
     unchanged_files = []
+    pending_hashes = set()
     
     for filepath in files:
         path_str = str(filepath.relative_to(PROJECT_ROOT))
-        file_hash = get_file_hash(filepath)
-        new_hashes[path_str] = file_hash
+        if path_str not in new_hashes:
+            continue
+        file_hash = new_hashes[path_str]
         
-        if path_str not in old_hashes or old_hashes[path_str] != file_hash:
+        if file_hash in content_results or file_hash in pending_hashes:
+            unchanged_files.append(filepath)
+            continue
+        cached = store.get(file_hash)
+        if cached is None:
+            pending_hashes.add(file_hash)
             changed_files.append(filepath)
         else:
+            content_results[file_hash] = cached
             unchanged_files.append(filepath)
     
     print(f"🔄 Changed files: {len(changed_files)}")
     print(f"✓ Unchanged files: {len(unchanged_files)}")
     
     # Analyze only changed files
-    new_results = {}
-    for filepath in changed_files:
-        path_str = str(filepath.relative_to(PROJECT_ROOT))
-        print(f"  Analyzing: {path_str}")
-        new_results[path_str] = analyze_file_lightweight(filepath)
+    new_results = run_batched(_analyze_batch, changed_files, jobs)
+    for path_str, analysis in new_results.items():
+        print(f"  Analyzed: {path_str}")
+        content = {k: v for k, v in analysis.items() if k not in PATH_FIELDS}
+        content_results[new_hashes[path_str]] = content
+        # A read failure says nothing about the content; don't pin it
+        if "error" not in content:
+            store.put(new_hashes[path_str], content)
     
-    # Merge with cached results
-    final_results = old_results.copy()
-    final_results.update(new_results)
-    
-    # Remove results for deleted files
-    current_paths = set(new_hashes.keys())
-    final_results = {k: v for k, v in final_results.items() if k in current_paths}
+    # Reattach path and stat fields, keeping path order stable
+    final_results = {}
+    for path_str, file_hash in new_hashes.items():
+        if file_hash not in content_results:
+            continue
+        mtime_ns, size, _ = new_stats[path_str]
+        analysis = {
+            "path": path_str,
+            "type": Path(path_str).suffix,
+            "size": size,
+            "modified": datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
+        }
+        analysis.update(content_results[file_hash])
+        final_results[path_str] = analysis
     
     # Build module map
     modules = {}
@@ -273,25 +1627,54 @@ def incremental_analysis() -> Dict:
             modules[module] = []
         modules[module].append(path_str)
     
-    # Build dependency graph (simple version)
+    # Diff against the previous manifest; without a matching generation
+    # there is no trustworthy base and everything counts as added
+    new_files = {path_str: [file_hash] + new_stats[path_str]
+                 for path_str, file_hash in new_hashes.items()}
+    meta = load_snapshot_meta()
+    generation = meta["generation"]
+    chained = manifest.get("generation") == generation
+    if chained:
+        records_added, records_changed, records_removed = diff_manifests(old_files, new_files)
+    else:
+        records_added, records_changed, records_removed = list(new_files), [], []
+    
+    # Update the import graph: relink touched files, importers of removed
+    # files and, when files appear, imports that didn't resolve before
+    graph = load_graph()
+    if chained and graph.get("generation") == generation:
+        relink = set(records_added) | set(records_changed)
+        for path_str in records_removed:
+            relink.update(graph["reverse"].get(path_str, []))
+        if records_added:
+            relink.update(src for src, links in graph["files"].items() if links["unresolved"])
+        relinked = update_graph(graph, final_results, sorted(relink), records_removed)
+    else:
+        graph = {"schema_version": "1.0", "generation": None, "files": {}, "reverse": {}}
+        relinked = update_graph(graph, final_results, final_results, [])
+    
+    # Build dependency map: resolved project files, then packages
     dependencies = {}
-    for path_str, analysis in final_results.items():
-        deps = []
-        for imp in analysis.get("imports", []):
-            # Convert relative imports to absolute paths
-            if imp.startswith('.'):
-                # Resolve relative import
-                pass  # Simplified for now
-            else:
-                deps.append(imp)
-        if deps:
-            dependencies[path_str] = deps
+    for path_str in final_results:
+        links = graph["files"].get(path_str)
+        if links and (links["internal"] or links["external"]):
+            dependencies[path_str] = links["internal"] + links["external"]
     
     # Calculate statistics
     total_lines = sum(a.get("lines", 0) for a in final_results.values())
     total_components = sum(len(a.get("components", [])) for a in final_results.values())
     total_exports = sum(len(a.get("exports", [])) for a in final_results.values())
     
+    # Query detector totals, tracked per release
+    query_findings = {"total": 0, "by_rule": {rule: 0 for rule in QUERY_RULES}, "by_file": {}}
+    for path_str, analysis in final_results.items():
+        findings = analysis.get("query_findings")
+        if findings:
+            query_findings["total"] += len(findings)
+            query_findings["by_file"][path_str] = len(findings)
+            for finding in findings:
+                query_findings["by_rule"][finding["rule"]] += 1
+    
     # Build snapshot
     snapshot = {
         "schema_version": "1.0",
@@ -303,9 +1686,11 @@ def incremental_analysis() -> Dict:
             "total_files": len(final_results),
             "total_lines": total_lines,
             "total_components": total_components,
-            "total_exports": total_exports
+            "total_exports": total_exports,
+            "total_query_findings": query_findings["total"]
         },
         "statistics": {
+            "files_hashed": len(to_hash),
             "files_analyzed": len(changed_files),
             "files_cached": len(unchanged_files),
             "cache_hit_rate": len(unchanged_files) / len(files) if files else 0,
@@ -319,26 +1704,43 @@ def incremental_analysis() -> Dict:
             for module, files in modules.items()
         },
         "files": final_results,
-        "dependencies": dependencies
+        "dependencies": dependencies,
+        "query_findings": query_findings
     }
     
-    # Update cache
-    cache["file_hashes"] = new_hashes
-    cache["analysis_results"] = final_results
-    cache["last_incremental_update"] = datetime.now().isoformat()
-    cache["metadata"] = {
-        "total_files": len(files),
-        "analyzed_files": len(changed_files),
-        "cache_hit_rate": snapshot["statistics"]["cache_hit_rate"],
-        "last_analysis_duration": snapshot["statistics"]["analysis_duration_seconds"]
-    }
+    # Update cache: only touched shards, and the manifest only if it moved.
+    # A delta needs the manifest to describe the previous snapshot; after a
+    # reset (new hash algorithm or analyzer version) the chain is broken
+    # and consumers fall back to the full snapshot.
+    shards_written = store.save(set(new_hashes.values()))
+    snapshot["statistics"]["shards_written"] = shards_written
+    delta = None
+    if new_files != old_files or not chained:
+        if chained:
+            delta = build_delta(records_added, records_changed, records_removed, relinked, snapshot)
+        if delta or not chained:
+            generation += 1
+        manifest["files"] = new_files
+        manifest["generation"] = generation
+        manifest["last_incremental_update"] = datetime.now().isoformat()
+        save_manifest(manifest)
+    if relinked or graph["generation"] != generation:
+        graph["generation"] = generation
+        save_graph(graph)
+    snapshot["generation"] = generation
     
-    save_cache(cache)
+    # Save delta, then snapshot, then the generation counter, so a reader
+    # that sees generation N can always load it
+    if delta:
+        delta["base_generation"] = generation - 1
+        delta["generation"] = generation
+        write_delta(delta)
     
-    # Save snapshot
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(snapshot, f, indent=2)
+    write_json_atomic(OUTPUT_FILE, snapshot, indent=2)
+    
+    if generation != meta["generation"]:
+        write_json_atomic(SNAPSHOT_META_FILE, {"generation": generation, "generated": snapshot["generated"]}, indent=2)
     
     # Print summary
     print(f"\n✅ Analysis complete!")
@@ -346,11 +1748,229 @@ def incremental_analysis() -> Dict:
     print(f"   Analyzed: {len(changed_files)}")
     print(f"   Cached: {len(unchanged_files)}")
     print(f"   Cache hit rate: {snapshot['statistics']['cache_hit_rate']:.1%}")
+    print(f"   Query findings: {query_findings['total']}")
     print(f"   Duration: {snapshot['statistics']['analysis_duration_seconds']:.1f}s")
+    print(f"   Generation: {generation}" + (f" (delta: {delta_file(generation)})" if delta else ""))
     print(f"   Saved to: {OUTPUT_FILE}")
     
     return snapshot
 
 
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class WatchLimitError(OSError):
+    """inotify is unavailable or out of instances/watches"""
+
+
+class _Inotify:
+    """Minimal inotify binding over libc via ctypes"""
+    
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if libc is None or not hasattr(libc, "inotify_init1"):
+            raise WatchLimitError(errno.ENOSYS, "inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise WatchLimitError(code, f"inotify_init1: {os.strerror(code)}")
+        self.dirs = {}
+    
+    def add_tree(self, root: Path) -> List[Path]:
+        """Watch root and every non-ignored directory below it; returns files found"""
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORE_PATTERNS]
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                code = ctypes.get_errno()
+                raise WatchLimitError(code, f"inotify_add_watch {dirpath}: {os.strerror(code)}")
+            self.dirs[wd] = Path(dirpath)
+            found.extend(Path(dirpath) / name for name in filenames)
+        return found
+    
+    def read(self, timeout: Optional[float]) -> List[Tuple[Optional[Path], int]]:
+        """Wait up to timeout seconds and return (path, mask) events"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        
+        events = []
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = buffer[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            path = directory / os.fsdecode(name) if directory and name else directory
+            events.append((path, mask))
+        return events
+    
+    def close(self):
+        os.close(self.fd)
+
+
+def watch(jobs: int = None, debounce: float = WATCH_DEBOUNCE,
+          poll_interval: float = WATCH_POLL_INTERVAL):
+    """
+    Keep the snapshot current, publishing a new generation per burst of edits
+
+    Uses inotify on the analyzed directories and hands only the touched
+    paths to incremental_analysis. Events are debounced so a git checkout
+    becomes one generation. Falls back to periodic stat-scans if inotify is
+    unavailable or runs out of watches.
+    """
+    incremental_analysis(jobs=jobs)
+    
+    notifier = None
+    try:
+        notifier = _Inotify()
+        for dir_name in ANALYZE_DIRS:
+            if (PROJECT_ROOT / dir_name).exists():
+                notifier.add_tree(PROJECT_ROOT / dir_name)
+    except WatchLimitError as e:
+        if notifier:
+            notifier.close()
+        print(f"⚠️  {e.strerror}; falling back to stat-scans every {poll_interval:g}s")
+        print("   (raise fs.inotify.max_user_watches to enable event-driven updates)")
+        _poll(jobs, poll_interval)
+        return
+    
+    print(f"👀 Watching {len(notifier.dirs)} directories (Ctrl+C to stop)")
+    touched = set()
+    rescan = False
+    first_event = None
+    try:
+        while True:
+            events = notifier.read(debounce if first_event else None)
+            for path, mask in events:
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                elif path is None:
+                    continue
+                elif mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and not should_ignore(path):
+                        # Files can land before the watch does; pick them up
+                        for filepath in notifier.add_tree(path):
+                            touched.add(str(filepath.relative_to(PROJECT_ROOT)))
+                    elif mask & IN_MOVED_FROM:
+                        rescan = True
+                elif path.suffix in ANALYZE_EXTENSIONS:
+                    touched.add(str(path.relative_to(PROJECT_ROOT)))
+            
+            if events and first_event is None and (touched or rescan):
+                first_event = time.monotonic()
+            quiet = not events
+            overdue = first_event and time.monotonic() - first_event >= WATCH_MAX_DELAY
+            if first_event and (quiet or overdue):
+                incremental_analysis(jobs=jobs, touched=None if rescan else touched)
+                touched = set()
+                rescan = False
+                first_event = None
+    except WatchLimitError as e:
+        print(f"⚠️  {e.strerror}; falling back to stat-scans every {poll_interval:g}s")
+        notifier.close()
+        _poll(jobs, poll_interval)
+    except KeyboardInterrupt:
+        notifier.close()
+        print("\n👋 Stopped watching")
+
+
+def _poll(jobs: int, poll_interval: float):
+    """Stat-scan fallback for watch(): the stat tier makes no-op runs cheap"""
+    try:
+        while True:
+            time.sleep(poll_interval)
+            incremental_analysis(jobs=jobs)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+
 if __name__ == "__main__":
-    snapshot = incremental_analysis()
+    parser = argparse.ArgumentParser(description="Incremental TERP codebase analysis")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Worker processes for hashing and analysis (default: all cores)")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    impact_parser = subparsers.add_parser("impact", help="List files affected by changing a file")
+    impact_parser.add_argument("path", help="File path, relative to the project root")
+    impact_parser.add_argument("--depth", "-d", type=int, default=None,
+                               help="Maximum import hops to follow (default: unlimited)")
+    impact_parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    
+    queries_parser = subparsers.add_parser("queries", help="List N+1 / unbatched query findings")
+    queries_parser.add_argument("--rule", choices=sorted(QUERY_RULES), help="Only show one rule")
+    queries_parser.add_argument("--path", help="Only show files under this path prefix")
+    
+    watch_parser = subparsers.add_parser("watch", help="Keep the snapshot current as files change")
+    watch_parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE,
+                              help=f"Seconds of quiet before re-analyzing (default: {WATCH_DEBOUNCE})")
+    watch_parser.add_argument("--poll-interval", type=float, default=WATCH_POLL_INTERVAL,
+                              help=f"Stat-scan interval without inotify (default: {WATCH_POLL_INTERVAL})")
+    
+    args = parser.parse_args()
+    
+    if args.command == "impact":
+        try:
+            affected = impact(args.path, args.depth)
+        except (FileNotFoundError, KeyError) as e:
+            print(f"❌ {e.args[0]}")
+            sys.exit(1)
+        
+        if args.json:
+            print(json.dumps([{"depth": d, "path": p} for d, p in affected], indent=2))
+        elif not affected:
+            print(f"✓ Nothing imports {args.path}")
+        else:
+            print(f"💥 {len(affected)} file(s) affected by {args.path}:")
+            for distance, path_str in affected:
+                print(f"  {'  ' * (distance - 1)}[{distance}] {path_str}")
+    elif args.command == "queries":
+        snapshot = load_snapshot()
+        summary = snapshot.get("query_findings")
+        if summary is None:
+            # Snapshots written before the query detector have no findings
+            print("❌ Snapshot has no query findings; run analyze-codebase.py to refresh it")
+            sys.exit(1)
+        shown = 0
+        for path_str, analysis in snapshot["files"].items():
+            if args.path and not path_str.startswith(args.path):
+                continue
+            for finding in analysis.get("query_findings", []):
+                if args.rule and finding["rule"] != args.rule:
+                    continue
+                print(f"{path_str}:{finding['line']}: [{finding['rule']}] {finding['message']}")
+                shown += 1
+        print(f"\n📊 {shown} shown, {summary['total']} total: "
+              + ", ".join(f"{rule} {count}" for rule, count in summary["by_rule"].items()))
+    elif args.command == "watch":
+        watch(jobs=args.jobs, debounce=args.debounce, poll_interval=args.poll_interval)
+    else:
+        snapshot = incremental_analysis(jobs=args.jobs)
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark Harness
+
+Generates synthetic initiatives, evaluations and feedback documents shaped like
+the PM markdown templates, indexes them with search.py and measures index build
+time, index size, query latency (p50/p99), peak RSS and relevance (nDCG@10).
+
+Each scale runs in its own process so peak RSS is reported per scale.
+
+Usage:
+    python3 benchmark-search.py                          # 10^2, 10^4 and 10^5 documents
+    python3 benchmark-search.py --scales 100 10000
+    python3 benchmark-search.py --output /tmp/search-bench.json
+    python3 benchmark-search.py --compare old.json new.json
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PM_ROOT = SCRIPT_DIR.parent.parent
+SEARCH_SCRIPT = SCRIPT_DIR / "search.py"
+DEFAULT_OUTPUT = PM_ROOT / "_system" / "benchmarks" / "search-benchmark.json"
+
+DEFAULT_SCALES = [100, 10000, 100000]
+
+# Uncached runs per workload query; latency percentiles are taken over the
+# pooled samples of the whole workload
+QUERY_REPEATS = 100
+
+# Relative slowdown reported as a regression by --compare
+REGRESSION_THRESHOLD = 0.10
+
+# Fixed query workload; (name, query, filters)
+QUERY_WORKLOAD = [
+    ("single_term", "inventory", {}),
+    ("two_terms", "client credit", {}),
+    ("phrase", '"order fulfillment"', {}),
+    ("fielded_phrase", 'title:"credit engine"', {}),
+    ("field_tag_negation", 'title:"credit engine" tag:accounting -status:rejected', {}),
+    ("or_terms", "ledger OR journal", {}),
+    ("prefix", "reconcil*", {}),
+    ("id_lookup", "TERP-INIT-000040", {}),
+    ("filtered_term", "dashboard", {"status": "approved"}),
+    ("facet_only", "", {"status": "in-progress", "tags": ["inventory"]}),
+]
+
+# Topics planted in known documents; graded by where they appear
+LABELLED_TOPICS = [
+    ("credit engine", "accounting"),
+    ("batch recall", "inventory"),
+    ("smart ledger", "ledger"),
+    ("calendar sync", "calendar"),
+    ("sales sheet", "sales"),
+]
+GRADE_TITLE = 3
+GRADE_TAG = 2
+GRADE_BODY = 1
+
+VOCABULARY = """
+inventory batch order client invoice payment ledger journal account vendor
+product strain pricing quote sales report dashboard export import workflow
+approval status cogs margin credit debit balance fiscal period reconcile
+reconciliation audit user role permission session module router schema
+migration table index query cache performance latency error validation
+form modal page component layout mobile calendar event schedule reminder
+notification email sync queue task agent evaluation roadmap sprint priority
+dependency conflict feature initiative improvement fix bug security
+stability test coverage fulfillment shipment warehouse location intake
+purchase supplier discount tax total summary history timeline filter search
+sort pagination bulk edit delete archive restore note comment attachment
+""".split()
+
+TAG_POOL = [
+    "inventory", "accounting", "ledger", "calendar", "sales", "clients",
+    "orders", "pricing", "ui", "export", "performance", "security", "qa"
+]
+STATUSES = ["pending_review", "approved", "in-progress", "completed", "rejected"]
+
+# Zipf-like weights so a few words dominate, as in real text
+WORD_WEIGHTS = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def load_search_module(workdir: Path):
+    """Import search.py with its paths pointed at a scratch product-management root"""
+    spec = importlib.util.spec_from_file_location("pm_search", SEARCH_SCRIPT)
+    search = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(search)
+
+    search.PM_ROOT = workdir
+    search.REGISTRY_FILE = workdir / "_system/id-registry.json"
+    search.SEARCH_INDEX_FILE = workdir / "_system/cache/search-index.json"
+    search.SEARCH_META_FILE = workdir / "_system/cache/search-index.meta.json"
+    search.SEARCH_RESULTS_FILE = workdir / "_system/cache/search-results.json"
+    return search
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """Random sentence drawn from the vocabulary"""
+    text = " ".join(rng.choices(VOCABULARY, weights=WORD_WEIGHTS, k=words))
+    return text[0].upper() + text[1:] + "."
+
+
+def render_initiative(item_id: str, title: str, body_extra: str, rng: random.Random) -> str:
+    """Markdown shaped like _system/templates/initiative-template.md"""
+    objectives = "\n".join(f"- {sentence(rng, 6)}" for _ in range(3))
+    scope = "\n".join(f"- {sentence(rng, 5)}" for _ in range(3))
+    return f"""# {item_id}: {title}
+
+**Status**: Pending Review
+**Created**: 2025-11-03
+**Created By**: Initiative-Creator-Agent
+**Priority**: Not Set
+**Estimated Effort**: Not Set
+
+---
+
+## Overview
+
+{sentence(rng, 18)} {body_extra} {sentence(rng, 12)}
+
+---
+
+## Objectives
+
+{objectives}
+
+---
+
+## Scope
+
+### In Scope
+
+{scope}
+"""
+
+
+def render_evaluation(item_id: str, title: str, body_extra: str, rng: random.Random) -> str:
+    """Markdown shaped like the pm-auto-evaluator TERP-EVAL-*.md reports"""
+    return f"""# {item_id}: Evaluation of {title}
+
+**Initiative**: {title}
+**Evaluator**: PM Auto-Evaluator (Automated)
+
+---
+
+## Executive Summary
+
+**Recommendation**: APPROVED
+**Priority**: medium (score: {rng.randint(40, 100)}/100)
+
+{sentence(rng, 14)} {body_extra}
+
+---
+
+## Conflict Analysis
+
+{sentence(rng, 10)}
+
+## Dependency Analysis
+
+{sentence(rng, 8)}
+"""
+
+
+def render_feedback(item_id: str, title: str, body_extra: str, rng: random.Random) -> str:
+    """Markdown shaped like pm-evaluation/feedback/*-feedback.md"""
+    return f"""# PM Evaluation Feedback: {item_id}
+
+**Evaluated**: 2025-11-03 18:26:20
+
+---
+
+## Status
+
+✅ **APPROVED** - {title}
+
+## Priority
+
+**Level**: MEDIUM
+
+## Roadmap Position
+
+{sentence(rng, 12)} {body_extra}
+
+## Next Steps
+
+1. {sentence(rng, 6)}
+2. {sentence(rng, 6)}
+"""
+
+
+DOC_KINDS = [
+    ("INIT", render_initiative, 2),
+    ("EVAL", render_evaluation, 1),
+    ("FEEDBACK", render_feedback, 1),
+]
+
+
+def generate_corpus(workdir: Path, scale: int, seed: int = 42) -> dict:
+    """
+    Write a synthetic registry and documents under workdir
+
+    Returns relevance judgements: {topic: {item_id: grade}}.
+    """
+    rng = random.Random(seed + scale)
+    kinds = [kind for kind in DOC_KINDS for _ in range(kind[2])]
+    registry = {"registry": {}}
+    judgements = {topic: {} for topic, _ in LABELLED_TOPICS}
+
+    # Every topic gets a few title, tag and body plants, plus distractors
+    # containing both words out of order, regardless of scale
+    plants = {}
+    slots = rng.sample(range(scale), min(scale, len(LABELLED_TOPICS) * 12))
+    for t, (topic, tag) in enumerate(LABELLED_TOPICS):
+        mine = slots[t * 12:(t + 1) * 12]
+        for i, doc in enumerate(mine):
+            kind = "title" if i < 3 else "tag" if i < 6 else "body" if i < 9 else "distractor"
+            plants[doc] = (topic, tag, kind)
+
+    for n in range(scale):
+        prefix, render, _ = kinds[n % len(kinds)]
+        item_id = f"TERP-{prefix}-{n:06d}"
+        title = sentence(rng, 4).rstrip(".")
+        tags = rng.sample(TAG_POOL, 2)
+        body_extra = ""
+
+        if n in plants:
+            topic, tag, kind = plants[n]
+            first, second = topic.split()
+            if kind == "title":
+                title = f"{topic.title()} {title}"
+                tags = [tag, tags[0]] if tags[0] != tag else tags
+                body_extra = f"The {topic} work is central here."
+                judgements[topic][item_id] = GRADE_TITLE
+            elif kind == "tag":
+                tags = [tag, topic.replace(" ", "-")]
+                judgements[topic][item_id] = GRADE_TAG
+            elif kind == "body":
+                body_extra = f"This touches the {topic} briefly."
+                judgements[topic][item_id] = GRADE_BODY
+            else:
+                body_extra = f"The {second} was reviewed before any {first} changes."
+
+        path = Path("initiatives") / f"{item_id}.md"
+        filepath = workdir / path
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'w') as f:
+            f.write(render(item_id, title, body_extra, rng))
+
+        registry["registry"][item_id] = {
+            "type": prefix,
+            "title": title,
+            "status": rng.choice(STATUSES),
+            "tags": tags,
+            "path": str(path),
+            "created": "2025-11-03T00:00:00",
+            "updated": "2025-11-03T00:00:00"
+        }
+
+    registry_file = workdir / "_system" / "id-registry.json"
+    registry_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(registry_file, 'w') as f:
+        json.dump(registry, f)
+
+    return judgements
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def without_result_writes(cache_class):
+    """ResultCache subclass that never stores, so uncached timings exclude the disk write"""
+    class NoWriteResultCache(cache_class):
+        def put(self, key, entry):
+            pass
+    return NoWriteResultCache
+
+
+def ndcg_at_k(ranked_ids: list, grades: dict, k: int = 10) -> float:
+    """Normalized discounted cumulative gain of a ranking"""
+    dcg = sum(
+        (2 ** grades.get(item_id, 0) - 1) / math.log2(i + 2)
+        for i, item_id in enumerate(ranked_ids[:k])
+    )
+    ideal = sorted(grades.values(), reverse=True)[:k]
+    idcg = sum((2 ** grade - 1) / math.log2(i + 2) for i, grade in enumerate(ideal))
+    return dcg / idcg if idcg else 0.0
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scale(scale: int) -> dict:
+    """Generate, index and query one corpus size; runs in a worker process"""
+    workdir = Path(tempfile.mkdtemp(prefix=f"pm-search-bench-{scale}-"))
+    try:
+        search = load_search_module(workdir)
+
+        start = time.perf_counter()
+        judgements = generate_corpus(workdir, scale)
+        generate_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        search.build_search_index()
+        build_seconds = time.perf_counter() - start
+
+        # Loading from disk, as a fresh agent process would
+        search._loaded_index.update(generation=None, index=None, facets=None)
+        start = time.perf_counter()
+        search.load_search_index()
+        load_seconds = time.perf_counter() - start
+
+        queries = {}
+        all_samples = []
+        result_cache = search.ResultCache
+        for name, query, filters in QUERY_WORKLOAD:
+            samples = []
+            search.SEARCH_RESULTS_FILE.unlink(missing_ok=True)
+            search.ResultCache = without_result_writes(result_cache)
+            for _ in range(QUERY_REPEATS):
+                start = time.perf_counter()
+                results = search.search(query, limit=10, **filters)
+                samples.append((time.perf_counter() - start) * 1000)
+            search.ResultCache = result_cache
+            all_samples.extend(samples)
+
+            # Populate the result cache untimed, then time a cache hit
+            search.search(query, limit=10, **filters)
+            start = time.perf_counter()
+            search.search(query, limit=10, **filters)
+            cached_ms = (time.perf_counter() - start) * 1000
+
+            queries[name] = {
+                "query": query,
+                "filters": filters,
+                "matches": results.total,
+                "p50_ms": round(percentile(samples, 50), 3),
+                "p99_ms": round(percentile(samples, 99), 3),
+                "cached_ms": round(cached_ms, 3)
+            }
+
+        relevance = {}
+        for topic, _ in LABELLED_TOPICS:
+            search.SEARCH_RESULTS_FILE.unlink(missing_ok=True)
+            ranked = [item["id"] for item in search.search(topic, limit=10)]
+            relevance[topic] = round(ndcg_at_k(ranked, judgements[topic]), 4)
+
+        return {
+            "documents": scale,
+            "corpus_generation_seconds": round(generate_seconds, 3),
+            "index_build_seconds": round(build_seconds, 3),
+            "index_load_seconds": round(load_seconds, 3),
+            "index_size_bytes": search.SEARCH_INDEX_FILE.stat().st_size,
+            "peak_rss_mb": peak_rss_mb(),
+            "latency_p50_ms": round(percentile(all_samples, 50), 3),
+            "latency_p99_ms": round(percentile(all_samples, 99), 3),
+            "queries": queries,
+            "ndcg_at_10": relevance,
+            "mean_ndcg_at_10": round(sum(relevance.values()) / len(relevance), 4)
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def git_commit() -> str:
+    """Current commit hash, if available"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SCRIPT_DIR, capture_output=True, text=True, timeout=10
+        )
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmark(scales: list, output: Path) -> dict:
+    """Run every scale in a separate process and write the combined results"""
+    print(f"⏱️  Benchmarking search at {', '.join(str(s) for s in scales)} documents")
+
+    report = {
+        "benchmark": "search",
+        "generated": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "query_repeats": QUERY_REPEATS,
+        "scales": {}
+    }
+
+    for scale in scales:
+        print(f"  📚 {scale} documents...")
+        result = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--worker", str(scale)],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            print(f"  ❌ Scale {scale} failed:\n{result.stderr}")
+            report["scales"][str(scale)] = {"documents": scale, "error": result.stderr.strip()[-2000:]}
+            continue
+
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        report["scales"][str(scale)] = stats
+        print(f"     build {stats['index_build_seconds']}s | "
+              f"size {stats['index_size_bytes'] / 1024:.0f} KB | "
+              f"p50 {stats['latency_p50_ms']}ms | p99 {stats['latency_p99_ms']}ms | "
+              f"rss {stats['peak_rss_mb']} MB | nDCG@10 {stats['mean_ndcg_at_10']}")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n✅ Results saved to: {output}")
+    return report
+
+
+def compare_reports(old_file: Path, new_file: Path) -> bool:
+    """Print metric deltas between two result files; False if anything regressed"""
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+
+    # (metric, higher_is_better)
+    metrics = [
+        ("index_build_seconds", False),
+        ("index_size_bytes", False),
+        ("peak_rss_mb", False),
+        ("latency_p50_ms", False),
+        ("latency_p99_ms", False),
+        ("mean_ndcg_at_10", True),
+    ]
+
+    print(f"Comparing {old.get('commit') or old_file} → {new.get('commit') or new_file}\n")
+    regressed = False
+
+    for scale, new_stats in new["scales"].items():
+        old_stats = old["scales"].get(scale)
+        if not old_stats or "error" in old_stats or "error" in new_stats:
+            continue
+        print(f"{scale} documents:")
+        for metric, higher_is_better in metrics:
+            before, after = old_stats.get(metric), new_stats.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            flag = "⚠️ " if worse > REGRESSION_THRESHOLD else "  "
+            regressed = regressed or worse > REGRESSION_THRESHOLD
+            print(f"  {flag}{metric}: {before} → {after} ({change:+.1%})")
+        print()
+
+    if regressed:
+        print(f"❌ Regressions above {REGRESSION_THRESHOLD:.0%} detected")
+    else:
+        print("✅ No regressions")
+    return not regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search.py latency and relevance")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Corpus sizes to benchmark")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                        help="Where to write the JSON results")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("OLD", "NEW"),
+                        help="Compare two result files instead of running")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        # Search progress output goes to stderr; stdout carries the result line
+        stdout = sys.stdout
+        sys.stdout = sys.stderr
+        stats = run_scale(args.worker)
+        sys.stdout = stdout
+        print(json.dumps(stats))
+    elif args.compare:
+        sys.exit(0 if compare_reports(*args.compare) else 1)
+    else:
+        run_benchmark(args.scales, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,21 +5,91 @@ PM Auto-Evaluator for TERP Product Management
 Automatically evaluates new initiatives for conflicts, dependencies, and priority.
 """
 
+import argparse
+import hashlib
 import json
+import math
 import sys
 import os
 from datetime import datetime
 from pathlib import Path
 import re
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Cross-platform file locking
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    # Windows doesn't have fcntl, use msvcrt instead
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
 
 BASE_DIR = Path(__file__).parent.parent.parent
 INITIATIVES_DIR = BASE_DIR / "initiatives"
 REGISTRY_FILE = INITIATIVES_DIR / "registry.json"
+REGISTRY_LOCK = INITIATIVES_DIR / ".registry.lock"   # shared with pm-evaluator.py get-next-task
 EVALUATIONS_DIR = BASE_DIR / "pm-evaluation" / "evaluations"
 FEEDBACK_DIR = BASE_DIR / "pm-evaluation" / "feedback"
 DEPENDENCIES_FILE = BASE_DIR / "pm-evaluation" / "dependencies.json"
+PM_EVALUATOR = BASE_DIR / "_system" / "scripts" / "pm-evaluator.py"
+INITIATIVE_ID_RE = re.compile(r'TERP-INIT-\d+')
 SYSTEM_STATE_FILE = BASE_DIR / "_system" / "context" / "system-state.json"
+KEYWORD_CONFIG_FILE = BASE_DIR / "_system" / "config" / "evaluator-keywords.json"
+
+# Age after which a cached system state is refreshed in the background
+CONTEXT_REFRESH_SECONDS = 300
+
+# Evaluation memoization: each report section is cached under a key of its inputs
+EVALUATION_CACHE_FILE = BASE_DIR / "pm-evaluation" / "evaluation-cache.json"
+EVALUATION_CACHE_VERSION = 2
+
+# Bulk evaluation
+PENDING_STATUSES = ["pending_review"]
+BULK_WORKERS = 4
+
+# TF-IDF index over initiative overviews and tags (conflict detection)
+TFIDF_INDEX_FILE = BASE_DIR / "pm-evaluation" / "tfidf-index.json"
+TFIDF_INDEX_VERSION = 1
+CONFLICT_THRESHOLD = 0.3   # cosine similarity above which initiatives conflict
+TAG_WEIGHT = 3             # a tag counts as this many overview occurrences
+FENCED_CODE_RE = re.compile(r'```.*?(?:```|\Z)', re.S)
+
+# MinHash/LSH index over codebase entities (duplication check). 24 bands of
+# 2 rows put the 50% collision point near Jaccard 0.2.
+ENTITY_LSH_FILE = BASE_DIR / "pm-evaluation" / "entity-lsh.json"
+ENTITY_LSH_VERSION = 1
+MINHASH_PERMUTATIONS = 48
+LSH_BANDS = 24
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+MINHASH_PRIME = (1 << 61) - 1
+DUPLICATE_MIN_JACCARD = 0.2
+DUPLICATE_LIMIT = 8
+NAME_WORD_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+# Words that appear across route/procedure/component names and initiative
+# titles without saying anything about the feature
+NAME_NOISE = frozenset([
+    "page", "router", "component", "index", "view", "get", "list",
+    "initiative", "module", "system", "phase",
+])
+TERM_RE = re.compile(r'\b[a-z][a-z0-9]{3,}\b')
+STOP_WORDS = frozenset("""
+    about above after again against also been before being below between both
+    cannot could does doing down during each from further have having here
+    into itself just more most must need needs only other over same should
+    some such than that their theirs them then there these they this those
+    through under until very were what when where which while will with
+    within without would your yours
+""".split())
 
 def load_registry():
     """Load initiative registry"""
@@ -29,16 +99,32 @@ def load_registry():
         return json.load(f)
 
 def load_system_context():
-    """Load system context for codebase awareness"""
-    if not SYSTEM_STATE_FILE.exists():
+    """
+    Load system context for codebase awareness
+
+    An existing state is returned immediately. If it is older than
+    CONTEXT_REFRESH_SECONDS a rescan is started in the background so the
+    next evaluation sees fresh data; system-context caches each scanner by
+    input fingerprint, so that rescan is cheap. Only a missing state blocks.
+    """
+    scan_command = [
+        "python3",
+        str(BASE_DIR / "_system" / "scripts" / "system-context.py"),
+        "scan"
+    ]
+    
+    if SYSTEM_STATE_FILE.exists():
+        if time.time() - SYSTEM_STATE_FILE.stat().st_mtime > CONTEXT_REFRESH_SECONDS:
+            try:
+                subprocess.Popen(scan_command, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, start_new_session=True)
+            except OSError as e:
+                print(f"  ⚠️  Could not refresh system context: {e}")
+    else:
         # Run system-context scan if not exists
         print("  📊 System context not found, scanning codebase...")
         try:
-            subprocess.run([
-                "python3",
-                str(BASE_DIR / "_system" / "scripts" / "system-context.py"),
-                "scan"
-            ], capture_output=True, timeout=60)
+            subprocess.run(scan_command, capture_output=True, timeout=600)
         except Exception as e:
             print(f"  ⚠️  Could not scan codebase: {e}")
             return None
@@ -50,46 +136,156 @@ def load_system_context():
     return None
 
 
-def check_feature_duplication(initiative_data, system_context):
-    """Check if initiative duplicates existing features"""
+def name_tokens(*names):
+    """Lower-case word set of identifiers, paths and titles (camelCase and separators split)"""
+    tokens = set()
+    for name in names:
+        for word in NAME_WORD_RE.findall(name):
+            word = word.lower()
+            # Plural and singular forms should collide ("batches" / "batch")
+            if word.endswith("es") and word[:-2].endswith(("ch", "sh", "x", "ss")):
+                word = word[:-2]
+            elif word.endswith("s") and not word.endswith("ss") and len(word) > 4:
+                word = word[:-1]
+            if len(word) >= 3 and word not in STOP_WORDS and word not in NAME_NOISE:
+                tokens.add(word)
+    return tokens
+
+def _minhash_params():
+    """Deterministic (a, b) pairs for the universal hash permutations"""
+    params = []
+    for i in range(MINHASH_PERMUTATIONS):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        params.append((int.from_bytes(digest[:8], "big") % MINHASH_PRIME or 1,
+                       int.from_bytes(digest[8:], "big") % MINHASH_PRIME))
+    return params
+
+MINHASH_PARAMS = _minhash_params()
+
+def minhash(tokens):
+    """MinHash signature of a token set"""
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "big") for t in tokens]
+    return [min((a * h + b) % MINHASH_PRIME for h in hashes) for a, b in MINHASH_PARAMS]
+
+def lsh_keys(signature):
+    """Bucket key per band; similar sets share at least one with high probability"""
+    return [
+        f"{band}:" + ",".join(str(v) for v in signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])
+        for band in range(LSH_BANDS)
+    ]
+
+def codebase_entities(system_context):
+    """Routes, tRPC procedures and components from the system state"""
+    for route in system_context.get('routes', []):
+        yield {"type": "route", "name": route['route'], "file": route.get('file', 'unknown'),
+               "tokens": name_tokens(route['route'])}
+    for endpoint in system_context.get('api_endpoints', []):
+        yield {"type": "api", "name": endpoint['path'], "file": endpoint.get('file', 'unknown'),
+               "tokens": name_tokens(endpoint['path'])}
+    components = system_context.get('components', {})
+    for comp in components.get('all') or [{"name": n} for n in components.get('major_components', [])]:
+        entity = {"type": "component", "name": comp['name'], "tokens": name_tokens(comp['name'])}
+        if 'file' in comp:
+            entity["file"] = comp['file']
+        yield entity
+
+def entities_digest(system_context):
+    """
+    Digest of the routes, procedures and components in the system state
+
+    Unlike last_updated (or the file's mtime), which every background
+    refresh bumps, this only changes when the entities do.
+    """
+    return _digest(
+        system_context.get('routes', []),
+        system_context.get('api_endpoints', []),
+        system_context.get('components', {})
+    )
+
+def load_entity_index(system_context, state_key=None):
+    """
+    MinHash/LSH index of codebase entities, rebuilt only when the entities change
+
+    Entities are stored with their token sets (for exact Jaccard
+    verification) and bucketed by band key, so a query only touches the
+    entities it collides with.
+    """
+    state_key = state_key or entities_digest(system_context)
+    if ENTITY_LSH_FILE.exists():
+        try:
+            with open(ENTITY_LSH_FILE, 'r') as f:
+                index = json.load(f)
+            if index.get("version") == ENTITY_LSH_VERSION and index.get("state") == state_key:
+                return index
+        except ValueError:
+            pass
+    
+    entities = []
+    buckets = {}
+    for entity in codebase_entities(system_context):
+        if not entity["tokens"]:
+            continue
+        for key in lsh_keys(minhash(entity["tokens"])):
+            buckets.setdefault(key, []).append(len(entities))
+        entity["tokens"] = sorted(entity["tokens"])
+        entities.append(entity)
+    
+    index = {"version": ENTITY_LSH_VERSION, "state": state_key, "entities": entities, "buckets": buckets}
+    ENTITY_LSH_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ENTITY_LSH_FILE.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp, ENTITY_LSH_FILE)
+    return index
+
+def check_feature_duplication(initiative_data, system_context, index=None):
+    """
+    Check if initiative duplicates existing features
+
+    The initiative's title and tags are MinHashed and looked up in the
+    entity LSH buckets; colliding routes, procedures and components are
+    verified with exact Jaccard similarity, which also sets the confidence.
+    """
     if not system_context:
         return []
     
-    duplicates = []
-    title = initiative_data['manifest']['title'].lower()
-    overview = initiative_data['overview'].lower()
+    manifest = initiative_data['manifest']
+    query = name_tokens(manifest['title'], *manifest.get('tags', []))
+    if not query:
+        return []
     
-    # Extract significant words
-    significant_words = [w for w in title.split() if len(w) > 4]
+    if index is None:
+        index = load_entity_index(system_context)
+    entities = index["entities"]
+    buckets = index["buckets"]
     
-    # Check against existing routes
-    for route in system_context.get('routes', []):
-        route_path = route['route'].lower()
-        # Check if any significant word appears in route
-        matches = [w for w in significant_words if w in route_path]
-        if matches:
-            duplicates.append({
-                "type": "route",
-                "name": route['route'],
-                "file": route.get('file', 'unknown'),
-                "confidence": "medium" if len(matches) > 1 else "low",
-                "matched_keywords": matches
-            })
+    candidates = set()
+    for key in lsh_keys(minhash(query)):
+        candidates.update(buckets.get(key, ()))
     
-    # Check against major components
-    for comp in system_context.get('components', {}).get('major_components', []):
-        comp_lower = comp.lower()
-        matches = [w for w in significant_words if w in comp_lower]
-        if matches:
-            duplicates.append({
-                "type": "component",
-                "name": comp,
-                "confidence": "low",
-                "matched_keywords": matches
-            })
+    duplicates = []
+    for i in candidates:
+        entity = entities[i]
+        tokens = set(entity["tokens"])
+        common = query & tokens
+        similarity = len(common) / len(query | tokens)
+        # One shared word is only evidence when it is the entity's whole name
+        if similarity < DUPLICATE_MIN_JACCARD or (len(common) < 2 and common != tokens):
+            continue
+        
+        duplicate = {
+            "type": entity["type"],
+            "name": entity["name"],
+            "confidence": "high" if similarity >= 0.6 else "medium" if similarity >= 0.4 else "low",
+            "similarity": round(similarity, 3),
+            "matched_keywords": sorted(common)
+        }
+        if "file" in entity:
+            duplicate["file"] = entity["file"]
+        duplicates.append(duplicate)
     
-    return duplicates[:5]  # Limit to top 5
-
+    duplicates.sort(key=lambda d: (-d["similarity"], d["type"], d["name"]))
+    return duplicates[:DUPLICATE_LIMIT]
 
 def load_initiative(init_id):
     """Load initiative manifest and overview"""
@@ -113,136 +309,492 @@ def load_initiative(init_id):
         "overview": overview
     }
 
-def detect_conflicts(init_id, initiative_data):
-    """Detect conflicts with other initiatives"""
-    registry = load_registry()
-    conflicts = []
+def term_counts(overview, tags):
+    """Term frequencies for an initiative: overview prose minus stop-words, plus weighted tags"""
+    counts = {}
+    # Code samples share identifiers (const, await, input) across unrelated initiatives
+    prose = FENCED_CODE_RE.sub(" ", overview.lower())
+    for term in TERM_RE.findall(prose):
+        if term not in STOP_WORDS:
+            counts[term] = counts.get(term, 0) + 1
+    for tag in tags:
+        tag = tag.lower()
+        # "bug-fixes" matches both the whole tag and its parts
+        for term in {tag, *re.split(r'[\W_]+', tag)}:
+            if len(term) >= 3 and term not in STOP_WORDS:
+                counts[term] = counts.get(term, 0) + TAG_WEIGHT
+    return counts
+
+def initiative_fingerprint(init_id):
+    """Stat signature of an initiative's manifest and overview"""
+    signature = []
+    for name in ("manifest.json", "overview.md"):
+        try:
+            st = (INITIATIVES_DIR / init_id / name).stat()
+            signature.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            signature.append(None)
+    return signature
+
+def load_tfidf_index(registry=None):
+    """
+    Load the TF-IDF index and bring it up to date with the registry
+
+    The index stores raw term counts per initiative plus an inverted
+    index (term -> {initiative: count}), i.e. the sparse term-document
+    matrix in column form, and each document's TF-IDF norm. Only
+    initiatives whose manifest or overview changed since the last run are
+    re-read and re-tokenized.
+    """
+    index = None
+    if TFIDF_INDEX_FILE.exists():
+        try:
+            with open(TFIDF_INDEX_FILE, 'r') as f:
+                index = json.load(f)
+        except ValueError:
+            index = None
+    if not index or index.get("version") != TFIDF_INDEX_VERSION:
+        index = {"version": TFIDF_INDEX_VERSION, "docs": {}, "postings": {}, "norms": {}}
     
-    # Get keywords from current initiative
-    current_keywords = set()
-    overview = initiative_data["overview"].lower()
-    tags = initiative_data["manifest"].get("tags", [])
+    docs = index["docs"]
+    postings = index["postings"]
+    changed = False
     
-    # Extract keywords from overview (simple approach)
-    words = re.findall(r'\b\w{4,}\b', overview)
-    current_keywords.update(words[:50])  # Limit to first 50 significant words
-    current_keywords.update([tag.lower() for tag in tags])
+    def remove(doc_id):
+        for term in docs.pop(doc_id)["counts"]:
+            postings[term].pop(doc_id, None)
+            if not postings[term]:
+                del postings[term]
     
-    # Compare with other initiatives
+    registry_ids = set()
+    if registry is None:
+        registry = load_registry()
     for init in registry["initiatives"]:
-        if init["id"] == init_id:
-            continue
-        
-        if init["status"] in ["rejected", "completed"]:
+        doc_id = init["id"]
+        registry_ids.add(doc_id)
+        signature = initiative_fingerprint(doc_id)
+        if doc_id in docs and docs[doc_id]["fingerprint"] == signature:
             continue
         
-        other_data = load_initiative(init["id"])
-        if not other_data:
-            continue
-        
-        other_keywords = set()
-        other_overview = other_data["overview"].lower()
-        other_tags = other_data["manifest"].get("tags", [])
-        
-        other_words = re.findall(r'\b\w{4,}\b', other_overview)
-        other_keywords.update(other_words[:50])
-        other_keywords.update([tag.lower() for tag in other_tags])
-        
-        # Calculate overlap
-        overlap = current_keywords & other_keywords
-        overlap_ratio = len(overlap) / max(len(current_keywords), 1)
+        if doc_id in docs:
+            remove(doc_id)
+        data = load_initiative(doc_id)
+        if data:
+            text = data["overview"] or data["manifest"].get("description", "")
+            tags = data["manifest"].get("tags", [])
+        else:
+            text = init.get("description", "")
+            tags = init.get("tags", [])
+        counts = term_counts(text, tags)
+        docs[doc_id] = {"fingerprint": signature, "counts": counts}
+        for term, count in counts.items():
+            postings.setdefault(term, {})[doc_id] = count
+        changed = True
+    
+    for doc_id in set(docs) - registry_ids:
+        remove(doc_id)
+        changed = True
+    
+    if changed:
+        # IDF depends on the whole corpus, so document norms are refreshed together
+        index["norms"] = {
+            doc_id: math.sqrt(sum(w * w for w in tfidf_weights(doc["counts"], postings, len(docs)).values()))
+            for doc_id, doc in docs.items()
+        }
+        TFIDF_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = TFIDF_INDEX_FILE.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, TFIDF_INDEX_FILE)
+    
+    return index
+
+def tfidf_weights(counts, postings, total_docs):
+    """Sublinear TF times smoothed IDF"""
+    return {
+        term: (1 + math.log(count)) * (math.log((1 + total_docs) / (1 + len(postings.get(term, ())))) + 1)
+        for term, count in counts.items()
+    }
+
+def detect_conflicts(init_id, initiative_data, registry=None, index=None):
+    """
+    Detect conflicts with other initiatives
+
+    The initiative is scored against every other one with one sparse
+    matrix-vector product over the inverted index: only postings of terms
+    it shares with others are visited. Rejected and completed initiatives
+    are ignored.
+    """
+    if registry is None:
+        registry = load_registry()
+    if index is None:
+        index = load_tfidf_index(registry)
+    postings = index["postings"]
+    total_docs = len(index["docs"])
+    
+    active = {
+        init["id"]: init for init in registry["initiatives"]
+        if init["id"] != init_id and init["status"] not in ["rejected", "completed"]
+    }
+    
+    query = tfidf_weights(
+        term_counts(initiative_data["overview"], initiative_data["manifest"].get("tags", [])),
+        postings, total_docs
+    )
+    query_norm = math.sqrt(sum(w * w for w in query.values())) or 1.0
+    
+    # Accumulate dot products (and the terms contributing most to each)
+    dots = {}
+    contributions = {}
+    for term, q_weight in query.items():
+        idf = math.log((1 + total_docs) / (1 + len(postings.get(term, ())))) + 1
+        for doc_id, count in postings.get(term, {}).items():
+            if doc_id not in active:
+                continue
+            score = q_weight * (1 + math.log(count)) * idf
+            dots[doc_id] = dots.get(doc_id, 0.0) + score
+            contributions.setdefault(doc_id, []).append((score, term))
+    
+    conflicts = []
+    for doc_id, dot in dots.items():
+        similarity = dot / (query_norm * (index["norms"].get(doc_id) or 1.0))
         
-        if overlap_ratio > 0.3:  # >30% keyword overlap
+        if similarity > CONFLICT_THRESHOLD:
             conflicts.append({
-                "initiative_id": init["id"],
-                "title": init["title"],
-                "overlap_ratio": overlap_ratio,
-                "common_keywords": list(overlap)[:10]
+                "initiative_id": doc_id,
+                "title": active[doc_id]["title"],
+                "overlap_ratio": similarity,
+                "common_keywords": [term for _, term in sorted(contributions[doc_id], reverse=True)[:10]]
             })
     
+    conflicts.sort(key=lambda c: c["overlap_ratio"], reverse=True)
     return conflicts
 
-def extract_dependencies(overview):
-    """Extract potential dependencies from overview text"""
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of lower-case patterns
+
+    search() reports every occurrence of every pattern, overlapping ones
+    included, in a single pass over the text.
+    """
+    
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.out[state].append(pattern_id)
+        
+        # Breadth-first failure links; outputs inherit from their fallback state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                candidate = self.goto[fallback].get(ch, 0)
+                self.fail[child] = candidate if candidate != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+    
+    def search(self, text):
+        """Yield (start, pattern_id) for each match, case-insensitively"""
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        state = 0
+        for i, ch in enumerate(text):
+            ch = ch.lower()
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                yield i - len(patterns[pattern_id]) + 1, pattern_id
+
+@lru_cache(maxsize=1)
+def keyword_engine():
+    """
+    Compile the keyword config into one automaton
+
+    Priority keywords and dependency-phrase triggers share the automaton,
+    so one pass over an overview finds every signal. Each pattern maps to
+    ("priority", group, keyword) or ("dependency", capture regex).
+    """
+    with open(KEYWORD_CONFIG_FILE, 'r') as f:
+        config = json.load(f)
+    
+    patterns = []
+    meanings = []
+    for group, spec in config["priority"]["groups"].items():
+        for keyword in spec["keywords"]:
+            patterns.append(keyword.lower())
+            meanings.append(("priority", group, keyword.lower()))
+    for phrase in config["dependencies"]["phrases"]:
+        flags = 0 if phrase.get("case_sensitive") else re.IGNORECASE
+        patterns.append(phrase["trigger"].lower())
+        meanings.append(("dependency", re.compile(phrase["capture"], flags)))
+    
+    return config, KeywordAutomaton(patterns), meanings
+
+def scan_keywords(text):
+    """
+    Find priority signals and dependency phrases in one pass
+
+    Returns {"priority": {keyword: {"group", "count", "positions"}},
+    "dependencies": [{"text", "position"}]}. Priority keywords must start
+    at a word boundary ("fix" matches "fixes" but not "prefix").
+    """
+    _, automaton, meanings = keyword_engine()
+    priority = {}
     dependencies = []
     
-    # Look for TERP-INIT-XXX mentions
-    init_refs = re.findall(r'TERP-INIT-\d+', overview)
-    dependencies.extend(init_refs)
+    for start, pattern_id in automaton.search(text):
+        meaning = meanings[pattern_id]
+        if meaning[0] == "priority":
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            _, group, keyword = meaning
+            hit = priority.setdefault(keyword, {"group": group, "count": 0, "positions": []})
+            hit["count"] += 1
+            hit["positions"].append(start)
+        else:
+            match = meaning[1].match(text, start)
+            if match:
+                captured = match.group(1) if match.re.groups else match.group(0)
+                dependencies.append({"text": captured, "position": start})
     
-    # Look for dependency keywords
-    dep_patterns = [
-        r'depends on ([^.,]+)',
-        r'requires ([^.,]+)',
-        r'needs ([^.,]+) to be',
-        r'after ([^.,]+) is complete'
-    ]
+    return {"priority": priority, "dependencies": dependencies}
+
+def extract_dependencies(overview, hits=None):
+    """Extract potential dependencies from overview text"""
+    if hits is None:
+        hits = scan_keywords(overview)
+    return list(dict.fromkeys(dep["text"] for dep in hits["dependencies"]))
+
+def score_priority(initiative_data, hits=None):
+    """
+    Priority score plus the factors behind it
+
+    Each configured keyword adds its group weight once if it occurs in the
+    overview (or, for groups with match_tags, equals a tag). Returns
+    (score, factors) where factors lists the keywords that counted.
+    """
+    config = keyword_engine()[0]["priority"]
+    if hits is None:
+        hits = scan_keywords(initiative_data["overview"])
+    tags = {tag.lower() for tag in initiative_data["manifest"].get("tags", [])}
     
-    for pattern in dep_patterns:
-        matches = re.findall(pattern, overview, re.IGNORECASE)
-        dependencies.extend(matches)
+    score = config["base_score"]
+    factors = []
+    for group, spec in config["groups"].items():
+        for keyword in spec["keywords"]:
+            keyword = keyword.lower()
+            hit = hits["priority"].get(keyword)
+            tagged = spec.get("match_tags", False) and keyword in tags
+            if hit or tagged:
+                score += spec["weight"]
+                factors.append({
+                    "group": group,
+                    "keyword": keyword,
+                    "weight": spec["weight"],
+                    "count": hit["count"] if hit else 0,
+                    "positions": hit["positions"] if hit else [],
+                    "tag": tagged
+                })
     
-    return list(set(dependencies))
+    # Cap at max_score
+    return min(score, config["max_score"]), factors
 
 def calculate_priority_score(initiative_data):
     """Calculate priority score based on keywords and tags"""
-    score = 50  # Base score
-    
-    overview = initiative_data["overview"].lower()
-    tags = [tag.lower() for tag in initiative_data["manifest"].get("tags", [])]
-    
-    # High priority keywords
-    high_priority = ["critical", "urgent", "blocker", "security", "bug", "fix"]
-    for keyword in high_priority:
-        if keyword in overview or keyword in tags:
-            score += 15
-    
-    # Medium priority keywords
-    medium_priority = ["important", "enhancement", "improvement", "optimize"]
-    for keyword in medium_priority:
-        if keyword in overview or keyword in tags:
-            score += 10
-    
-    # Strategic alignment keywords
-    strategic = ["strategic", "roadmap", "milestone", "goal"]
-    for keyword in strategic:
-        if keyword in overview or keyword in tags:
-            score += 12
-    
-    # Effort indicators (lower effort = higher priority)
-    low_effort = ["quick", "simple", "easy", "small"]
-    for keyword in low_effort:
-        if keyword in overview:
-            score += 8
-    
-    # Cap at 100
-    return min(score, 100)
-
-def generate_evaluation(init_id):
-    """Generate automated evaluation for an initiative"""
+    return score_priority(initiative_data)[0]
+
+class SharedContext:
+    """
+    Registry, system context, similarity indexes and the evaluation cache
+
+    Each piece is loaded on first use and then shared, so a fully cached
+    evaluation only reads the system state (to key the duplicates section)
+    and never pays for the index loads. Safe to use from bulk-mode worker
+    threads.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self.cache_dirty = False
+    
+    def _get(self, name, loader):
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = loader()
+            return self._values[name]
+    
+    @property
+    def registry(self):
+        return self._get("registry", load_registry)
+    
+    @property
+    def system_context(self):
+        def load():
+            print("  🔍 Loading system context...")
+            return load_system_context()
+        return self._get("system_context", load)
+    
+    @property
+    def tfidf_index(self):
+        registry = self.registry
+        return self._get("tfidf_index", lambda: load_tfidf_index(registry))
+    
+    @property
+    def entities_digest(self):
+        system_context = self.system_context
+        return self._get("entities_digest", lambda: entities_digest(system_context) if system_context else None)
+    
+    @property
+    def entity_index(self):
+        system_context = self.system_context
+        state_key = self.entities_digest
+        return self._get("entity_index", lambda: load_entity_index(system_context, state_key) if system_context else None)
+    
+    @property
+    def evaluation_cache(self):
+        return self._get("evaluation_cache", load_evaluation_cache)
+    
+    def save_evaluation_cache(self):
+        if self.cache_dirty:
+            save_evaluation_cache(self.evaluation_cache)
+            self.cache_dirty = False
+
+def load_evaluation_cache():
+    """Cached evaluation sections per initiative"""
+    try:
+        with open(EVALUATION_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        if cache.get("version") == EVALUATION_CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": EVALUATION_CACHE_VERSION, "initiatives": {}}
+
+def save_evaluation_cache(cache):
+    EVALUATION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = EVALUATION_CACHE_FILE.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, EVALUATION_CACHE_FILE)
+
+def _digest(*parts):
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+def _file_signature(path):
+    try:
+        st = path.stat()
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+def evaluation_keys(init_id, initiative_data, shared):
+    """
+    Input keys for each cacheable evaluation section
+
+    - signals (priority, dependencies): the initiative content and the keyword config
+    - duplicates: title and tags, plus a digest of the codebase entities
+    - conflicts: the initiative content, plus which peers are active and
+      their manifest/overview signatures
+    """
+    manifest = initiative_data["manifest"]
+    content = _digest(initiative_data["overview"], manifest)
+    peers = sorted(
+        (init["id"], initiative_fingerprint(init["id"]))
+        for init in shared.registry["initiatives"]
+        if init["id"] != init_id and init["status"] not in ["rejected", "completed"]
+    )
+    return {
+        "signals": _digest(content, _file_signature(KEYWORD_CONFIG_FILE)),
+        "duplicates": _digest(manifest["title"], manifest.get("tags", []), shared.entities_digest,
+                              ENTITY_LSH_VERSION, DUPLICATE_MIN_JACCARD, DUPLICATE_LIMIT),
+        "conflicts": _digest(content, peers, TFIDF_INDEX_VERSION, CONFLICT_THRESHOLD)
+    }
+
+def generate_evaluation(init_id, shared=None, apply_status=True, force=False):
+    """
+    Generate automated evaluation for an initiative
+
+    Returns a summary dict, or None if the initiative does not exist. With
+    apply_status=False the status update is left to the caller (bulk mode
+    applies all of them in one registry write).
+
+    Sections are memoized in EVALUATION_CACHE_FILE under evaluation_keys():
+    unchanged inputs return the cached verdict without loading the system
+    context or rewriting reports, and a partial change recomputes only the
+    affected sections (e.g. conflicts when a peer changed). force=True
+    recomputes everything.
+    """
     print(f"🔍 Evaluating {init_id}...")
     
     initiative_data = load_initiative(init_id)
     if not initiative_data:
         print(f"❌ Initiative {init_id} not found")
-        return False
+        return None
     
-    # Load system context for codebase awareness
-    print("  🔍 Loading system context...")
-    system_context = load_system_context()
+    owns_context = shared is None
+    if owns_context:
+        shared = SharedContext()
     
-    # Check for feature duplication against existing codebase
-    print("  🔎 Checking for feature duplication...")
-    duplicates = check_feature_duplication(initiative_data, system_context)
+    keys = evaluation_keys(init_id, initiative_data, shared)
+    cached = {} if force else shared.evaluation_cache["initiatives"].get(init_id, {})
+    sections = dict(cached.get("sections", {}))
+    stale = [name for name, key in keys.items() if cached.get("keys", {}).get(name) != key or name not in sections]
     
-    # Detect conflicts
-    conflicts = detect_conflicts(init_id, initiative_data)
+    eval_id = f"TERP-EVAL-{init_id.split('-')[-1]}"
+    eval_file = EVALUATIONS_DIR / f"{eval_id}.md"
+    feedback_file = FEEDBACK_DIR / f"{init_id}-feedback.md"
+    
+    if not stale and eval_file.exists() and feedback_file.exists() and "result" in cached:
+        result = cached["result"]
+        print(f"✅ {init_id} unchanged since last evaluation: {result['recommendation']}, {result['priority']} priority (cached)")
+        if apply_status and result["status"]:
+            update_initiative_status(result["initiative_id"], result["status"], result["priority"])
+        return dict(result, cached=True)
+    
+    if stale and len(stale) < len(keys):
+        print(f"  ♻️  Recomputing {', '.join(stale)} for {init_id} (other sections cached)")
     
-    # Extract dependencies
-    dependencies = extract_dependencies(initiative_data["overview"])
+    if "duplicates" in stale:
+        # Check for feature duplication against existing codebase
+        print(f"  🔎 Checking {init_id} for feature duplication...")
+        sections["duplicates"] = check_feature_duplication(initiative_data, shared.system_context, shared.entity_index)
     
-    # Calculate priority
-    priority_score = calculate_priority_score(initiative_data)
+    if "conflicts" in stale:
+        # Detect conflicts
+        sections["conflicts"] = detect_conflicts(init_id, initiative_data, shared.registry, shared.tfidf_index)
+    
+    if "signals" in stale:
+        # Priority signals and dependency phrases, found in one pass
+        hits = scan_keywords(initiative_data["overview"])
+        priority_score, priority_factors = score_priority(initiative_data, hits)
+        sections["signals"] = {
+            "dependencies": extract_dependencies(initiative_data["overview"], hits),
+            "priority_score": priority_score,
+            "priority_factors": priority_factors
+        }
+    
+    duplicates = sections["duplicates"]
+    conflicts = sections["conflicts"]
+    # An initiative mentioning its own ID is not a dependency
+    dependencies = [d for d in sections["signals"]["dependencies"] if d != init_id]
+    priority_score = sections["signals"]["priority_score"]
+    priority_factors = sections["signals"]["priority_factors"]
     
     # Determine priority level
     if priority_score >= 75:
@@ -261,9 +813,6 @@ def generate_evaluation(init_id):
         status = "approved"
     
     # Generate evaluation report
-    eval_id = f"TERP-EVAL-{init_id.split('-')[-1]}"
-    eval_file = EVALUATIONS_DIR / f"{eval_id}.md"
-    
     EVALUATIONS_DIR.mkdir(parents=True, exist_ok=True)
     
     with open(eval_file, 'w') as f:
@@ -291,7 +840,7 @@ def generate_evaluation(init_id):
             f.write(f"⚠️ Found {len(duplicates)} potential duplicate(s) in existing codebase:\n\n")
             for i, dup in enumerate(duplicates, 1):
                 f.write(f"### Duplicate {i}: {dup['type'].title()} - {dup['name']}\n\n")
-                f.write(f"**Confidence**: {dup['confidence']}\n")
+                f.write(f"**Confidence**: {dup['confidence']} (Jaccard {dup['similarity']:.2f})\n")
                 f.write(f"**Matched Keywords**: {', '.join(dup.get('matched_keywords', []))}\n")
                 if 'file' in dup:
                     f.write(f"**Location**: `{dup['file']}`\n")
@@ -307,7 +856,7 @@ def generate_evaluation(init_id):
             for i, conflict in enumerate(conflicts, 1):
                 f.write(f"### Conflict {i}: {conflict['initiative_id']}\n\n")
                 f.write(f"**Title**: {conflict['title']}\n")
-                f.write(f"**Overlap**: {conflict['overlap_ratio']:.1%}\n")
+                f.write(f"**Overlap**: {conflict['overlap_ratio']:.1%} (TF-IDF cosine similarity)\n")
                 f.write(f"**Common Keywords**: {', '.join(conflict['common_keywords'])}\n\n")
                 f.write("**Recommendation**: Review both initiatives to determine if they should be merged or if one should be deferred.\n\n")
         else:
@@ -330,10 +879,15 @@ def generate_evaluation(init_id):
         f.write(f"**Score**: {priority_score}/100\n")
         f.write(f"**Level**: {priority_level.upper()}\n\n")
         f.write("**Scoring Factors**:\n")
-        f.write("- Business value keywords\n")
-        f.write("- Strategic alignment indicators\n")
-        f.write("- Urgency signals\n")
-        f.write("- Effort estimation\n\n")
+        if priority_factors:
+            for factor in priority_factors:
+                source = f"{factor['count']}x in overview" if factor['count'] else ""
+                if factor['tag']:
+                    source = f"{source}, tag" if source else "tag"
+                f.write(f"- {factor['group'].replace('_', ' ')}: `{factor['keyword']}` (+{factor['weight']}, {source})\n")
+        else:
+            f.write("- No priority keywords found (base score)\n")
+        f.write("\n")
         
         f.write("---\n\n")
         
@@ -353,11 +907,36 @@ def generate_evaluation(init_id):
     # Generate feedback for Initiative Creator
     generate_feedback(init_id, recommendation, priority_level, priority_score, conflicts, dependencies, duplicates)
     
+    # Initiative references become edges in the dependency graph
+    dependency_ids = [d for d in dependencies if INITIATIVE_ID_RE.fullmatch(d)]
+    
     # Update initiative status if no conflicts
-    if not conflicts:
-        update_initiative_status(init_id, status, priority_level)
+    if apply_status:
+        record_dependency_edges(init_id, dependency_ids)
+        if not conflicts:
+            update_initiative_status(init_id, status, priority_level)
     
-    return True
+    result = {
+        "initiative_id": init_id,
+        "title": initiative_data['manifest']['title'],
+        "recommendation": recommendation,
+        "status": status if not conflicts else None,
+        "priority": priority_level,
+        "priority_score": priority_score,
+        "priority_factors": [f"{f['group']}:{f['keyword']}" for f in priority_factors],
+        "conflicts": [c["initiative_id"] for c in conflicts],
+        "duplicates": len(duplicates),
+        "dependencies": len(dependencies),
+        "dependency_ids": dependency_ids,
+        "evaluation": str(eval_file)
+    }
+    
+    shared.evaluation_cache["initiatives"][init_id] = {"keys": keys, "sections": sections, "result": result}
+    shared.cache_dirty = True
+    if owns_context:
+        shared.save_evaluation_cache()
+    
+    return result
 
 def generate_feedback(init_id, recommendation, priority_level, priority_score, conflicts, dependencies, duplicates=[]):
     """Generate feedback file for Initiative Creator"""
@@ -428,28 +1007,140 @@ def generate_feedback(init_id, recommendation, priority_level, priority_score, c
     
     print(f"📝 Feedback generated: {feedback_file}")
 
+def record_dependency_edges(init_id, dependency_ids):
+    """Add extracted initiative references to the dependency graph (pm-evaluator.py owns it)"""
+    if not dependency_ids:
+        return
+    try:
+        result = subprocess.run(
+            ["python3", str(PM_EVALUATOR), "add-dependency", init_id, *dependency_ids, "--source", "extracted"],
+            capture_output=True, text=True, timeout=60
+        )
+        if result.stdout.strip():
+            print(result.stdout.strip())
+        if result.returncode != 0:
+            errors = result.stderr.strip().splitlines()
+            print(f"  ⚠️  Could not update dependency graph: {errors[-1] if errors else f'exit code {result.returncode}'}")
+    except Exception as e:
+        print(f"  ⚠️  Could not update dependency graph: {e}")
+
 def update_initiative_status(init_id, status, priority):
     """Update initiative status in registry"""
-    registry = load_registry()
+    update_initiative_statuses({init_id: (status, priority)})
+
+@contextmanager
+def locked(f):
+    """Hold an exclusive lock on an open file (cross-platform)"""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    elif msvcrt:
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield f
+    finally:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        elif msvcrt:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def update_initiative_statuses(updates):
+    """
+    Apply {init_id: (status, priority)} to the registry in a single write (skipped if nothing changes)
+
+    The read-modify-write holds REGISTRY_LOCK, like pm-evaluator.py's
+    get-next-task, and replaces the file atomically.
+    """
+    if not REGISTRY_FILE.exists():
+        return
+    with open(REGISTRY_LOCK, 'a') as lock_file, locked(lock_file):
+        registry = load_registry()
+        
+        changed = []
+        for init in registry["initiatives"]:
+            if init["id"] in updates and (init.get("status"), init.get("priority")) != tuple(updates[init["id"]]):
+                init["status"], init["priority"] = updates[init["id"]]
+                changed.append(init["id"])
+        
+        if not changed:
+            return
+        
+        tmp = REGISTRY_FILE.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(registry, f, indent=2)
+        os.replace(tmp, REGISTRY_FILE)
     
-    for init in registry["initiatives"]:
-        if init["id"] == init_id:
-            init["status"] = status
-            init["priority"] = priority
-            break
+    for init_id in changed:
+        status, priority = updates[init_id]
+        print(f"✅ Updated {init_id} status to '{status}' with priority '{priority}'")
+
+def evaluate_bulk(init_ids, workers=BULK_WORKERS, force=False):
+    """
+    Evaluate several initiatives in one run
+
+    Shared context is loaded once, evaluations run on worker threads and
+    every status change lands in one registry write. Writes a combined
+    summary next to the individual evaluations and returns the results.
+    """
+    print(f"📋 Bulk evaluation of {len(init_ids)} initiative(s)...")
+    shared = SharedContext()
     
-    with open(REGISTRY_FILE, 'w') as f:
-        json.dump(registry, f, indent=2)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(lambda i: generate_evaluation(i, shared, apply_status=False, force=force), init_ids))
+    shared.save_evaluation_cache()
     
-    print(f"✅ Updated {init_id} status to '{status}' with priority '{priority}'")
+    evaluated = [r for r in results if r]
+    missing = [i for i, r in zip(init_ids, results) if not r]
+    update_initiative_statuses({r["initiative_id"]: (r["status"], r["priority"]) for r in evaluated if r["status"]})
+    for r in evaluated:
+        if not r.get("cached"):
+            record_dependency_edges(r["initiative_id"], r["dependency_ids"])
+    
+    EVALUATIONS_DIR.mkdir(parents=True, exist_ok=True)
+    summary_file = EVALUATIONS_DIR / f"BULK-{datetime.now().strftime('%Y%m%d-%H%M%S')}.md"
+    with open(summary_file, 'w') as f:
+        f.write("# Bulk Evaluation Summary\n\n")
+        f.write(f"**Evaluated**: {datetime.now().isoformat()}\n")
+        f.write(f"**Initiatives**: {len(evaluated)}")
+        f.write(f" ({len(missing)} not found: {', '.join(missing)})\n\n" if missing else "\n\n")
+        f.write("| Initiative | Title | Recommendation | Priority | Conflicts | Duplicates |\n")
+        f.write("|---|---|---|---|---|---|\n")
+        for r in sorted(evaluated, key=lambda r: -r["priority_score"]):
+            f.write(f"| {r['initiative_id']} | {r['title']} | {r['recommendation']} | "
+                    f"{r['priority']} ({r['priority_score']}) | {', '.join(r['conflicts']) or '-'} | {r['duplicates']} |\n")
+    
+    approved = sum(1 for r in evaluated if r["recommendation"] == "APPROVED")
+    print(f"\n📊 Bulk evaluation complete: {approved} approved, "
+          f"{len(evaluated) - approved} need review, {len(missing)} not found")
+    print(f"📄 Summary: {summary_file}")
+    
+    return results
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: pm-auto-evaluator.py INIT-ID")
+    parser = argparse.ArgumentParser(description="Evaluate initiatives for conflicts, dependencies and priority")
+    parser.add_argument("init_ids", nargs="*", metavar="INIT-ID", help="Initiative(s) to evaluate")
+    parser.add_argument("--all-pending", action="store_true",
+                        help=f"Evaluate every initiative with status {' / '.join(PENDING_STATUSES)}")
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS, help="Worker threads for bulk evaluation")
+    parser.add_argument("--force", action="store_true", help="Ignore cached evaluation sections")
+    args = parser.parse_args()
+    
+    init_ids = list(args.init_ids)
+    if args.all_pending:
+        init_ids += [i["id"] for i in load_registry()["initiatives"]
+                     if i.get("status") in PENDING_STATUSES and i["id"] not in init_ids]
+    
+    if not init_ids:
+        if args.all_pending:
+            print("✅ No pending initiatives")
+            sys.exit(0)
+        parser.print_usage()
         sys.exit(1)
     
-    init_id = sys.argv[1]
-    success = generate_evaluation(init_id)
+    if len(init_ids) == 1 and not args.all_pending:
+        success = generate_evaluation(init_ids[0], force=args.force) is not None
+    else:
+        success = all(evaluate_bulk(init_ids, args.workers, args.force))
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -8,15 +8,32 @@ Usage:
     python3 pm-evaluator.py list-evaluations
     python3 pm-evaluator.py generate-roadmap
     python3 pm-evaluator.py analyze-dependencies
+    python3 pm-evaluator.py add-dependency TERP-INIT-007 TERP-INIT-006
+    python3 pm-evaluator.py sync-dependencies
 """
 
+import heapq
 import json
 import os
+import re
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 import argparse
 
+# Cross-platform file locking
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    # Windows doesn't have fcntl, use msvcrt instead
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
 # Get the product-management root directory
 SCRIPT_DIR = Path(__file__).parent
 PM_ROOT = SCRIPT_DIR.parent.parent
@@ -26,6 +43,22 @@ INBOX_DIR = PM_EVAL_DIR / "inbox"
 EVALUATIONS_DIR = PM_EVAL_DIR / "evaluations"
 ROADMAP_DIR = PM_EVAL_DIR / "roadmap"
 DEPENDENCIES_FILE = PM_EVAL_DIR / "dependencies.json"
+# Held across load -> modify -> save of dependencies.json
+DEPENDENCIES_LOCK = PM_EVAL_DIR / ".dependencies.lock"
+ROADMAP_ORDER_FILE = PM_EVAL_DIR / "roadmap_order.json"
+REGISTRY_FILE = INITIATIVES_DIR / "registry.json"
+# Registry writers (get-next-task, pm-auto-evaluator) replace the file
+# atomically, so they serialise on this sidecar instead of the file itself
+REGISTRY_LOCK = INITIATIVES_DIR / ".registry.lock"
+READY_QUEUE_FILE = PM_EVAL_DIR / "ready-queue.json"
+READY_QUEUE_LOCK = PM_EVAL_DIR / ".ready-queue.lock"
+
+# A prerequisite in one of these states no longer blocks its dependents
+DONE_STATUSES = ["completed", "ready-to-deploy", "qa-verified"]
+PRIORITY_ORDER = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+
+INITIATIVE_ID_RE = re.compile(r'TERP-INIT-\d+')
+HOURS_RE = re.compile(r'(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?')
 
 
 def load_dependencies():
@@ -42,10 +75,322 @@ def load_dependencies():
 
 
 def save_dependencies(deps):
-    """Save the dependencies graph"""
+    """Save the dependencies graph atomically; writers hold DEPENDENCIES_LOCK"""
     deps["last_updated"] = datetime.utcnow().isoformat() + "Z"
-    with open(DEPENDENCIES_FILE, 'w') as f:
+    tmp = DEPENDENCIES_FILE.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
         json.dump(deps, f, indent=2)
+    os.replace(tmp, DEPENDENCIES_FILE)
+
+
+class DependencyCycleError(Exception):
+    """Raised when an edge would make the dependency graph cyclic"""
+    
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__(" -> ".join(cycle))
+
+
+class DependencyGraph:
+    """
+    Initiative dependency DAG with an incrementally maintained schedule
+
+    Edges run from prerequisite to dependent. The topological order is kept
+    with the Pearce-Kelly algorithm: inserting an edge only reorders the
+    nodes between its endpoints' positions, and a cycle is detected (and
+    the edge rejected) during that same bounded search.
+
+    For the effort-weighted critical path each node keeps its earliest
+    start (longest prerequisite chain) and its tail (its own effort plus
+    the longest chain of dependents). An edge or effort change recomputes
+    earliest starts for the affected descendants and tails for the affected
+    ancestors only; slack is then makespan - (earliest start + tail).
+    """
+    
+    def __init__(self, deps):
+        self.graph = deps.get("graph", {})
+        schedule = deps.get("schedule", {})
+        self.effort = {n: schedule.get(n, {}).get("effort_hours", 0) for n in self.graph}
+        self.succ = {n: set() for n in self.graph}
+        self.pred = {n: set() for n in self.graph}
+        # _ensure() adds prerequisites that have no entry of their own
+        for node, rel in list(self.graph.items()):
+            for dep in rel.get("depends_on", []):
+                self._ensure(dep)
+                self.succ[dep].add(node)
+                self.pred[node].add(dep)
+        
+        # The stored order and schedule are only reused if they still agree
+        # with every edge (the file may have been edited by hand)
+        self.pos = None
+        self.start = {}
+        self.tail = {}
+        order = deps.get("order", [])
+        if set(order) == set(self.succ) and len(order) == len(self.succ):
+            pos = {n: i for i, n in enumerate(order)}
+            if all(pos[a] < pos[b] for a in self.succ for b in self.succ[a]):
+                self.pos = pos
+        if self.pos is None:
+            self._full_order()
+        elif self._has_schedule(schedule):
+            self.start = {n: schedule[n]["earliest_start"] for n in self.succ}
+            self.tail = {n: schedule[n]["tail"] for n in self.succ}
+        if not self._schedule_consistent():
+            self._update_start(self.succ)
+            self._update_tail(self.succ)
+    
+    def _has_schedule(self, schedule):
+        return all(n in schedule and "earliest_start" in schedule[n] and "tail" in schedule[n] for n in self.succ)
+    
+    def _schedule_consistent(self):
+        """True if every stored start and tail matches its neighbours"""
+        if set(self.start) != set(self.succ) or set(self.tail) != set(self.succ):
+            return False
+        return all(
+            self.start[n] == max((self.start[p] + self.effort[p] for p in self.pred[n]), default=0)
+            and self.tail[n] == self.effort[n] + max((self.tail[c] for c in self.succ[n]), default=0)
+            for n in self.succ
+        )
+    
+    def _ensure(self, node):
+        if node not in self.succ:
+            self.succ[node] = set()
+            self.pred[node] = set()
+            self.effort.setdefault(node, 0)
+            self.graph.setdefault(node, {"depends_on": [], "blocks": []})
+            if getattr(self, "pos", None) is not None:
+                self.pos[node] = len(self.pos)
+                self.start[node] = 0
+                self.tail[node] = self.effort[node]
+    
+    def _full_order(self):
+        """Kahn's algorithm; raises if the stored graph already has a cycle"""
+        indegree = {n: len(p) for n, p in self.pred.items()}
+        ready = sorted(n for n, d in indegree.items() if d == 0)
+        order = []
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for child in sorted(self.succ[node]):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.succ):
+            raise DependencyCycleError(sorted(n for n, d in indegree.items() if d > 0))
+        self.pos = {n: i for i, n in enumerate(order)}
+    
+    def order(self):
+        return sorted(self.pos, key=self.pos.get)
+    
+    def _reach(self, roots, edges):
+        """All nodes reachable from roots (inclusive) along edges"""
+        seen = set(roots)
+        stack = list(roots)
+        while stack:
+            for nxt in edges[stack.pop()]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+    
+    def _update_start(self, nodes):
+        """Recompute earliest starts of nodes and everything downstream of them"""
+        for node in sorted(self._reach(nodes, self.succ), key=self.pos.get):
+            self.start[node] = max((self.start[p] + self.effort[p] for p in self.pred[node]), default=0)
+    
+    def _update_tail(self, nodes):
+        """Recompute tails of nodes and everything upstream of them"""
+        for node in sorted(self._reach(nodes, self.pred), key=self.pos.get, reverse=True):
+            self.tail[node] = self.effort[node] + max((self.tail[s] for s in self.succ[node]), default=0)
+    
+    def add_edge(self, prerequisite, dependent, source="declared"):
+        """
+        Record that dependent depends on prerequisite
+
+        Returns True if the edge is new. Raises DependencyCycleError (and
+        leaves the graph unchanged) if the edge would close a cycle.
+        """
+        if prerequisite == dependent:
+            raise DependencyCycleError([dependent, dependent])
+        self._ensure(prerequisite)
+        self._ensure(dependent)
+        if dependent in self.succ[prerequisite]:
+            return False
+        
+        lower, upper = self.pos[dependent], self.pos[prerequisite]
+        if lower < upper:
+            # Forward search from dependent within the affected window
+            parent = {dependent: None}
+            stack = [dependent]
+            forward = []
+            while stack:
+                node = stack.pop()
+                forward.append(node)
+                for nxt in self.succ[node]:
+                    if nxt == prerequisite:
+                        chain = [node]
+                        while parent[chain[-1]] is not None:
+                            chain.append(parent[chain[-1]])
+                        raise DependencyCycleError([prerequisite] + chain[::-1] + [prerequisite])
+                    if nxt not in parent and self.pos[nxt] < upper:
+                        parent[nxt] = node
+                        stack.append(nxt)
+            
+            # Backward search from prerequisite, bounded the same way
+            seen = {prerequisite}
+            stack = [prerequisite]
+            backward = []
+            while stack:
+                node = stack.pop()
+                backward.append(node)
+                for prev in self.pred[node]:
+                    if prev not in seen and self.pos[prev] > lower:
+                        seen.add(prev)
+                        stack.append(prev)
+            
+            # Ancestors of prerequisite move ahead of descendants of dependent,
+            # reusing the same set of positions
+            moved = sorted(backward, key=self.pos.get) + sorted(forward, key=self.pos.get)
+            slots = sorted(self.pos[n] for n in moved)
+            for node, slot in zip(moved, slots):
+                self.pos[node] = slot
+        
+        self.succ[prerequisite].add(dependent)
+        self.pred[dependent].add(prerequisite)
+        rel = self.graph[dependent]
+        rel.setdefault("depends_on", []).append(prerequisite)
+        rel.setdefault("sources", {})[prerequisite] = source
+        self.graph[prerequisite].setdefault("blocks", []).append(dependent)
+        
+        self._update_start([dependent])
+        self._update_tail([prerequisite])
+        return True
+    
+    def set_effort(self, node, hours):
+        """Set a node's effort estimate; returns True if it changed"""
+        self._ensure(node)
+        if self.effort[node] == hours:
+            return False
+        self.effort[node] = hours
+        self._update_start(self.succ[node])
+        self._update_tail([node])
+        return True
+    
+    def makespan(self):
+        return max((self.start[n] + self.tail[n] for n in self.succ), default=0)
+    
+    def slack(self, node):
+        return self.makespan() - (self.start[node] + self.tail[node])
+    
+    def critical_path(self):
+        """Longest effort-weighted chain, following zero-slack nodes"""
+        total = self.makespan()
+        if not total:
+            return []
+        node = min((n for n in self.succ if not self.pred[n] and self.tail[n] == total), key=self.pos.get)
+        path = [node]
+        while self.succ[node]:
+            nxt = [s for s in self.succ[node] if self.tail[s] == self.tail[node] - self.effort[node]]
+            if not nxt:
+                break
+            node = min(nxt, key=self.pos.get)
+            path.append(node)
+        return path
+    
+    def to_dict(self, deps):
+        """Write the graph, order and schedule back into a dependencies document"""
+        total = self.makespan()
+        deps["graph"] = self.graph
+        deps["order"] = self.order()
+        deps["schedule"] = {
+            n: {
+                "effort_hours": self.effort[n],
+                "earliest_start": self.start[n],
+                "tail": self.tail[n],
+                "slack": total - (self.start[n] + self.tail[n])
+            }
+            for n in deps["order"]
+        }
+        deps["critical_path"] = self.critical_path()
+        deps["critical_path_hours"] = total
+        return deps
+
+
+def parse_hours(estimate):
+    """Midpoint of a "40-60" style hours estimate, or 0"""
+    match = HOURS_RE.search(str(estimate or ""))
+    if not match:
+        return 0
+    low = float(match.group(1))
+    high = float(match.group(2) or low)
+    return (low + high) / 2
+
+
+def add_dependencies(init_id, prerequisites, source="declared"):
+    """Add edges init_id -> each prerequisite and persist the updated schedule"""
+    PM_EVAL_DIR.mkdir(parents=True, exist_ok=True)
+    with open(DEPENDENCIES_LOCK, 'a') as lock_file, locked(lock_file):
+        deps = load_dependencies()
+        graph = DependencyGraph(deps)
+        added = 0
+        for prerequisite in prerequisites:
+            try:
+                if graph.add_edge(prerequisite, init_id, source):
+                    added += 1
+                    print(f"✅ {init_id} depends on {prerequisite} ({source})")
+            except DependencyCycleError as e:
+                print(f"❌ Rejected {init_id} -> {prerequisite}: would create cycle {e}")
+        if added:
+            save_dependencies(graph.to_dict(deps))
+    return added
+
+
+def sync_dependencies():
+    """
+    Ingest declared dependencies and effort estimates
+
+    Edges come from roadmap_order.json ("dependencies" and "blocks") and
+    from each initiative manifest's "dependencies"; efforts are the
+    midpoints of roadmap_order.json "human_expert_hours", summed across
+    phases of the same initiative.
+    """
+    PM_EVAL_DIR.mkdir(parents=True, exist_ok=True)
+    with open(DEPENDENCIES_LOCK, 'a') as lock_file, locked(lock_file):
+        deps = load_dependencies()
+        graph = DependencyGraph(deps)
+        edges = []
+        efforts = {}
+        
+        if ROADMAP_ORDER_FILE.exists():
+            with open(ROADMAP_ORDER_FILE, 'r') as f:
+                roadmap = json.load(f)
+            for sprint in roadmap.get("sprints", []):
+                init_id = sprint["initiative_id"]
+                efforts[init_id] = efforts.get(init_id, 0) + parse_hours(sprint.get("human_expert_hours"))
+                for dep in sprint.get("dependencies", []):
+                    edges.extend((ref, init_id) for ref in INITIATIVE_ID_RE.findall(dep))
+                for blocked in sprint.get("blocks", []):
+                    edges.extend((init_id, ref) for ref in INITIATIVE_ID_RE.findall(blocked))
+        
+        for manifest_file in sorted(INITIATIVES_DIR.glob("*/manifest.json")):
+            with open(manifest_file, 'r') as f:
+                manifest = json.load(f)
+            for dep in manifest.get("dependencies", []):
+                edges.extend((ref, manifest["id"]) for ref in INITIATIVE_ID_RE.findall(str(dep)))
+        
+        changed = 0
+        for init_id, hours in efforts.items():
+            changed += graph.set_effort(init_id, hours)
+        for prerequisite, dependent in edges:
+            if prerequisite == dependent:
+                continue
+            try:
+                changed += graph.add_edge(prerequisite, dependent, "declared")
+            except DependencyCycleError as e:
+                print(f"❌ Rejected {dependent} -> {prerequisite}: would create cycle {e}")
+        
+        save_dependencies(graph.to_dict(deps))
+    print(f"✅ Synced dependencies: {changed} change(s), critical path {deps['critical_path_hours']:g}h")
 
 
 def list_inbox():
@@ -548,111 +893,243 @@ def analyze_dependencies():
         
         print()
     
+    if deps.get("order"):
+        print(f"Build Order:")
+        schedule = deps.get("schedule", {})
+        for init_id in deps["order"]:
+            entry = schedule.get(init_id, {})
+            print(f"  {init_id}: start {entry.get('earliest_start', 0):g}h, "
+                  f"effort {entry.get('effort_hours', 0):g}h, slack {entry.get('slack', 0):g}h")
+        print()
+    
     if deps.get("critical_path"):
-        print(f"Critical Path:")
+        print(f"Critical Path ({deps.get('critical_path_hours', 0):g}h):")
         for i, init_id in enumerate(deps["critical_path"], 1):
             print(f"  {i}. {init_id}")
     
     print(f"\nLast Updated: {deps.get('last_updated', 'Unknown')}")
 
 
-def get_next_task(agent_id=None):
-    """Get the next available task from the roadmap (cross-platform)"""
-    # Cross-platform file locking
+@contextmanager
+def locked(f):
+    """Hold an exclusive lock on an open file (cross-platform)"""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    elif msvcrt:
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
     try:
-        import fcntl
-        HAS_FCNTL = True
-    except ImportError:
-        # Windows doesn't have fcntl, use msvcrt instead
-        HAS_FCNTL = False
-        try:
-            import msvcrt
-        except ImportError:
-            msvcrt = None
-
-    # Load registry with file lock for atomic operation
-    registry_file = INITIATIVES_DIR / "registry.json"
-    roadmap_order_file = PM_EVAL_DIR / "roadmap_order.json"
-
-    if not registry_file.exists():
-        print("ℹ️  No initiatives in registry")
-        return None
-
-    with open(registry_file, 'r+') as f:
-        # Acquire exclusive lock (cross-platform)
-        if HAS_FCNTL:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        yield f
+    finally:
+        # Release lock (cross-platform)
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
         elif msvcrt:
-            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
 
-        try:
-            registry = json.load(f)
 
-            # Load roadmap order if available
-            roadmap_order = []
-            if roadmap_order_file.exists():
-                with open(roadmap_order_file, 'r') as rf:
-                    roadmap_data = json.load(rf)
-                    roadmap_order = [sprint["initiative_id"] for sprint in roadmap_data.get("sprints", [])]
+def save_registry(registry):
+    """Replace the registry atomically; callers hold REGISTRY_LOCK"""
+    tmp = REGISTRY_FILE.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp, REGISTRY_FILE)
 
-            # Filter to approved initiatives not in progress
-            candidates = []
-            for init in registry["initiatives"]:
-                if init["status"] != "approved":
-                    continue
 
-                # Check if dependencies are satisfied
-                # (Simplified - assumes no dependencies for now)
-                candidates.append(init)
+def _file_signature(path):
+    try:
+        st = path.stat()
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
 
-            if not candidates:
-                print("ℹ️  No tasks available")
-                return None
 
-            # Sort by roadmap order first, then by priority
-            def sort_key(init):
-                init_id = init["id"]
-                # If in roadmap order, use that position (lower is better)
-                if init_id in roadmap_order:
-                    return (0, roadmap_order.index(init_id))
-                # Otherwise sort by priority
-                priority_order = {"high": 3, "medium": 2, "low": 1, None: 0}
-                return (1, -priority_order.get(init.get("priority"), 0))
+class ReadyQueue:
+    """
+    Persisted ready-set of approved initiatives whose prerequisites are done
 
-            candidates.sort(key=sort_key)
+    Ready initiatives sit in a heap ordered by roadmap position, then
+    priority; approved ones still blocked wait with their unmet
+    prerequisites. Registry status changes since the last call are applied
+    as events - a newly approved initiative is admitted, a finished one
+    releases its waiting dependents - so nothing is re-sorted or
+    re-filtered. Heap entries whose status moved on are dropped lazily on
+    pop. The whole state is rebuilt only when dependencies.json or
+    roadmap_order.json change.
+    """
+    
+    def __init__(self, state, deps):
+        self.state = state
+        self.graph = deps.get("graph", {})
+    
+    @classmethod
+    def load(cls, registry):
+        deps = load_dependencies()
+        signatures = [_file_signature(DEPENDENCIES_FILE), _file_signature(ROADMAP_ORDER_FILE)]
+        state = None
+        if READY_QUEUE_FILE.exists():
+            with open(READY_QUEUE_FILE, 'r') as f:
+                state = json.load(f)
+        
+        if not state or state.get("signatures") != signatures:
+            state = {"signatures": signatures, "statuses": {}, "heap": [], "waiting": {},
+                     "claimed": [], "ranks": cls._ranks(registry)}
+        queue = cls(state, deps)
+        queue.sync(registry)
+        return queue
+    
+    @staticmethod
+    def _ranks(registry):
+        """Heap key per initiative: roadmap position first, then priority"""
+        roadmap_position = {}
+        if ROADMAP_ORDER_FILE.exists():
+            with open(ROADMAP_ORDER_FILE, 'r') as f:
+                for sprint in json.load(f).get("sprints", []):
+                    roadmap_position.setdefault(sprint["initiative_id"], len(roadmap_position))
+        return {
+            init["id"]: [0, roadmap_position[init["id"]]] if init["id"] in roadmap_position
+            else [1, -PRIORITY_ORDER.get(init.get("priority"), 0)]
+            for init in registry["initiatives"]
+        }
+    
+    def _unmet(self, init_id):
+        statuses = self.state["statuses"]
+        # Prerequisites outside the registry are not tracked here and do not block
+        return [
+            dep for dep in self.graph.get(init_id, {}).get("depends_on", [])
+            if dep in statuses and statuses[dep] not in DONE_STATUSES
+        ]
+    
+    def _admit(self, init_id):
+        unmet = self._unmet(init_id)
+        if unmet:
+            self.state["waiting"][init_id] = unmet
+        else:
+            rank = self.state["ranks"].get(init_id, [1, 0])
+            heapq.heappush(self.state["heap"], rank + [init_id])
+    
+    def _release(self, init_id):
+        waiting = self.state["waiting"]
+        for dependent in self.graph.get(init_id, {}).get("blocks", []):
+            if dependent in waiting and init_id in waiting[dependent]:
+                waiting[dependent].remove(init_id)
+                if not waiting[dependent]:
+                    del waiting[dependent]
+                    if self.state["statuses"].get(dependent) == "approved":
+                        self._admit(dependent)
+    
+    def sync(self, registry):
+        """Apply registry status changes since the last snapshot as admit/release events"""
+        statuses = self.state["statuses"]
+        claimed = set(self.state["claimed"])
+        ranks = self.state["ranks"]
+        
+        # Record every new status first so admissions see current prerequisites
+        changes = []
+        for init in registry["initiatives"]:
+            init_id, status = init["id"], init["status"]
+            if init_id in claimed:
+                # Either the claim's registry write landed, or the claim was
+                # released (back to approved) and pop()'s in-progress status
+                # below turns that into a re-admission
+                claimed.discard(init_id)
+            old = statuses.get(init_id)
+            if old != status:
+                statuses[init_id] = status
+                changes.append((init, old))
+        
+        for init, old in changes:
+            init_id, status = init["id"], init["status"]
+            if ranks.get(init_id, [1])[0] == 1:
+                # Off-roadmap initiatives rank by their current priority
+                ranks[init_id] = [1, -PRIORITY_ORDER.get(init.get("priority"), 0)]
+            
+            if status in DONE_STATUSES and old not in DONE_STATUSES:
+                self._release(init_id)
+            if status == "approved" and init_id not in claimed:
+                self._admit(init_id)
+            elif status != "approved":
+                self.state["waiting"].pop(init_id, None)
+        
+        self.state["claimed"] = sorted(claimed)
+    
+    def pop(self):
+        """Claim the best ready initiative, or None"""
+        heap = self.state["heap"]
+        claimed = self.state["claimed"]
+        while heap:
+            init_id = heapq.heappop(heap)[-1]
+            if self.state["statuses"].get(init_id) == "approved" and init_id not in claimed \
+                    and init_id not in self.state["waiting"]:
+                claimed.append(init_id)
+                # Record the claim as a status so a later return to
+                # "approved" is seen as a change and re-admitted
+                self.state["statuses"][init_id] = "in-progress"
+                return init_id
+        return None
+    
+    def save(self):
+        tmp = READY_QUEUE_FILE.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, READY_QUEUE_FILE)
 
-            # Get top task
-            next_task = candidates[0]
 
-            # Update status to in-progress atomically
+def get_next_task(agent_id=None):
+    """
+    Get the next available task from the roadmap (cross-platform)
+
+    The claim itself is a heap pop on the persisted ReadyQueue, under a
+    lock on the small queue file; the registry is then updated under
+    REGISTRY_LOCK before the queue lock is released. Initiatives with
+    unfinished prerequisites (dependencies.json) are never handed out.
+    """
+    if not REGISTRY_FILE.exists():
+        print("ℹ️  No initiatives in registry")
+        return None
+    
+    PM_EVAL_DIR.mkdir(parents=True, exist_ok=True)
+    # The registry write stays under the queue lock so the next sync always
+    # sees the claim it made (or its absence, if the write never happened)
+    with open(READY_QUEUE_LOCK, 'a') as lock_file, locked(lock_file):
+        with open(REGISTRY_FILE, 'r') as f:
+            registry = json.load(f)
+        queue = ReadyQueue.load(registry)
+        init_id = queue.pop()
+        queue.save()
+        
+        if not init_id:
+            blocked = len(queue.state["waiting"])
+            print("ℹ️  No tasks available" + (f" ({blocked} approved initiative(s) waiting on dependencies)" if blocked else ""))
+            return None
+        
+        # Update status to in-progress atomically
+        next_task = None
+        with open(REGISTRY_LOCK, 'a') as registry_lock, locked(registry_lock):
+            with open(REGISTRY_FILE, 'r') as f:
+                registry = json.load(f)
             for init in registry["initiatives"]:
-                if init["id"] == next_task["id"]:
+                if init["id"] == init_id:
                     init["status"] = "in-progress"
                     if agent_id:
                         init["assigned_to"] = agent_id
+                    next_task = init
                     break
-
+            
+            if next_task is None:
+                print(f"⚠️  {init_id} left the registry before it could be claimed")
+                return None
+            
             # Write back
-            f.seek(0)
-            json.dump(registry, f, indent=2)
-            f.truncate()
-
-            print(f"✅ Next task: {next_task['id']}")
-            print(f"   Title: {next_task['title']}")
-            print(f"   Priority: {next_task.get('priority', 'not set')}")
-            if agent_id:
-                print(f"   Assigned to: {agent_id}")
-
-            return next_task
-
-        finally:
-            # Release lock (cross-platform)
-            if HAS_FCNTL:
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-            elif msvcrt:
-                f.seek(0)
-                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
-
+            save_registry(registry)
+    
+    print(f"✅ Next task: {next_task['id']}")
+    print(f"   Title: {next_task['title']}")
+    print(f"   Priority: {next_task.get('priority', 'not set')}")
+    if agent_id:
+        print(f"   Assigned to: {agent_id}")
+    
+    return next_task
 
 
 def main():
@@ -675,6 +1152,15 @@ def main():
     # Analyze dependencies
     deps_parser = subparsers.add_parser('analyze-dependencies', help='Analyze dependencies')
     
+    # Add dependency edges
+    add_dep_parser = subparsers.add_parser('add-dependency', help='Record that an initiative depends on others')
+    add_dep_parser.add_argument('id', help='Dependent initiative ID')
+    add_dep_parser.add_argument('depends_on', nargs='+', help='Prerequisite initiative ID(s)')
+    add_dep_parser.add_argument('--source', default='declared', help='Where the edge came from (declared, extracted)')
+    
+    # Sync declared dependencies and estimates
+    sync_parser = subparsers.add_parser('sync-dependencies', help='Ingest roadmap/manifest dependencies and effort estimates')
+    
     # Get next task
     next_task_parser = subparsers.add_parser('get-next-task', help='Get next available task from roadmap')
     next_task_parser.add_argument('--agent-id', help='Agent ID claiming the task')
@@ -696,6 +1182,12 @@ def main():
     elif args.command == 'analyze-dependencies':
         analyze_dependencies()
     
+    elif args.command == 'add-dependency':
+        add_dependencies(args.id, args.depends_on, args.source)
+    
+    elif args.command == 'sync-dependencies':
+        sync_dependencies()
+    
     elif args.command == 'get-next-task':
         task = get_next_task(args.agent_id if hasattr(args, 'agent_id') else None)
         sys.exit(0 if task else 1)
@@ -5,173 +5,523 @@ QA Checklist Automation for TERP Product Management
 Runs automated quality checks on initiatives before completion.
 """
 
+import hashlib
 import json
 import sys
 import os
+import shutil
+import socket
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent.parent
 INITIATIVES_DIR = BASE_DIR / "initiatives"
+QA_CACHE_DIR = BASE_DIR / "_system" / "cache" / "qa"
+TERP_ROOT = BASE_DIR.parent
+# Written by analyze-codebase.py; its generation only moves when TERP sources change
+SNAPSHOT_META_FILE = BASE_DIR / "codebase" / "snapshot.meta.json"
 
-def run_command(cmd, cwd=None):
-    """Run a shell command and return output"""
+QA_WORKER_SCRIPT = Path(__file__).parent / "qa-worker.mjs"
+QA_WORKER_SOCKET = QA_CACHE_DIR / "worker.sock"
+QA_WORKER_LOG = QA_CACHE_DIR / "worker.log"
+QA_WORKER_IDLE_SECONDS = 600
+QA_WORKER_START_TIMEOUT = 30
+QA_WORKER_CHECK_TIMEOUT = 300
+QA_WORKER_BATCH = 200
+QA_WORKER_STATUS = QA_CACHE_DIR / "worker-unavailable.json"
+# Cached lint/type diagnostics are only valid for these project inputs,
+# plus the analysed source generation (see static_analysis_fingerprint)
+STATIC_ANALYSIS_INPUTS = [
+    TERP_ROOT / "tsconfig.json",
+    TERP_ROOT / "eslint.config.js",
+    TERP_ROOT / "package.json",
+    TERP_ROOT / "pnpm-lock.yaml"
+]
+# Whether the worker can start at all depends only on these
+QA_WORKER_PROBES = [
+    TERP_ROOT / "node_modules" / "eslint" / "package.json",
+    TERP_ROOT / "node_modules" / "typescript" / "package.json"
+]
+
+
+class RuleUnavailable(Exception):
+    """A rule's external tooling is missing; its report section is skipped"""
+
+
+def _file_signature(path):
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        return False, "", "Command timed out"
-    except Exception as e:
-        return False, "", str(e)
+        st = path.stat()
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+def static_analysis_fingerprint():
+    """TS/ESLint config signatures and the codebase snapshot generation"""
+    try:
+        with open(SNAPSHOT_META_FILE, 'r') as f:
+            generation = json.load(f).get("generation")
+    except (OSError, ValueError):
+        generation = None
+    inputs = json.dumps([_file_signature(path) for path in STATIC_ANALYSIS_INPUTS] + [generation])
+    return hashlib.blake2b(inputs.encode(), digest_size=8).hexdigest()
+
+
+def worker_probe():
+    return [shutil.which("node")] + [_file_signature(path) for path in QA_WORKER_PROBES]
+
+
+def worker_request(payload, timeout):
+    """Send one request to the QA worker and return its response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(QA_WORKER_SOCKET))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        buffer = b""
+        while not buffer.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise OSError("QA worker closed the connection")
+            buffer += chunk
+    response = json.loads(buffer)
+    if not response.get("ok"):
+        raise OSError(response.get("error", "QA worker request failed"))
+    return response
 
-def check_code_quality(init_dir, report):
-    """Check code quality with linting"""
-    print("🔍 Checking code quality...")
+
+def ensure_worker():
+    """
+    Connect to the warm QA worker, starting it if none is running
+
+    The worker outlives this process (it exits on its own after
+    QA_WORKER_IDLE_SECONDS without a request), so later QA runs reuse the
+    already-loaded ESLint config and TypeScript program.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuleUnavailable("Unix sockets not supported on this platform")
+    try:
+        return worker_request({"method": "ping"}, timeout=5)
+    except (OSError, ValueError):
+        pass
+    
+    node = shutil.which("node")
+    if not node:
+        raise RuleUnavailable("Node.js not found")
+    
+    QA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(QA_WORKER_LOG, 'w') as log:
+        process = subprocess.Popen(
+            [node, str(QA_WORKER_SCRIPT),
+             "--root", str(TERP_ROOT),
+             "--socket", str(QA_WORKER_SOCKET),
+             "--idle", str(QA_WORKER_IDLE_SECONDS)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True
+        )
     
-    # Find all TypeScript/JavaScript files in artifacts
-    artifacts_dir = init_dir / "artifacts"
-    if not artifacts_dir.exists():
-        report["code_quality"] = {"status": "skipped", "reason": "No artifacts directory"}
+    deadline = time.monotonic() + QA_WORKER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            with open(QA_WORKER_LOG, 'r') as f:
+                lines = f.read().strip().splitlines()
+            raise RuleUnavailable(lines[-1] if lines else f"QA worker exited with code {process.returncode}")
+        try:
+            return worker_request({"method": "ping"}, timeout=5)
+        except (OSError, ValueError):
+            time.sleep(0.2)
+    raise RuleUnavailable(f"QA worker did not start within {QA_WORKER_START_TIMEOUT}s")
+
+class QARule:
+    """
+    A per-file QA check
+
+    The artifact scanner reads each file once and hands its text to every
+    rule whose extensions match; visit() must only look at that text (it
+    runs on worker threads) and returns a per-file result. finish() merges
+    the per-file results, in path order, into the rule's report section.
+    Adding a check means adding a rule to RULES, not another pass over the
+    artifacts tree. Per-file results are cached by content hash under
+    "name@version": bump version whenever visit() changes.
+    
+    Batch rules (batch = True) implement visit_batch() instead: it is
+    called once per scan with every path that has no cached result and
+    returns {path: result}, or raises RuleUnavailable. A rule that reports
+    itself unavailable() up front is left out of the scan entirely.
+    """
+    name = ""
+    version = 1
+    label = ""
+    extensions = ()
+    empty_reason = "No code files"
+    batch = False
+    
+    def unavailable(self):
+        """Reason this rule cannot run, checked before the scan; None if it can"""
+        return None
+    
+    def visit(self, path, text):
+        raise NotImplementedError
+    
+    def visit_batch(self, paths):
+        raise NotImplementedError
+    
+    def finish(self, results):
+        raise NotImplementedError
+    
+    def announce(self, section):
+        """Print the outcome; returns False only for a failing check"""
         return True
-    
-    ts_files = list(artifacts_dir.glob("**/*.ts")) + list(artifacts_dir.glob("**/*.tsx"))
-    js_files = list(artifacts_dir.glob("**/*.js")) + list(artifacts_dir.glob("**/*.jsx"))
-    
-    if not ts_files and not js_files:
-        report["code_quality"] = {"status": "skipped", "reason": "No code files found"}
+
+
+class CodeQualityRule(QARule):
+    """console.log statements and TODO/FIXME comments"""
+    name = "code_quality"
+    label = "code quality"
+    extensions = (".ts", ".tsx", ".js", ".jsx")
+    empty_reason = "No code files found"
+    
+    def visit(self, path, text):
+        todos = [i for i, line in enumerate(text.splitlines(), 1) if 'TODO' in line or 'FIXME' in line]
+        return {"console_log": 'console.log' in text, "todos": todos}
+    
+    def finish(self, results):
+        issues = [f"Found console.log in {path.name}" for path, r in results if r["console_log"]]
+        issues += [f"Found TODO/FIXME in {path.name}:{i}" for path, r in results for i in r["todos"]]
+        return {
+            "status": "pass" if not issues else "warning",
+            "files_checked": len(results),
+            "issues": issues
+        }
+    
+    def announce(self, section):
+        issues = section["issues"]
+        if issues:
+            print(f"⚠️  Found {len(issues)} code quality issue(s)")
+            for issue in issues[:5]:  # Show first 5
+                print(f"   - {issue}")
+        else:
+            print("✅ Code quality checks passed")
         return True
-    
-    issues = []
-    
-    # Check for console.log statements
-    for file in ts_files + js_files:
-        with open(file, 'r') as f:
-            content = f.read()
-            if 'console.log' in content:
-                issues.append(f"Found console.log in {file.name}")
-    
-    # Check for TODO/FIXME comments
-    for file in ts_files + js_files:
-        with open(file, 'r') as f:
-            for i, line in enumerate(f, 1):
-                if 'TODO' in line or 'FIXME' in line:
-                    issues.append(f"Found TODO/FIXME in {file.name}:{i}")
-    
-    report["code_quality"] = {
-        "status": "pass" if not issues else "warning",
-        "files_checked": len(ts_files) + len(js_files),
-        "issues": issues
-    }
-    
-    if issues:
-        print(f"⚠️  Found {len(issues)} code quality issue(s)")
-        for issue in issues[:5]:  # Show first 5
-            print(f"   - {issue}")
-    else:
-        print("✅ Code quality checks passed")
-    
-    return True
 
-def check_type_safety(init_dir, report):
-    """Check TypeScript type safety"""
-    print("🔍 Checking type safety...")
-    
-    artifacts_dir = init_dir / "artifacts"
-    if not artifacts_dir.exists():
-        report["type_safety"] = {"status": "skipped", "reason": "No artifacts directory"}
+
+class TypeSafetyRule(QARule):
+    """Share of lines using the 'any' type"""
+    name = "type_safety"
+    label = "type safety"
+    extensions = (".ts", ".tsx")
+    empty_reason = "No TypeScript files"
+    
+    def visit(self, path, text):
+        lines = text.splitlines()
+        return {
+            "lines": len(lines),
+            "any": sum(1 for line in lines if ': any' in line or '<any>' in line)
+        }
+    
+    def finish(self, results):
+        any_count = sum(r["any"] for _, r in results)
+        total_lines = sum(r["lines"] for _, r in results)
+        any_ratio = (any_count / max(total_lines, 1)) * 100
+        return {
+            "status": "pass" if any_ratio < 5 else "warning",
+            "any_count": any_count,
+            "any_ratio": f"{any_ratio:.1f}%",
+            "total_lines": total_lines
+        }
+    
+    def announce(self, section):
+        if section["status"] == "warning":
+            print(f"⚠️  High usage of 'any' type: {section['any_ratio']}")
+        else:
+            print("✅ Type safety checks passed")
         return True
-    
-    ts_files = list(artifacts_dir.glob("**/*.ts")) + list(artifacts_dir.glob("**/*.tsx"))
-    
-    if not ts_files:
-        report["type_safety"] = {"status": "skipped", "reason": "No TypeScript files"}
+
+
+class ErrorHandlingRule(QARule):
+    """try/catch coverage of async code"""
+    name = "error_handling"
+    label = "error handling"
+    extensions = (".ts", ".tsx")
+    empty_reason = "No code files"
+    
+    def visit(self, path, text):
+        return {
+            # Count async functions and try-catch blocks
+            "async": text.count('async '),
+            "try_catch": text.count('try {'),
+            # Check for unhandled promises
+            "unhandled": 'await ' in text and 'try' not in text
+        }
+    
+    def finish(self, results):
+        async_count = sum(r["async"] for _, r in results)
+        try_catch_count = sum(r["try_catch"] for _, r in results)
+        coverage = (try_catch_count / max(async_count, 1)) * 100
+        return {
+            "status": "pass" if coverage >= 50 or async_count == 0 else "warning",
+            "async_functions": async_count,
+            "try_catch_blocks": try_catch_count,
+            "coverage": f"{coverage:.0f}%",
+            "issues": [f"Potential unhandled promise in {path.name}" for path, r in results if r["unhandled"]]
+        }
+    
+    def announce(self, section):
+        if section["status"] == "warning":
+            print(f"⚠️  Low error handling coverage: {section['coverage']}")
+        else:
+            print("✅ Error handling checks passed")
         return True
-    
-    # Count 'any' types
-    any_count = 0
-    total_lines = 0
-    
-    for file in ts_files:
-        with open(file, 'r') as f:
-            lines = f.readlines()
-            total_lines += len(lines)
-            for line in lines:
-                if ': any' in line or '<any>' in line:
-                    any_count += 1
-    
-    any_ratio = (any_count / max(total_lines, 1)) * 100
-    
-    report["type_safety"] = {
-        "status": "pass" if any_ratio < 5 else "warning",
-        "any_count": any_count,
-        "any_ratio": f"{any_ratio:.1f}%",
-        "total_lines": total_lines
+
+
+class StaticAnalysisRule(QARule):
+    """ESLint and TypeScript diagnostics from the warm QA worker"""
+    name = "static_analysis"
+    label = "lint and type errors"
+    extensions = (".ts", ".tsx", ".js", ".jsx")
+    empty_reason = "No code files found"
+    batch = True
+    _version = None
+    
+    @property
+    def version(self):
+        """Rule revision plus the project config and sources diagnostics depend on"""
+        if self._version is None:
+            self._version = f"3-{static_analysis_fingerprint()}"
+        return self._version
+    
+    def unavailable(self):
+        """The last start failure, as long as node and the packages are unchanged"""
+        try:
+            with open(QA_WORKER_STATUS, 'r') as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return status["reason"] if status.get("probe") == worker_probe() else None
+    
+    def visit_batch(self, paths):
+        try:
+            worker = ensure_worker()
+            missing = [tool for tool in ("eslint", "typescript") if not worker.get(tool)]
+            if missing:
+                raise RuleUnavailable(f"{' and '.join(missing)} not installed in the TERP project")
+        except RuleUnavailable as e:
+            # Remembered so later runs don't respawn a worker that cannot start
+            QA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(QA_WORKER_STATUS, 'w') as f:
+                json.dump({"probe": worker_probe(), "reason": str(e)}, f)
+            raise
+        QA_WORKER_STATUS.unlink(missing_ok=True)
+        
+        results = {}
+        for start in range(0, len(paths), QA_WORKER_BATCH):
+            chunk = paths[start:start + QA_WORKER_BATCH]
+            try:
+                response = worker_request(
+                    {"method": "check", "files": [str(path) for path in chunk]},
+                    timeout=QA_WORKER_CHECK_TIMEOUT
+                )
+            except (OSError, ValueError) as e:
+                raise RuleUnavailable(f"QA worker failed: {e}")
+            for path in chunk:
+                results[path] = response["results"][str(path)]
+        return results
+    
+    def finish(self, results):
+        diagnostics = []
+        for path, r in results:
+            for d in r["lint"] or []:
+                rule = f" ({d['rule']})" if d["rule"] else ""
+                diagnostics.append((d["severity"], f"{path.name}:{d['line']}:{d['column']} {d['message']}{rule}"))
+            for d in r["types"] or []:
+                diagnostics.append((d["severity"], f"{path.name}:{d['line']}:{d['column']} TS{d['code']}: {d['message']}"))
+        errors = sum(1 for severity, _ in diagnostics if severity == "error")
+        return {
+            "status": "pass" if not diagnostics else "warning",
+            "files_checked": len(results),
+            "errors": errors,
+            "warnings": len(diagnostics) - errors,
+            "issues": [issue for _, issue in diagnostics]
+        }
+    
+    def announce(self, section):
+        issues = section["issues"]
+        if issues:
+            print(f"⚠️  {section['errors']} error(s), {section['warnings']} warning(s) from ESLint/TypeScript")
+            for issue in issues[:5]:  # Show first 5
+                print(f"   - {issue}")
+        else:
+            print("✅ Lint and type checks passed")
+        return True
+
+
+# Per-file checks, in report order
+RULES = [CodeQualityRule(), TypeSafetyRule(), ErrorHandlingRule(), StaticAnalysisRule()]
+QA_WORKERS = 8
+
+
+def load_qa_cache(init_id):
+    """Per-artifact rule results for an initiative"""
+    try:
+        with open(QA_CACHE_DIR / f"{init_id}.json", 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}, "results": {}}
+
+
+def save_qa_cache(init_id, cache):
+    QA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_file = QA_CACHE_DIR / f"{init_id}.json"
+    tmp = cache_file.with_suffix(".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp, cache_file)
+
+
+def scan_artifacts(artifacts_dir, rules, cache=None, workers=QA_WORKERS):
+    """
+    Walk the artifacts tree once, read each file once and run every matching rule
+
+    With a cache ({"files": {relpath: {signature, hash}}, "results":
+    {hash: {"rule@version": result}}}), a file whose stat signature is
+    unchanged is not even read, and a file whose content hash is already
+    known only runs the rules missing for it. Batch rules then run once
+    over all files still missing their result. The cache is updated in
+    place and pruned to the files seen.
+    
+    Returns ({rule name: [(path, per-file result), ...]} in path order,
+    {"reused": n, "recomputed": n, "unavailable": {rule name: reason}}).
+    """
+    if cache is None:
+        cache = {"files": {}, "results": {}}
+    unavailable = {}
+    for rule in rules:
+        reason = rule.unavailable()
+        if reason:
+            unavailable[rule.name] = reason
+    active = [rule for rule in rules if rule.name not in unavailable]
+    suffixes = {ext for rule in active for ext in rule.extensions}
+    files = sorted(
+        Path(root) / name
+        for root, _, names in os.walk(artifacts_dir)
+        for name in names
+        if os.path.splitext(name)[1] in suffixes
+    )
+    
+    def rule_keys(path):
+        return {rule.name: f"{rule.name}@{rule.version}" for rule in active if path.suffix in rule.extensions}
+    
+    def visit_file(path):
+        keys = rule_keys(path)
+        rel = str(path.relative_to(artifacts_dir))
+        st = path.stat()
+        signature = [st.st_mtime_ns, st.st_size]
+        known = cache["files"].get(rel)
+        if known and known["signature"] == signature:
+            cached = cache["results"].get(known["hash"], {})
+            if all(key in cached for key in keys.values()):
+                return rel, signature, known["hash"], {name: cached[key] for name, key in keys.items()}, []
+        
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        cached = cache["results"].get(digest, {})
+        missing = [rule for rule in active if rule.name in keys and keys[rule.name] not in cached]
+        per_file = [rule for rule in missing if not rule.batch]
+        if per_file:
+            text = data.decode('utf-8', errors='replace')
+            computed = {rule.name: rule.visit(path, text) for rule in per_file}
+        else:
+            computed = {}
+        per_rule = {
+            name: computed[name] if name in computed else cached[key]
+            for name, key in keys.items()
+            if name in computed or key in cached
+        }
+        return rel, signature, digest, per_rule, [rule.name for rule in missing]
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        visited = list(zip(files, pool.map(visit_file, files)))
+    
+    # Batch rules see every file that still lacks their result in one call
+    for rule in active:
+        if not rule.batch:
+            continue
+        pending = [path for path, (*_, missing) in visited if rule.name in missing]
+        if not pending:
+            continue
+        try:
+            computed = rule.visit_batch(pending)
+        except RuleUnavailable as e:
+            unavailable[rule.name] = str(e)
+            continue
+        for path, (_, _, _, per_rule, _) in visited:
+            if path in computed:
+                per_rule[rule.name] = computed[path]
+    
+    results = {rule.name: [] for rule in rules if rule.name not in unavailable}
+    stats = {"reused": 0, "recomputed": 0, "unavailable": unavailable}
+    files_seen = {}
+    results_seen = {}
+    for path, (rel, signature, digest, per_rule, missing) in visited:
+        recomputed = any(name not in unavailable for name in missing)
+        stats["recomputed" if recomputed else "reused"] += 1
+        files_seen[rel] = {"signature": signature, "hash": digest}
+        entry = results_seen.setdefault(digest, dict(cache["results"].get(digest, {})))
+        for name, result in per_rule.items():
+            entry[rule_keys(path)[name]] = result
+            if name in results:
+                results[name].append((path, result))
+    
+    # Keep only the current files, and only results of current rule versions
+    # (including those of rules unavailable this run)
+    current = {f"{rule.name}@{rule.version}" for rule in rules}
+    cache["files"] = files_seen
+    cache["results"] = {
+        digest: {key: value for key, value in entry.items() if key in current}
+        for digest, entry in results_seen.items()
     }
-    
-    if any_ratio >= 5:
-        print(f"⚠️  High usage of 'any' type: {any_ratio:.1f}%")
-    else:
-        print("✅ Type safety checks passed")
-    
-    return True
+    return results, stats
 
-def check_error_handling(init_dir, report):
-    """Check for proper error handling"""
-    print("🔍 Checking error handling...")
-    
+
+def run_file_checks(init_dir, report, rules=RULES):
+    """
+    Run all per-file rules over the initiative's artifacts in one scan
+
+    Returns (passed, scan stats); only new or changed artifacts are
+    re-checked, the rest come from the initiative's QA cache.
+    """
     artifacts_dir = init_dir / "artifacts"
     if not artifacts_dir.exists():
-        report["error_handling"] = {"status": "skipped", "reason": "No artifacts directory"}
-        return True
-    
-    ts_files = list(artifacts_dir.glob("**/*.ts")) + list(artifacts_dir.glob("**/*.tsx"))
-    
-    if not ts_files:
-        report["error_handling"] = {"status": "skipped", "reason": "No code files"}
-        return True
-    
-    issues = []
-    async_count = 0
-    try_catch_count = 0
-    
-    for file in ts_files:
-        with open(file, 'r') as f:
-            content = f.read()
-            
-            # Count async functions
-            async_count += content.count('async ')
-            
-            # Count try-catch blocks
-            try_catch_count += content.count('try {')
-            
-            # Check for unhandled promises
-            if 'await ' in content and 'try' not in content:
-                issues.append(f"Potential unhandled promise in {file.name}")
-    
-    coverage = (try_catch_count / max(async_count, 1)) * 100
-    
-    report["error_handling"] = {
-        "status": "pass" if coverage >= 50 or async_count == 0 else "warning",
-        "async_functions": async_count,
-        "try_catch_blocks": try_catch_count,
-        "coverage": f"{coverage:.0f}%",
-        "issues": issues
-    }
-    
-    if coverage < 50 and async_count > 0:
-        print(f"⚠️  Low error handling coverage: {coverage:.0f}%")
-    else:
-        print("✅ Error handling checks passed")
+        for rule in rules:
+            report[rule.name] = {"status": "skipped", "reason": "No artifacts directory"}
+        return True, None
+    
+    print("🔍 Scanning artifacts...")
+    cache = load_qa_cache(init_dir.name)
+    results, stats = scan_artifacts(artifacts_dir, rules, cache)
+    save_qa_cache(init_dir.name, cache)
+    print(f"   {stats['recomputed']} new/changed, {stats['reused']} reused from cache\n")
+    
+    passed = True
+    for rule in rules:
+        print(f"🔍 Checking {rule.label}...")
+        if rule.name in stats["unavailable"]:
+            report[rule.name] = {"status": "skipped", "reason": stats["unavailable"][rule.name]}
+            print(f"⏭️  Skipped: {stats['unavailable'][rule.name]}\n")
+            continue
+        if not results[rule.name]:
+            report[rule.name] = {"status": "skipped", "reason": rule.empty_reason}
+            continue
+        report[rule.name] = rule.finish(results[rule.name])
+        passed = rule.announce(report[rule.name]) and passed
+        print()
     
-    return True
+    return passed, stats
 
 def check_documentation(init_dir, report):
     """Check for documentation"""
@@ -211,7 +561,7 @@ def check_documentation(init_dir, report):
     
     return status != "fail"
 
-def generate_qa_report(init_id, report):
+def generate_qa_report(init_id, report, scan_stats=None):
     """Generate QA report"""
     init_dir = INITIATIVES_DIR / init_id
     report_file = init_dir / "qa-report.md"
@@ -219,7 +569,12 @@ def generate_qa_report(init_id, report):
     with open(report_file, 'w') as f:
         f.write(f"# QA Report: {init_id}\n\n")
         f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"**Generated By**: QA Checklist Automation\n\n")
+        f.write(f"**Generated By**: QA Checklist Automation\n")
+        if scan_stats:
+            total = scan_stats["reused"] + scan_stats["recomputed"]
+            f.write(f"**Artifacts Checked**: {total} ({scan_stats['recomputed']} new or changed, "
+                    f"{scan_stats['reused']} reused from cache)\n")
+        f.write("\n")
         f.write("---\n\n")
         
         # Overall status
@@ -285,23 +640,15 @@ def run_qa(init_id):
     
     report = {}
     
-    # Run all checks
-    checks = [
-        ("code_quality", check_code_quality),
-        ("type_safety", check_type_safety),
-        ("error_handling", check_error_handling),
-        ("documentation", check_documentation),
-    ]
-    
-    all_passed = True
-    for check_name, check_func in checks:
-        success = check_func(init_dir, report)
-        if not success:
-            all_passed = False
-        print()
+    # Run all checks: per-file rules share one artifact scan
+    all_passed, scan_stats = run_file_checks(init_dir, report)
+    
+    if not check_documentation(init_dir, report):
+        all_passed = False
+    print()
     
     # Generate report
-    report_passed = generate_qa_report(init_id, report)
+    report_passed = generate_qa_report(init_id, report, scan_stats)
     
     if report_passed:
         print("\n✅ QA PASSED - Initiative is ready for completion")
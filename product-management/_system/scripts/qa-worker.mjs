@@ -0,0 +1,250 @@
+#!/usr/bin/env node
+/**
+ * QA Worker for TERP Product Management
+ *
+ * Keeps one ESLint instance and one TypeScript language service warm so
+ * qa-checklist.py can lint and type-check artifacts without paying the
+ * start-up and project-load cost on every run. Started on demand by
+ * qa-checklist.py, shared across runs, exits after --idle seconds without
+ * a request.
+ *
+ * Usage: node qa-worker.mjs --root <TERP root> --socket <path> [--idle <seconds>]
+ *
+ * Protocol: one JSON object per line in each direction.
+ *   {"method": "ping"}                    -> {"ok": true, "eslint": bool, "typescript": bool}
+ *   {"method": "check", "files": [abs]}   -> {"ok": true, "results": {abs: {"lint": [...], "types": [...]}}}
+ *   {"method": "shutdown"}                -> {"ok": true}
+ * "lint" / "types" are null when the file is ignored or not checkable.
+ */
+
+import crypto from 'node:crypto';
+import fs from 'node:fs';
+import net from 'node:net';
+import path from 'node:path';
+import { createRequire } from 'node:module';
+
+function parseArgs(argv) {
+  const args = { idle: 600 };
+  for (let i = 0; i < argv.length; i += 2) {
+    args[argv[i].replace(/^--/, '')] = argv[i + 1];
+  }
+  if (!args.root || !args.socket) {
+    console.error('Usage: qa-worker.mjs --root <TERP root> --socket <path> [--idle <seconds>]');
+    process.exit(1);
+  }
+  args.root = path.resolve(args.root);
+  args.idle = Number(args.idle);
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+// Resolve linters from the TERP project itself, not from this script's location
+const projectRequire = createRequire(path.join(args.root, 'package.json'));
+
+function optionalRequire(name) {
+  try {
+    return projectRequire(name);
+  } catch {
+    return null;
+  }
+}
+
+const eslintModule = optionalRequire('eslint');
+const ts = optionalRequire('typescript');
+if (!eslintModule && !ts) {
+  console.error(`Neither eslint nor typescript is installed under ${args.root}/node_modules`);
+  process.exit(2);
+}
+
+const eslint = eslintModule ? new eslintModule.ESLint({ cwd: args.root }) : null;
+
+// Artifacts are not part of the TERP build, so imports of project modules
+// that only exist once the artifact is merged are expected to fail.
+const IGNORED_TS_CODES = new Set([2307, 2792]);
+const TS_EXTENSIONS = new Set(['.ts', '.tsx']);
+
+// Files of the current check request: fileName -> {version, text}. They
+// are replaced on every request so artifacts of different initiatives (or
+// deleted ones) never share a program. Versions are content hashes, so the
+// document registry still reuses a parsed artifact that did not change.
+// Everything else the program pulls in (project sources, lib.d.ts,
+// node_modules types) is read from disk and versioned by mtime, and stays
+// parsed across requests.
+let openFiles = new Map();
+
+function diskVersion(fileName) {
+  try {
+    return String(fs.statSync(fileName).mtimeMs);
+  } catch {
+    return '0';
+  }
+}
+
+function createLanguageService() {
+  const configPath = ts.findConfigFile(args.root, ts.sys.fileExists, 'tsconfig.json');
+  let options = {};
+  if (configPath) {
+    const { config } = ts.readConfigFile(configPath, ts.sys.readFile);
+    options = ts.parseJsonConfigFileContent(config, ts.sys, path.dirname(configPath)).options;
+  }
+  options = { ...options, noEmit: true, incremental: false };
+  delete options.tsBuildInfoFile;
+
+  const host = {
+    getScriptFileNames: () => [...openFiles.keys()],
+    getScriptVersion: (fileName) =>
+      openFiles.has(fileName) ? String(openFiles.get(fileName).version) : diskVersion(fileName),
+    getScriptSnapshot: (fileName) => {
+      const text = openFiles.has(fileName) ? openFiles.get(fileName).text : ts.sys.readFile(fileName);
+      return text === undefined ? undefined : ts.ScriptSnapshot.fromString(text);
+    },
+    getCurrentDirectory: () => args.root,
+    getCompilationSettings: () => options,
+    getDefaultLibFileName: (opts) => ts.getDefaultLibFilePath(opts),
+    fileExists: ts.sys.fileExists,
+    readFile: ts.sys.readFile,
+    readDirectory: ts.sys.readDirectory,
+    directoryExists: ts.sys.directoryExists,
+    getDirectories: ts.sys.getDirectories,
+    realpath: ts.sys.realpath,
+  };
+  return ts.createLanguageService(host, ts.createDocumentRegistry());
+}
+
+const service = ts ? createLanguageService() : null;
+
+function contentVersion(text) {
+  return crypto.createHash('sha1').update(text).digest('hex');
+}
+
+async function lintFile(fileName, text) {
+  if (!eslint || (await eslint.isPathIgnored(fileName))) {
+    return null;
+  }
+  const [result] = await eslint.lintText(text, { filePath: fileName });
+  return result.messages.map((m) => ({
+    line: m.line ?? 0,
+    column: m.column ?? 0,
+    severity: m.severity === 2 ? 'error' : 'warning',
+    rule: m.ruleId,
+    message: m.message,
+  }));
+}
+
+function typeCheckFile(fileName) {
+  if (!service || !TS_EXTENSIONS.has(path.extname(fileName))) {
+    return null;
+  }
+  const diagnostics = [
+    ...service.getSyntacticDiagnostics(fileName),
+    ...service.getSemanticDiagnostics(fileName),
+  ];
+  return diagnostics
+    .filter((d) => !IGNORED_TS_CODES.has(d.code))
+    .map((d) => {
+      const { line, character } = d.file
+        ? d.file.getLineAndCharacterOfPosition(d.start ?? 0)
+        : { line: -1, character: -1 };
+      return {
+        line: line + 1,
+        column: character + 1,
+        severity: d.category === ts.DiagnosticCategory.Error ? 'error' : 'warning',
+        code: d.code,
+        message: ts.flattenDiagnosticMessageText(d.messageText, '\n'),
+      };
+    });
+}
+
+async function check(files) {
+  const texts = new Map();
+  openFiles = new Map();
+  for (const fileName of files) {
+    const text = fs.readFileSync(fileName, 'utf8');
+    texts.set(fileName, text);
+    if (service && TS_EXTENSIONS.has(path.extname(fileName))) {
+      openFiles.set(fileName, { version: contentVersion(text), text });
+    }
+  }
+  const results = {};
+  for (const [fileName, text] of texts) {
+    results[fileName] = { lint: await lintFile(fileName, text), types: typeCheckFile(fileName) };
+  }
+  return results;
+}
+
+let idleTimer = null;
+const server = net.createServer();
+
+function shutdown() {
+  server.close();
+  try {
+    fs.unlinkSync(args.socket);
+  } catch {
+    // already gone
+  }
+  process.exit(0);
+}
+
+function touch() {
+  clearTimeout(idleTimer);
+  idleTimer = setTimeout(shutdown, args.idle * 1000);
+}
+
+// Requests are handled one at a time across all connections: the language
+// service is synchronous and ESLint's shared state is not worth racing on.
+let queue = Promise.resolve();
+
+async function handle(request) {
+  touch();
+  switch (request.method) {
+    case 'ping':
+      return { ok: true, eslint: Boolean(eslint), typescript: Boolean(service) };
+    case 'check':
+      return { ok: true, results: await check(request.files || []) };
+    case 'shutdown':
+      setImmediate(shutdown);
+      return { ok: true };
+    default:
+      return { ok: false, error: `Unknown method: ${request.method}` };
+  }
+}
+
+server.on('connection', (conn) => {
+  let buffer = '';
+  conn.setEncoding('utf8');
+  conn.on('data', (chunk) => {
+    buffer += chunk;
+    let newline;
+    while ((newline = buffer.indexOf('\n')) !== -1) {
+      const line = buffer.slice(0, newline);
+      buffer = buffer.slice(newline + 1);
+      if (!line.trim()) continue;
+      queue = queue.then(async () => {
+        let response;
+        try {
+          response = await handle(JSON.parse(line));
+        } catch (error) {
+          response = { ok: false, error: String(error && error.message ? error.message : error) };
+        }
+        if (!conn.destroyed) conn.write(JSON.stringify(response) + '\n');
+      });
+    }
+  });
+  conn.on('error', () => {});
+});
+
+// A socket file left behind by a crashed worker would make listen() fail;
+// qa-checklist.py only starts a worker after failing to connect to it.
+try {
+  fs.unlinkSync(args.socket);
+} catch {
+  // nothing to clean up
+}
+fs.mkdirSync(path.dirname(args.socket), { recursive: true });
+server.listen(args.socket, () => {
+  touch();
+  console.log(`qa-worker listening on ${args.socket} (eslint: ${Boolean(eslint)}, typescript: ${Boolean(service)})`);
+});
+process.on('SIGTERM', shutdown);
+process.on('SIGINT', shutdown);
@@ -2,17 +2,262 @@
 """
 Search System for Product Management Platform
 Enables fast search across all features, ideas, bugs, and documents
+
+Query language:
+    credit engine               both terms, in any field
+    "credit engine"             exact phrase
+    title:"credit engine"       phrase in the title only
+    tag:accounting              exact tag (also type:, status:)
+    -status:rejected            exclude matches
+    ledger OR journal           either term
+    export*                     prefix match
 """
 
+import atexit
+import heapq
 import json
+import os
 import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable
 from datetime import datetime
 
 PM_ROOT = Path("/home/ubuntu/TERP/product-management")
 REGISTRY_FILE = PM_ROOT / "_system/id-registry.json"
 SEARCH_INDEX_FILE = PM_ROOT / "_system/cache/search-index.json"
+SEARCH_META_FILE = PM_ROOT / "_system/cache/search-index.meta.json"
+SEARCH_RESULTS_FILE = PM_ROOT / "_system/cache/search-results.json"
+
+INDEX_SCHEMA_VERSION = "3.0"
+
+# Number of distinct queries kept in the result cache
+RESULT_CACHE_SIZE = 128
+
+# Cache hits and misses between two writes of the result cache file
+RESULT_CACHE_SAVE_EVERY = 16
+
+# Fields that get a bitmap per distinct value
+FACET_FIELDS = ["type", "status", "tags"]
+
+# Fields with positional postings, and the score a term earns by matching each
+TEXT_FIELD_WEIGHTS = {
+    "id": 100,
+    "title": 50,
+    "tags": 25,
+    "content": 10
+}
+
+# Query field names that map onto an indexed field
+FIELD_ALIASES = {
+    "tag": "tags",
+    "name": "title",
+    "body": "content",
+    "text": "content"
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+QUERY_TERM_RE = re.compile(r'(?:([A-Za-z_]+):)?(?:"([^"]*)"?|([^\s()"]+))')
+
+# Roaring containers with more members than this are stored as a bitset
+ARRAY_CONTAINER_MAX = 4096
+
+
+def _popcount(value: int) -> int:
+    """Count set bits (int.bit_count is 3.10+)"""
+    return bin(value).count("1")
+
+
+class Bitmap:
+    """
+    Roaring-style compressed bitmap of document numbers
+
+    Documents are split into 65536-wide chunks keyed by their high 16 bits.
+    Each chunk is held as an int bitset in memory; on disk sparse chunks are
+    written as sorted arrays and dense chunks as hex bitsets.
+    """
+
+    __slots__ = ("containers",)
+
+    def __init__(self, containers: Optional[Dict[int, int]] = None):
+        self.containers = containers or {}
+
+    @classmethod
+    def from_iterable(cls, docs: Iterable[int]) -> "Bitmap":
+        containers = {}
+        for doc in docs:
+            high, low = doc >> 16, doc & 0xFFFF
+            containers[high] = containers.get(high, 0) | (1 << low)
+        return cls(containers)
+
+    @classmethod
+    def full(cls, size: int) -> "Bitmap":
+        """Bitmap with documents 0..size-1 set"""
+        containers = {}
+        for high in range((size + 0xFFFF) >> 16):
+            width = min(size - (high << 16), 0x10000)
+            containers[high] = (1 << width) - 1
+        return cls(containers)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for high, bits in self.containers.items():
+            merged = bits & other.containers.get(high, 0)
+            if merged:
+                containers[high] = merged
+        return Bitmap(containers)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        containers = dict(self.containers)
+        for high, bits in other.containers.items():
+            containers[high] = containers.get(high, 0) | bits
+        return Bitmap(containers)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for high, bits in self.containers.items():
+            remaining = bits & ~other.containers.get(high, 0)
+            if remaining:
+                containers[high] = remaining
+        return Bitmap(containers)
+
+    def __len__(self) -> int:
+        return sum(_popcount(bits) for bits in self.containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.containers)
+
+    def __contains__(self, doc: int) -> bool:
+        return bool(self.containers.get(doc >> 16, 0) >> (doc & 0xFFFF) & 1)
+
+    def __iter__(self):
+        for high in sorted(self.containers):
+            bits = self.containers[high]
+            base = high << 16
+            while bits:
+                lowest = bits & -bits
+                yield base + lowest.bit_length() - 1
+                bits ^= lowest
+
+    def to_json(self) -> Dict:
+        """Serialize as {high: [lows...]} or {high: "hex"} per container"""
+        out = {}
+        for high, bits in self.containers.items():
+            if _popcount(bits) <= ARRAY_CONTAINER_MAX:
+                lows = []
+                while bits:
+                    lowest = bits & -bits
+                    lows.append(lowest.bit_length() - 1)
+                    bits ^= lowest
+                out[str(high)] = lows
+            else:
+                out[str(high)] = format(bits, "x")
+        return out
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Bitmap":
+        containers = {}
+        for high, container in data.items():
+            if isinstance(container, str):
+                bits = int(container, 16)
+            else:
+                bits = 0
+                for low in container:
+                    bits |= 1 << low
+            containers[int(high)] = bits
+        return cls(containers)
+
+
+class SearchResults(list):
+    """List of result items plus facet counts over the whole matching set"""
+
+    def __init__(self, items=(), facets: Optional[Dict] = None, total: int = 0, cached: bool = False):
+        super().__init__(items)
+        self.facets = facets or {}
+        self.total = total
+        self.cached = cached
+
+
+class ResultCache:
+    """
+    Small LRU of search results, persisted so separate agent processes share it
+
+    Keys include the index generation, so entries from an older index are
+    never returned and simply age out. Hits and misses are written back in
+    batches (every RESULT_CACHE_SAVE_EVERY lookups and at process exit), and
+    each write is merged into the file as it is on disk, so recency recorded
+    by other processes in the meantime is kept.
+    """
+
+    def __init__(self, path: Path, size: int = RESULT_CACHE_SIZE):
+        self.path = path
+        self.size = size
+        self.entries = self._read()
+        # Keys used since the last save, least recent first
+        self.touched = OrderedDict()
+        atexit.register(self.save)
+
+    def _read(self) -> OrderedDict:
+        entries = OrderedDict()
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    entries.update(json.load(f).get("entries", []))
+            except (OSError, ValueError):
+                pass
+        return entries
+
+    def _touch(self, key: str):
+        self.touched[key] = None
+        self.touched.move_to_end(key)
+        if len(self.touched) >= RESULT_CACHE_SAVE_EVERY:
+            self.save()
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self._touch(key)
+        return entry
+
+    def put(self, key: str, entry: Dict):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        self._touch(key)
+
+    def save(self):
+        if not self.touched:
+            return
+        entries = self._read()
+        for key in self.touched:
+            if key in self.entries:
+                entries[key] = self.entries[key]
+                entries.move_to_end(key)
+        while len(entries) > self.size:
+            entries.popitem(last=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"entries": list(entries.items())}, f)
+        os.replace(tmp_path, self.path)
+        self.entries = entries
+        self.touched.clear()
+
+
+def result_cache() -> ResultCache:
+    """Result cache of this process, loaded on first use"""
+    if _result_cache["cache"] is None:
+        _result_cache["cache"] = ResultCache(SEARCH_RESULTS_FILE)
+    return _result_cache["cache"]
+
+
+# Index loaded by this process, reused while its generation is current
+_loaded_index = {"generation": None, "index": None, "facets": None}
+
+# Result cache of this process, see result_cache()
+_result_cache = {"cache": None}
 
 
 def load_registry() -> Dict:
@@ -23,17 +268,62 @@ def load_registry() -> Dict:
     return {"registry": {}}
 
 
+def build_facet_bitmaps(items: Dict, doc_ids: List[str]) -> Dict:
+    """Build one bitmap per facet value, e.g. facets["status"]["in-progress"]"""
+    members = {field: {} for field in FACET_FIELDS}
+    for doc, item_id in enumerate(doc_ids):
+        item = items[item_id]
+        for field in FACET_FIELDS:
+            values = item.get(field)
+            if not isinstance(values, list):
+                values = [values]
+            for value in values:
+                if value is None:
+                    continue
+                members[field].setdefault(value, []).append(doc)
+
+    return {
+        field: {value: Bitmap.from_iterable(docs) for value, docs in values.items()}
+        for field, values in members.items()
+    }
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric terms"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def build_postings(doc_fields: List[Dict[str, str]]) -> Dict:
+    """
+    Build positional postings: postings[field][term] = [[doc, [positions]], ...]
+
+    Posting lists are ordered by document number.
+    """
+    postings = {field: {} for field in TEXT_FIELD_WEIGHTS}
+    for doc, fields in enumerate(doc_fields):
+        for field, text in fields.items():
+            positions = {}
+            for position, term in enumerate(tokenize(text)):
+                positions.setdefault(term, []).append(position)
+            for term, term_positions in positions.items():
+                postings[field].setdefault(term, []).append([doc, term_positions])
+    return postings
+
+
 def build_search_index():
     """Build search index from all content"""
     print("🔍 Building search index...")
     
     index = {
+        "schema_version": INDEX_SCHEMA_VERSION,
+        "generation": (load_index_meta() or {}).get("generation", 0) + 1,
         "built": datetime.now().isoformat(),
         "total_items": 0,
         "items": {}
     }
     
     registry = load_registry()
+    contents = {}
     
     # Index all items from registry
     for item_id, item_data in registry.get("registry", {}).items():
@@ -47,10 +337,7 @@ def build_search_index():
                         content = f.read()
                 except:
                     pass
-        
-        # Build searchable text
-        searchable = f"{item_id} {item_data.get('title', '')} {content}"
-        searchable += " " + " ".join(item_data.get('tags', []))
+        contents[item_id] = content
         
         index["items"][item_id] = {
             "id": item_id,
@@ -59,28 +346,502 @@ def build_search_index():
             "status": item_data.get("status"),
             "tags": item_data.get("tags", []),
             "path": item_data.get("path"),
-            "searchable": searchable.lower(),
             "created": item_data.get("created"),
             "updated": item_data.get("updated")
         }
     
     index["total_items"] = len(index["items"])
     
-    # Save index
+    # Dense document numbers so facets can be stored as bitmaps
+    index["doc_ids"] = sorted(index["items"])
+    facets = build_facet_bitmaps(index["items"], index["doc_ids"])
+    index["facets"] = {
+        field: {value: bitmap.to_json() for value, bitmap in values.items()}
+        for field, values in facets.items()
+    }
+    index["facet_counts"] = {
+        field: {value: len(bitmap) for value, bitmap in values.items()}
+        for field, values in facets.items()
+    }
+    
+    # Positional postings for the query language
+    index["postings"] = build_postings([
+        {
+            "id": item_id,
+            "title": index["items"][item_id]["title"] or "",
+            "tags": " ".join(index["items"][item_id]["tags"]),
+            "content": contents[item_id]
+        }
+        for item_id in index["doc_ids"]
+    ])
+    
+    # Save index, then publish its generation
     SEARCH_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SEARCH_INDEX_FILE, 'w') as f:
-        json.dump(index, f, indent=2)
+    tmp_file = SEARCH_INDEX_FILE.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_file, SEARCH_INDEX_FILE)
+    
+    with open(SEARCH_META_FILE, 'w') as f:
+        json.dump({
+            "schema_version": INDEX_SCHEMA_VERSION,
+            "generation": index["generation"],
+            "built": index["built"]
+        }, f)
     
-    print(f"✅ Indexed {index['total_items']} items")
+    print(f"✅ Indexed {index['total_items']} items (generation {index['generation']})")
     return index
 
 
+def load_index_meta() -> Optional[Dict]:
+    """Load the small metadata file that records the index generation"""
+    if SEARCH_META_FILE.exists():
+        try:
+            with open(SEARCH_META_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    return None
+
+
+def current_generation() -> int:
+    """Generation of the current index, building it if needed"""
+    meta = load_index_meta()
+    if meta and meta.get("schema_version") == INDEX_SCHEMA_VERSION and SEARCH_INDEX_FILE.exists():
+        return meta["generation"]
+    return load_search_index()["generation"]
+
+
 def load_search_index() -> Dict:
-    """Load search index"""
+    """Load search index, rebuilding it if it predates the current schema"""
+    meta = load_index_meta()
+    if meta and meta.get("generation") == _loaded_index["generation"]:
+        return _loaded_index["index"]
+    
+    index = None
     if SEARCH_INDEX_FILE.exists():
         with open(SEARCH_INDEX_FILE) as f:
-            return json.load(f)
-    return build_search_index()
+            index = json.load(f)
+        if index.get("schema_version") != INDEX_SCHEMA_VERSION or "generation" not in index:
+            index = None
+    if index is None:
+        index = build_search_index()
+    
+    _loaded_index.update(generation=index["generation"], index=index, facets=None)
+    return index
+
+
+def load_facets(index: Dict) -> Dict:
+    """Deserialize the facet bitmaps of a loaded index"""
+    if index is _loaded_index["index"] and _loaded_index["facets"] is not None:
+        return _loaded_index["facets"]
+    
+    facets = {
+        field: {value: Bitmap.from_json(data) for value, data in values.items()}
+        for field, values in index.get("facets", {}).items()
+    }
+    if index is _loaded_index["index"]:
+        _loaded_index["facets"] = facets
+    return facets
+
+
+def filter_bitmap(
+    index: Dict,
+    facets: Dict,
+    item_type: Optional[str] = None,
+    status: Optional[str] = None,
+    tags: Optional[List[str]] = None
+) -> Bitmap:
+    """
+    Resolve facet filters to the bitmap of candidate documents
+
+    Filters on different fields are intersected; multiple tags match any tag.
+    """
+    candidates = Bitmap.full(len(index["doc_ids"]))
+    empty = Bitmap()
+    
+    if item_type:
+        candidates = candidates & facets.get("type", {}).get(item_type, empty)
+    if status:
+        candidates = candidates & facets.get("status", {}).get(status, empty)
+    if tags:
+        tagged = Bitmap()
+        for tag in tags:
+            tagged = tagged | facets.get("tags", {}).get(tag, empty)
+        candidates = candidates & tagged
+    
+    return candidates
+
+
+def facet_counts(facets: Dict, matched: Bitmap) -> Dict:
+    """Count matching documents per facet value"""
+    counts = {}
+    for field, values in facets.items():
+        field_counts = {}
+        for value, bitmap in values.items():
+            count = len(bitmap & matched)
+            if count:
+                field_counts[value] = count
+        counts[field] = field_counts
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Query language
+# ---------------------------------------------------------------------------
+
+def lex_query(query: str) -> List[tuple]:
+    """Split a query string into (kind, ...) tokens"""
+    tokens = []
+    i = 0
+    while i < len(query):
+        char = query[i]
+        if char.isspace():
+            i += 1
+        elif char in "()":
+            tokens.append(("LPAREN",) if char == "(" else ("RPAREN",))
+            i += 1
+        elif char == "-" and i + 1 < len(query) and not query[i + 1].isspace():
+            tokens.append(("NOT",))
+            i += 1
+        else:
+            match = QUERY_TERM_RE.match(query, i)
+            if not match or match.end() == i:
+                raise ValueError(f"Unexpected character {char!r} at position {i}")
+            field, phrase, word = match.groups()
+            if word == "OR" and field is None:
+                tokens.append(("OR",))
+            else:
+                tokens.append(("TERM", field, phrase if phrase is not None else word, phrase is not None))
+            i = match.end()
+    return tokens
+
+
+def make_term(field: Optional[str], text: str, is_phrase: bool) -> Dict:
+    """Build a term node, resolving the field name"""
+    if field is not None:
+        field = field.lower()
+        field = FIELD_ALIASES.get(field, field)
+        if field not in TEXT_FIELD_WEIGHTS and field not in FACET_FIELDS:
+            raise ValueError(f"Unknown field '{field}'")
+    
+    prefix = not is_phrase and text.endswith("*")
+    if prefix:
+        text = text.rstrip("*")
+    
+    return {
+        "op": "term",
+        "field": field,
+        "text": text,
+        "tokens": tokenize(text),
+        "prefix": prefix
+    }
+
+
+def parse_query(query: str) -> Optional[Dict]:
+    """
+    Parse a query string into an expression tree
+
+    Grammar:
+        or_expr  := and_expr ("OR" and_expr)*
+        and_expr := unary+
+        unary    := "-" unary | "(" or_expr ")" | [field ":"] (word | "phrase")
+
+    Returns None for an empty query.
+    """
+    tokens = lex_query(query)
+    pos = 0
+    
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+    
+    def parse_or():
+        nonlocal pos
+        children = [parse_and()]
+        while peek() == ("OR",):
+            pos += 1
+            children.append(parse_and())
+        return children[0] if len(children) == 1 else {"op": "or", "children": children}
+    
+    def parse_and():
+        children = []
+        while peek() is not None and peek()[0] not in ("OR", "RPAREN"):
+            children.append(parse_unary())
+        if not children:
+            raise ValueError("Expected a search term")
+        return children[0] if len(children) == 1 else {"op": "and", "children": children}
+    
+    def parse_unary():
+        nonlocal pos
+        token = peek()
+        pos += 1
+        if token[0] == "NOT":
+            if peek() is None:
+                raise ValueError("Expected a term after '-'")
+            return {"op": "not", "child": parse_unary()}
+        if token[0] == "LPAREN":
+            node = parse_or()
+            if peek() != ("RPAREN",):
+                raise ValueError("Unbalanced parentheses")
+            pos += 1
+            return node
+        if token[0] == "TERM":
+            return make_term(*token[1:])
+        raise ValueError("Unbalanced parentheses")
+    
+    if not tokens:
+        return None
+    
+    tree = parse_or()
+    if pos != len(tokens):
+        raise ValueError("Unbalanced parentheses")
+    return tree
+
+
+class QueryContext:
+    """Index data shared by every node while one query executes"""
+    
+    def __init__(self, index: Dict, facets: Dict, universe: Bitmap):
+        self.index = index
+        self.facets = facets
+        self.universe = universe
+        self.postings = index.get("postings", {})
+        self._lists = {}
+        # Facet values match case-insensitively; values differing only in
+        # case ("Inventory", "inventory") share one merged bitmap
+        self._facet_lookup = {}
+        for field, values in facets.items():
+            lookup = self._facet_lookup[field] = {}
+            for value, bitmap in values.items():
+                key = str(value).lower()
+                lookup[key] = lookup[key] | bitmap if key in lookup else bitmap
+    
+    def postings_for(self, field: str, term: str) -> Dict[int, List[int]]:
+        """Posting list of a term as {doc: positions}, decoded on first use"""
+        key = (field, term)
+        if key not in self._lists:
+            self._lists[key] = dict(self.postings.get(field, {}).get(term, []))
+        return self._lists[key]
+    
+    def expand(self, field: str, token: str, prefix: bool) -> List[str]:
+        """Terms of a field that a query token stands for"""
+        if not prefix:
+            return [token]
+        return [term for term in self.postings.get(field, {}) if term.startswith(token)]
+    
+    def facet(self, field: str, value: str) -> Bitmap:
+        return self._facet_lookup.get(field, {}).get(value.lower(), Bitmap())
+
+
+def term_fields(node: Dict) -> List[str]:
+    """Fields a term node searches"""
+    if node["field"] is None:
+        return list(TEXT_FIELD_WEIGHTS)
+    return [node["field"]]
+
+
+def estimate(node: Dict, ctx: QueryContext) -> int:
+    """Upper bound on the number of documents a node can match"""
+    op = node["op"]
+    if op == "term":
+        if node["field"] in FACET_FIELDS and node["field"] not in TEXT_FIELD_WEIGHTS:
+            return len(ctx.facet(node["field"], node["text"]))
+        if node["field"] == "tags" and not node["prefix"]:
+            return len(ctx.facet("tags", node["text"]))
+        total = 0
+        for field in term_fields(node):
+            counts = [
+                sum(len(ctx.postings.get(field, {}).get(term, [])) for term in ctx.expand(field, token, node["prefix"]))
+                for token in node["tokens"]
+            ]
+            total += min(counts) if counts else 0
+        return total
+    if op == "and":
+        positives = [estimate(c, ctx) for c in node["children"] if c["op"] != "not"]
+        return min(positives) if positives else len(ctx.universe)
+    if op == "or":
+        return sum(estimate(c, ctx) for c in node["children"])
+    return len(ctx.universe)
+
+
+def match_field(node: Dict, field: str, ctx: QueryContext, candidates: Bitmap) -> Bitmap:
+    """Documents within candidates where a term or phrase occurs in one field"""
+    tokens = node["tokens"]
+    if not tokens:
+        return Bitmap()
+    
+    # Merge postings of every term each token expands to
+    lists = []
+    for i, token in enumerate(tokens):
+        prefix = node["prefix"] and i == len(tokens) - 1
+        merged = {}
+        for term in ctx.expand(field, token, prefix):
+            postings = ctx.postings_for(field, term)
+            if len(postings) > len(candidates):
+                pairs = ((doc, postings[doc]) for doc in candidates if doc in postings)
+            else:
+                pairs = ((doc, positions) for doc, positions in postings.items() if doc in candidates)
+            for doc, positions in pairs:
+                merged.setdefault(doc, []).extend(positions)
+        if not merged:
+            return Bitmap()
+        lists.append(merged)
+    
+    # Intersect documents starting from the rarest token
+    docs = set(min(lists, key=len))
+    for merged in lists:
+        docs &= merged.keys()
+        if not docs:
+            return Bitmap()
+    
+    if len(lists) == 1:
+        return Bitmap.from_iterable(docs)
+    
+    # Phrase: token i must sit at position start + i
+    matches = []
+    for doc in docs:
+        starts = set(lists[0][doc])
+        for offset, merged in enumerate(lists[1:], 1):
+            starts &= {position - offset for position in merged[doc]}
+            if not starts:
+                break
+        if starts:
+            matches.append(doc)
+    return Bitmap.from_iterable(matches)
+
+
+def match_term_field(node: Dict, field: str, ctx: QueryContext, candidates: Bitmap) -> Bitmap:
+    """Documents within candidates where a term node matches one field"""
+    if field in ("type", "status"):
+        return ctx.facet(field, node["text"]) & candidates
+    if node["field"] == "tags" and not node["prefix"]:
+        # tag:x is an exact facet lookup, falling back to tag text for phrases
+        exact = ctx.facet("tags", node["text"]) & candidates
+        if exact or len(node["tokens"]) < 2:
+            return exact
+    return match_field(node, field, ctx, candidates)
+
+
+def match_term(node: Dict, ctx: QueryContext, candidates: Bitmap) -> Bitmap:
+    """Documents within candidates where a term node matches any of its fields"""
+    result = Bitmap()
+    for field in term_fields(node):
+        result = result | match_term_field(node, field, ctx, candidates - result)
+    return result
+
+
+def evaluate(node: Dict, ctx: QueryContext, candidates: Bitmap) -> Bitmap:
+    """
+    Documents within candidates that satisfy a node
+
+    AND clauses run most selective first, each one only inspecting documents
+    that survived the previous clauses.
+    """
+    op = node["op"]
+    if op == "term":
+        return match_term(node, ctx, candidates)
+    
+    if op == "not":
+        return candidates - evaluate(node["child"], ctx, candidates)
+    
+    if op == "or":
+        result = Bitmap()
+        for child in node["children"]:
+            result = result | evaluate(child, ctx, candidates - result)
+        return result
+    
+    positives = [c for c in node["children"] if c["op"] != "not"]
+    negatives = [c for c in node["children"] if c["op"] == "not"]
+    positives.sort(key=lambda c: estimate(c, ctx))
+    
+    result = candidates
+    for child in positives:
+        result = evaluate(child, ctx, result)
+        if not result:
+            return result
+    for child in negatives:
+        result = result - evaluate(child["child"], ctx, result)
+    return result
+
+
+def scoring_terms(node: Dict, negated: bool = False) -> List[Dict]:
+    """Term nodes that contribute to relevance (not under a negation)"""
+    if node["op"] == "term":
+        return [] if negated else [node]
+    if node["op"] == "not":
+        return scoring_terms(node["child"], not negated)
+    terms = []
+    for child in node["children"]:
+        terms.extend(scoring_terms(child, negated))
+    return terms
+
+
+def top_k(tree: Dict, ctx: QueryContext, matched: Bitmap, k: int) -> List[tuple]:
+    """
+    Best k (doc, score) pairs among matched documents
+
+    Every positive (term, field) pair is a scoring list worth its field weight.
+    Lists are applied heaviest first; once the documents outside the current
+    top k cannot reach the k-th score even with every remaining list, only the
+    leaders are finished off and the rest of the postings are never read.
+    """
+    if k <= 0:
+        return []
+    
+    lists = [
+        (TEXT_FIELD_WEIGHTS[field], term, field)
+        for term in scoring_terms(tree)
+        for field in term_fields(term)
+        if TEXT_FIELD_WEIGHTS.get(field)
+    ]
+    lists.sort(key=lambda entry: -entry[0])
+    
+    def rank(item):
+        return (-item[1], item[0])
+    
+    scores = dict.fromkeys(matched, 0)
+    remaining = sum(weight for weight, _, _ in lists)
+    
+    for i, (weight, term, field) in enumerate(lists):
+        for doc in match_term_field(term, field, ctx, matched):
+            scores[doc] += weight
+        remaining -= weight
+        
+        if not remaining or len(scores) <= k:
+            continue
+        
+        leaders = heapq.nsmallest(k, scores.items(), key=rank)
+        threshold = leaders[-1][1]
+        leader_docs = {doc for doc, _ in leaders}
+        best_other = max(score for doc, score in scores.items() if doc not in leader_docs)
+        
+        if best_other + remaining < threshold:
+            scores = dict(leaders)
+            leader_bitmap = Bitmap.from_iterable(leader_docs)
+            for later_weight, later_term, later_field in lists[i + 1:]:
+                for doc in match_term_field(later_term, later_field, ctx, leader_bitmap):
+                    scores[doc] += later_weight
+            break
+    
+    return heapq.nsmallest(k, scores.items(), key=rank)
+
+
+def canonical_query(node: Optional[Dict]) -> str:
+    """Normalized query text, identical for equivalent spellings of a query"""
+    if node is None:
+        return ""
+    op = node["op"]
+    if op == "term":
+        exact = node["field"] in ("type", "status") or (node["field"] == "tags" and not node["prefix"])
+        if exact:
+            text = node["text"].lower()
+        else:
+            text = " ".join(node["tokens"])
+        return f'{node["field"] or ""}:{json.dumps(text)}{"*" if node["prefix"] else ""}'
+    if op == "not":
+        return "-" + canonical_query(node["child"])
+    joiner = " OR " if op == "or" else " "
+    return "(" + joiner.join(sorted(canonical_query(c) for c in node["children"])) + ")"
 
 
 def search(
@@ -89,63 +850,69 @@ def search(
     status: Optional[str] = None,
     tags: Optional[List[str]] = None,
     limit: int = 20
-) -> List[Dict]:
+) -> SearchResults:
     """
     Search for items
     
     Args:
-        query: Search query string
+        query: Query string (see module docstring; empty lists everything matching the filters)
         item_type: Filter by type (IDEA, FEAT, BUG, etc.)
         status: Filter by status
         tags: Filter by tags
         limit: Maximum results to return
     
     Returns:
-        List of matching items
+        List of matching items; its ``facets`` attribute holds per-value
+        counts over every match, not just the returned page
+    
+    Raises:
+        ValueError: If the query cannot be parsed
     """
+    tree = parse_query(query)
+    
+    # Identical queries are answered from the cache until the index changes
+    cache = result_cache()
+    cache_key = json.dumps([
+        current_generation(),
+        canonical_query(tree),
+        item_type,
+        status,
+        sorted(tags) if tags else None,
+        limit
+    ])
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return SearchResults(cached["items"], cached["facets"], cached["total"], cached=True)
+    
     index = load_search_index()
-    query_lower = query.lower()
-    results = []
+    facets = load_facets(index)
+    doc_ids = index["doc_ids"]
     
-    for item_id, item in index["items"].items():
-        # Apply filters
-        if item_type and item["type"] != item_type:
-            continue
-        if status and item["status"] != status:
-            continue
-        if tags and not any(tag in item["tags"] for tag in tags):
-            continue
-        
-        # Search in searchable text
-        if query_lower in item["searchable"]:
-            # Calculate relevance score
-            score = 0
-            
-            # Exact ID match
-            if query.upper() == item_id:
-                score += 100
-            
-            # Title match
-            if query_lower in item["title"].lower():
-                score += 50
-            
-            # Tag match
-            if any(query_lower in tag.lower() for tag in item["tags"]):
-                score += 25
-            
-            # Content match
-            if query_lower in item["searchable"]:
-                score += 10
-            
-            results.append({
-                **item,
-                "score": score
-            })
-    
-    # Sort by score
-    results.sort(key=lambda x: x["score"], reverse=True)
-    
-    return results[:limit]
+    # Filters are a bitmap intersection, applied before any scoring
+    candidates = filter_bitmap(index, facets, item_type, status, tags)
+    
+    if tree is None:
+        # Without a query the filtered bitmap is the whole answer
+        matched = candidates
+        ranked = []
+        for doc in matched:
+            if len(ranked) >= limit:
+                break
+            ranked.append((doc, 0))
+        if item_type or status or tags:
+            counts = facet_counts(facets, matched)
+        else:
+            counts = index["facet_counts"]
+    else:
+        ctx = QueryContext(index, facets, candidates)
+        matched = evaluate(tree, ctx, candidates)
+        ranked = top_k(tree, ctx, matched, limit)
+        counts = facet_counts(facets, matched)
+    
+    results = [{**index["items"][doc_ids[doc]], "score": score} for doc, score in ranked]
+    cache.put(cache_key, {"items": results, "facets": counts, "total": len(matched)})
+    
+    return SearchResults(results, counts, len(matched))
 
 
 def search_by_id(item_id: str) -> Optional[Dict]:
@@ -154,39 +921,41 @@ def search_by_id(item_id: str) -> Optional[Dict]:
     return index["items"].get(item_id)
 
 
-def search_by_tags(tags: List[str], limit: int = 20) -> List[Dict]:
+def search_by_tags(tags: List[str], limit: int = 20) -> SearchResults:
     """Search for items with specific tags"""
     return search("", tags=tags, limit=limit)
 
 
-def search_by_status(status: str, limit: int = 50) -> List[Dict]:
+def search_by_status(status: str, limit: int = 50) -> SearchResults:
     """Get all items with specific status"""
     return search("", status=status, limit=limit)
 
 
 if __name__ == "__main__":
+    import argparse
     import sys
     
-    if len(sys.argv) < 2:
-        print("Usage: search.py <query> [--type TYPE] [--status STATUS] [--tags TAG1,TAG2]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Search product management items")
+    parser.add_argument("query", nargs="?", default="", help='Query, e.g. title:"credit engine" tag:accounting -status:rejected')
+    parser.add_argument("--type", dest="item_type", help="Filter by type (IDEA, FEAT, BUG, ...)")
+    parser.add_argument("--status", help="Filter by status")
+    parser.add_argument("--tags", help="Filter by tags (comma-separated, matches any)")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results to return")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the search index first")
+    args = parser.parse_args()
     
-    query = sys.argv[1]
-    item_type = None
-    status = None
-    tags = None
+    if args.rebuild:
+        build_search_index()
     
-    # Parse arguments
-    for i, arg in enumerate(sys.argv[2:]):
-        if arg == "--type" and i + 3 < len(sys.argv):
-            item_type = sys.argv[i + 3]
-        elif arg == "--status" and i + 3 < len(sys.argv):
-            status = sys.argv[i + 3]
-        elif arg == "--tags" and i + 3 < len(sys.argv):
-            tags = sys.argv[i + 3].split(',')
+    query = args.query
+    tags = args.tags.split(',') if args.tags else None
     
     # Perform search
-    results = search(query, item_type=item_type, status=status, tags=tags)
+    try:
+        results = search(query, item_type=args.item_type, status=args.status, tags=tags, limit=args.limit)
+    except ValueError as e:
+        print(f"❌ Invalid query: {e}")
+        sys.exit(1)
     
     if not results:
         print(f"No results found for '{query}'")
@@ -197,3 +966,9 @@ if __name__ == "__main__":
             print(f"  Status: {result['status']} | Tags: {', '.join(result['tags'])}")
             print(f"  Score: {result['score']}")
             print()
+        
+        print(f"Showing {len(results)} of {results.total} matches{' (cached)' if results.cached else ''}")
+        for field, counts in results.facets.items():
+            if counts:
+                summary = ", ".join(f"{value} ({count})" for value, count in sorted(counts.items()))
+                print(f"  {field}: {summary}")
@@ -11,13 +11,30 @@ Usage:
     python3 system-context.py summary
 """
 
+import hashlib
 import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 import subprocess
 
+# Cross-platform file locking
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    # Windows doesn't have fcntl, use msvcrt instead
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 PM_ROOT = SCRIPT_DIR.parent.parent
@@ -26,6 +43,12 @@ CLIENT_DIR = TERP_ROOT / "client"
 SERVER_DIR = TERP_ROOT / "server"
 DOCS_DIR = TERP_ROOT / "docs"
 CONTEXT_DIR = PM_ROOT / "_system" / "context"
+CLIENT_ROUTER_FILE = CLIENT_DIR / "src" / "App.tsx"
+
+# Shared per-file analysis (analyze-codebase.py)
+ANALYZER = SCRIPT_DIR / "analyze-codebase.py"
+SNAPSHOT_JSON = PM_ROOT / "codebase" / "snapshot.json"
+SNAPSHOT_META_JSON = PM_ROOT / "codebase" / "snapshot.meta.json"
 
 # Context files
 PROJECT_CONTEXT = DOCS_DIR / "PROJECT_CONTEXT.md"
@@ -36,66 +59,179 @@ KNOWN_ISSUES = DOCS_DIR / "notes" / "known-issues.md"
 # Output files
 SYSTEM_STATE_JSON = CONTEXT_DIR / "system-state.json"
 SYSTEM_SUMMARY_MD = CONTEXT_DIR / "system-summary.md"
-
-
-def scan_routes(client_dir):
-    """Scan Next.js app directory for routes"""
+API_MAP_JSON = CONTEXT_DIR / "api-map.json"
+SCAN_CACHE_JSON = CONTEXT_DIR / "scan-cache.json"
+SCAN_LOCK = CONTEXT_DIR / ".scan.lock"
+
+# Root of the mounted tRPC router tree (server/routers.ts)
+ROOT_ROUTER = "appRouter"
+
+# Scan patterns, compiled once
+ROUTE_RE = re.compile(r'<Route\s+path=["\']([^"\']+)["\']')
+ISSUE_LINE_RE = re.compile(r'^[\-\*\d\.]+\s+(.+)$')
+SECTION_HEADING_RE = re.compile(r'^##\s+(.+)$')
+
+
+def iter_line_matches(path, pattern):
+    """Stream pattern matches line by line; reading stops when the caller stops iterating"""
+    with open(path, 'r') as f:
+        for line in f:
+            match = pattern.match(line)
+            if match:
+                yield match
+
+
+def iter_sections(path, pattern=SECTION_HEADING_RE):
+    """Stream (heading, first non-blank body line) pairs from a markdown file"""
+    heading = None
+    with open(path, 'r') as f:
+        for line in f:
+            match = pattern.match(line)
+            if match:
+                if heading is not None:
+                    yield heading, ""
+                heading = match.group(1).strip()
+            elif heading is not None and line.strip():
+                yield heading, line.strip()
+                heading = None
+    if heading is not None:
+        yield heading, ""
+
+
+def scan_routes(router_file):
+    """Scan the client's wouter <Route path=...> table for routes"""
     routes = []
-    app_dir = client_dir / "src" / "app"
     
-    if not app_dir.exists():
+    if not router_file.exists():
         return routes
     
-    for path in app_dir.rglob("page.tsx"):
-        # Get route from path
-        route_path = path.relative_to(app_dir).parent
-        if route_path == Path("."):
-            route = "/"
-        else:
-            route = "/" + str(route_path).replace("\\", "/")
+    content = router_file.read_text()
+    seen = set()
+    for match in ROUTE_RE.finditer(content):
+        route = match.group(1)
+        if route in seen:
+            continue
+        seen.add(route)
         
         routes.append({
             "route": route,
-            "file": str(path.relative_to(TERP_ROOT)),
+            "file": str(router_file.relative_to(TERP_ROOT)),
+            "line": content.count("\n", 0, match.start()) + 1,
             "type": "page"
         })
     
     return routes
 
 
-def scan_api_endpoints(server_dir):
-    """Scan server directory for API endpoints"""
-    endpoints = []
-    routes_dir = server_dir / "src" / "routes"
+def refresh_codebase_analysis():
+    """Bring the shared per-file analysis up to date (incremental, cheap when warm)"""
+    try:
+        result = subprocess.run(
+            [sys.executable, str(ANALYZER)],
+            capture_output=True, text=True, timeout=600
+        )
+        if result.returncode != 0:
+            print(f"  ⚠️  Codebase analysis failed, using last snapshot: {result.stderr.strip()[-200:]}")
+    except Exception as e:
+        print(f"  ⚠️  Could not run codebase analysis, using last snapshot: {e}")
+
+
+def load_snapshot_generation():
+    """Generation of the current codebase snapshot, or None"""
+    try:
+        with open(SNAPSHOT_META_JSON, 'r') as f:
+            return json.load(f).get("generation")
+    except (OSError, ValueError):
+        return None
+
+
+def build_api_map(files):
+    """
+    Flatten per-file tRPC router extractions into procedure records
+
+    Procedure paths follow the router mounts from ROOT_ROUTER, so they
+    match what clients call (e.g. "inventory.batches.list"). A procedure
+    only reachable through a re-export (`list: coreRouter.list`) takes the
+    re-exporting path; one that is never reachable keeps a
+    "<router>.<procedure>" path.
+    """
+    routers = {}
+    for path_str, analysis in files.items():
+        # Copies of server code under docs/ must not shadow the real routers
+        if not path_str.startswith(f"{SERVER_DIR.name}/"):
+            continue
+        for router in analysis.get("trpc_routers", []):
+            routers.setdefault(router["name"], dict(router, file=path_str))
+    
+    prefixes = {}
+    queue = [(ROOT_ROUTER, "")]
+    while queue:
+        name, prefix = queue.pop(0)
+        if name in prefixes or name not in routers:
+            continue
+        prefixes[name] = prefix
+        for key, child in routers[name]["mounts"].items():
+            queue.append((child, f"{prefix}{key}."))
+    
+    reexported = {}
+    for name, prefix in prefixes.items():
+        for key, target in routers[name].get("reexports", {}).items():
+            reexported.setdefault(target, prefix + key)
+    
+    procedures = []
+    for name, router in sorted(routers.items()):
+        for procedure in router["procedures"]:
+            if name in prefixes:
+                path = prefixes[name] + procedure["name"]
+            else:
+                path = reexported.get(f"{name}.{procedure['name']}", f"{name}.{procedure['name']}")
+            procedures.append({
+                "path": path,
+                "type": procedure["type"],
+                "access": procedure["access"],
+                "protected": procedure["access"] != "public",
+                "input": procedure["input"],
+                "permissions": procedure["permissions"],
+                "router": name,
+                "mounted": name in prefixes or f"{name}.{procedure['name']}" in reexported,
+                "file": router["file"],
+                "line": procedure["line"]
+            })
     
-    if not routes_dir.exists():
-        return endpoints
+    procedures.sort(key=lambda p: p["path"])
+    return procedures
+
+
+def scan_trpc_procedures():
+    """
+    Inventory every tRPC procedure from the shared analysis cache
+
+    analyze-codebase.py extracts routers per file and caches them by
+    content, so only changed files are re-read. The flattened map is cached
+    in API_MAP_JSON per snapshot generation.
+    """
+    refresh_codebase_analysis()
+    generation = load_snapshot_generation()
     
-    for path in routes_dir.rglob("*.ts"):
-        # Read file to find route definitions
-        try:
-            with open(path, 'r') as f:
-                content = f.read()
-                
-            # Look for router.get, router.post, etc.
-            import re
-            patterns = [
-                r'router\.(get|post|put|delete|patch)\([\'"]([^\'"]+)',
-                r'app\.(get|post|put|delete|patch)\([\'"]([^\'"]+)',
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                for method, route in matches:
-                    endpoints.append({
-                        "method": method.upper(),
-                        "path": route,
-                        "file": str(path.relative_to(TERP_ROOT))
-                    })
-        except Exception as e:
-            continue
+    if generation is not None and API_MAP_JSON.exists():
+        with open(API_MAP_JSON, 'r') as f:
+            api_map = json.load(f)
+        if api_map.get("generation") == generation:
+            return api_map["procedures"]
+    
+    if not SNAPSHOT_JSON.exists():
+        print("  ⚠️  No codebase snapshot; run analyze-codebase.py")
+        return []
     
-    return endpoints
+    with open(SNAPSHOT_JSON, 'r') as f:
+        snapshot = json.load(f)
+    procedures = build_api_map(snapshot.get("files", {}))
+    
+    API_MAP_JSON.parent.mkdir(parents=True, exist_ok=True)
+    with open(API_MAP_JSON, 'w') as f:
+        json.dump({"generation": snapshot.get("generation"), "procedures": procedures}, f, indent=2)
+    
+    return procedures
 
 
 def scan_components(client_dir):
@@ -165,18 +301,13 @@ def parse_known_issues(known_issues_file):
         return issues
     
     try:
-        with open(known_issues_file, 'r') as f:
-            content = f.read()
-        
-        # Simple parsing - look for list items or headings
-        import re
         # Match lines starting with - or * or numbered lists
-        issue_lines = re.findall(r'^[\-\*\d\.]+\s+(.+)$', content, re.MULTILINE)
+        issue_lines = iter_line_matches(known_issues_file, ISSUE_LINE_RE)
         
-        for i, line in enumerate(issue_lines[:10]):  # Limit to 10
+        for i, match in enumerate(islice(issue_lines, 10)):  # Limit to 10
             issues.append({
                 "id": f"ISSUE-{i+1:03d}",
-                "title": line.strip(),
+                "title": match.group(1).strip(),
                 "severity": "unknown"
             })
     except Exception as e:
@@ -193,21 +324,11 @@ def parse_recent_changes(changelog_file):
         return changes
     
     try:
-        with open(changelog_file, 'r') as f:
-            content = f.read()
-        
-        # Look for version headings or date headings
-        import re
-        # Match markdown headings with dates or versions
-        sections = re.split(r'^##\s+', content, flags=re.MULTILINE)
-        
-        for section in sections[1:6]:  # Get last 5 sections
-            lines = section.split('\n')
-            title = lines[0].strip()
-            
+        # Newest entries come first, so only the top 5 sections are read
+        for title, summary in islice(iter_sections(changelog_file), 5):
             changes.append({
                 "title": title,
-                "summary": lines[1].strip() if len(lines) > 1 else ""
+                "summary": summary
             })
     except Exception as e:
         pass
@@ -223,74 +344,163 @@ def extract_bible_protocols(bible_file):
         return protocols
     
     try:
-        with open(bible_file, 'r') as f:
-            content = f.read()
-        
         # Look for major section headings
-        import re
-        headings = re.findall(r'^##\s+(.+)$', content, flags=re.MULTILINE)
+        headings = iter_line_matches(bible_file, SECTION_HEADING_RE)
         
-        for heading in headings[:10]:  # Top 10 protocols
-            protocols.append(heading.strip())
+        for match in islice(headings, 10):  # Top 10 protocols
+            protocols.append(match.group(1).strip())
     except Exception as e:
         pass
     
     return protocols
 
 
+def fingerprint(paths):
+    """
+    Cheap change key for a scanner's inputs
+
+    Files contribute (mtime_ns, size). Directories contribute the mtimes of
+    every directory beneath them, which change whenever an entry is added,
+    removed or renamed - all a listing-based scanner depends on.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            digest.update(f"{path}:missing;".encode())
+            continue
+        digest.update(f"{path}:{st.st_mtime_ns}:{st.st_size};".encode())
+        if path.is_dir():
+            for root, dirs, _ in os.walk(path):
+                dirs.sort()
+                for name in dirs:
+                    try:
+                        digest.update(f"{name}:{os.stat(os.path.join(root, name)).st_mtime_ns};".encode())
+                    except OSError:
+                        pass
+    return digest.hexdigest()
+
+
+# name -> (label, scanner, inputs). Inputs of None means the scanner keeps
+# its own cache (the tRPC scan is keyed on the analyzer snapshot generation).
+SCANNERS = {
+    "routes": ("📄 Scanning routes", lambda: scan_routes(CLIENT_ROUTER_FILE), [CLIENT_ROUTER_FILE]),
+    "api_endpoints": ("🔌 Scanning tRPC procedures", scan_trpc_procedures, None),
+    "components": ("🧩 Scanning components", lambda: scan_components(CLIENT_DIR), [CLIENT_DIR / "src" / "components"]),
+    "tech_stack": ("📦 Analyzing tech stack", lambda: scan_tech_stack(TERP_ROOT),
+                   [TERP_ROOT / "client" / "package.json", TERP_ROOT / "server" / "package.json"]),
+    "known_issues": ("⚠️  Parsing known issues", lambda: parse_known_issues(KNOWN_ISSUES), [KNOWN_ISSUES]),
+    "recent_changes": ("📝 Parsing recent changes", lambda: parse_recent_changes(CHANGELOG), [CHANGELOG]),
+    "bible_protocols": ("📖 Extracting Bible protocols", lambda: extract_bible_protocols(BIBLE), [BIBLE]),
+}
+
+
+def load_scan_cache():
+    """Load per-scanner results keyed by input fingerprint"""
+    try:
+        with open(SCAN_CACHE_JSON, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@contextmanager
+def locked(f):
+    """Hold an exclusive lock on an open file (cross-platform)"""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    elif msvcrt:
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield f
+    finally:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        elif msvcrt:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json_atomic(path, data):
+    """Write JSON via a temp file so concurrent readers never see a partial file"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def run_scanner(name, cache):
+    """Run one scanner, reusing its cached result when the inputs are unchanged"""
+    _, scanner, inputs = SCANNERS[name]
+    key = fingerprint(inputs) if inputs is not None else None
+    
+    entry = cache.get(name)
+    if key is not None and entry and entry.get("fingerprint") == key:
+        return entry["result"], key, True
+    
+    return scanner(), key, False
+
+
 def scan_codebase():
-    """Perform full codebase scan"""
+    """
+    Perform full codebase scan
+
+    The scanners are independent and run concurrently; each result is
+    cached against a fingerprint of its inputs, so a rescan of an unchanged
+    tree only stats files. Concurrent scans are serialised on SCAN_LOCK.
+    """
     print("🔍 Scanning TERP codebase...")
     
     # Create context directory
     CONTEXT_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Scan different aspects
-    print("  📄 Scanning routes...")
-    routes = scan_routes(CLIENT_DIR)
-    
-    print("  🔌 Scanning API endpoints...")
-    api_endpoints = scan_api_endpoints(SERVER_DIR)
-    
-    print("  🧩 Scanning components...")
-    components = scan_components(CLIENT_DIR)
-    
-    print("  📦 Analyzing tech stack...")
-    tech_stack = scan_tech_stack(TERP_ROOT)
-    
-    print("  ⚠️  Parsing known issues...")
-    known_issues = parse_known_issues(KNOWN_ISSUES)
-    
-    print("  📝 Parsing recent changes...")
-    recent_changes = parse_recent_changes(CHANGELOG)
-    
-    print("  📖 Extracting Bible protocols...")
-    bible_protocols = extract_bible_protocols(BIBLE)
-    
-    # Build system state
-    system_state = {
-        "last_updated": datetime.utcnow().isoformat() + "Z",
-        "routes": routes,
-        "api_endpoints": api_endpoints,
-        "components": {
-            "count": len(components),
-            "major_components": [c["name"] for c in components[:20]]
-        },
-        "tech_stack": tech_stack,
-        "known_issues": known_issues,
-        "recent_changes": recent_changes,
-        "bible_protocols": bible_protocols,
-        "statistics": {
-            "total_routes": len(routes),
-            "total_api_endpoints": len(api_endpoints),
-            "total_components": len(components),
-            "total_known_issues": len(known_issues)
+    with open(SCAN_LOCK, 'a') as lock, locked(lock):
+        cache = load_scan_cache()
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(SCANNERS)) as pool:
+            futures = {pool.submit(run_scanner, name, cache): name for name in SCANNERS}
+            for future in as_completed(futures):
+                name = futures[future]
+                result, key, cached = future.result()
+                results[name] = result
+                if key is not None:
+                    cache[name] = {"fingerprint": key, "result": result}
+                print(f"  {SCANNERS[name][0]}{' (cached)' if cached else ''}...")
+        
+        write_json_atomic(SCAN_CACHE_JSON, cache)
+        
+        routes = results["routes"]
+        api_endpoints = results["api_endpoints"]
+        components = results["components"]
+        known_issues = results["known_issues"]
+        
+        # Build system state
+        system_state = {
+            "last_updated": datetime.utcnow().isoformat() + "Z",
+            "routes": routes,
+            "api_endpoints": api_endpoints,
+            "components": {
+                "count": len(components),
+                "major_components": [c["name"] for c in components[:20]],
+                "all": [{"name": c["name"], "file": c["file"]} for c in components]
+            },
+            "tech_stack": results["tech_stack"],
+            "known_issues": known_issues,
+            "recent_changes": results["recent_changes"],
+            "bible_protocols": results["bible_protocols"],
+            "statistics": {
+                "total_routes": len(routes),
+                "total_api_endpoints": len(api_endpoints),
+                "total_mutations": sum(1 for e in api_endpoints if e["type"] == "mutation"),
+                "total_public_endpoints": sum(1 for e in api_endpoints if not e["protected"]),
+                "total_components": len(components),
+                "total_known_issues": len(known_issues)
+            }
         }
-    }
-    
-    # Save JSON
-    with open(SYSTEM_STATE_JSON, 'w') as f:
-        json.dump(system_state, f, indent=2)
+        
+        # Save JSON
+        write_json_atomic(SYSTEM_STATE_JSON, system_state)
     
     print(f"\n✅ System state saved to: {SYSTEM_STATE_JSON}")
     
@@ -338,7 +548,7 @@ The TERP system is a comprehensive ERP platform built with modern web technologi
     summary += f"\n### API Endpoints ({system_state['statistics']['total_api_endpoints']})\n"
     
     for endpoint in system_state['api_endpoints'][:15]:
-        summary += f"- `{endpoint['method']} {endpoint['path']}` - {endpoint['file']}\n"
+        summary += f"- `{endpoint['type']} {endpoint['path']}` ({endpoint['access']}) - {endpoint['file']}:{endpoint['line']}\n"
     
     if len(system_state['api_endpoints']) > 15:
         summary += f"- ... and {len(system_state['api_endpoints']) - 15} more\n"
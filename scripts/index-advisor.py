@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Missing-index advisor driven by actual query usage
+
+Parses the mysqlTable definitions in drizzle/schema*.ts for their columns
+and existing indexes, counts how often each column is filtered, joined
+or sorted on across server/**/*.ts, and ranks the unindexed ones into a
+ready-to-review index plan.
+
+Usage:
+    python3 scripts/index-advisor.py
+    python3 scripts/index-advisor.py --top 40 --min-uses 5
+    python3 scripts/index-advisor.py --json index-plan.json
+    python3 scripts/smart-add-indexes.py --plan index-plan.json
+"""
+
+import argparse
+import json
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_GLOB = "drizzle/schema*.ts"
+SERVER_DIR = "server"
+
+# Files whose queries don't reach production
+SKIP_PARTS = {"__tests__", "node_modules", "scripts", "seed"}
+SKIP_SUFFIXES = (".test.ts", ".spec.ts")
+
+# Ranking weights per kind of use; IS NULL checks (soft-delete filters)
+# and boolean columns rarely narrow a scan on their own
+USE_WEIGHTS = {"filter": 1.0, "join": 1.0, "order": 0.5, "null_check": 0.25}
+LOW_SELECTIVITY_TYPES = {"boolean"}
+LOW_SELECTIVITY_WEIGHT = 0.25
+
+# Co-filtered column pairs seen at least this often suggest a composite index
+MIN_PAIR_USES = 3
+
+TABLE_RE = re.compile(r"export const (\w+) = mysqlTable\(\s*[\"'](\w+)[\"']\s*,\s*\{")
+COLUMN_RE = re.compile(r"^\s*(\w+)\s*:\s*(\w+)\(\s*[\"'](\w+)[\"']")
+INDEX_RE = re.compile(r"\b(index|uniqueIndex|primaryKey|unique)\(([^)]*)\)(?:\s*\.on\(([^)]*)\))?")
+TABLE_REF_RE = re.compile(r"\b(\w+)\.(\w+)\b")
+FILTER_RE = re.compile(
+    r"\b(eq|ne|gt|gte|lt|lte|inArray|notInArray|like|isNull|isNotNull|between)\(\s*"
+    r"(\w+)\.(\w+)\s*(?:,\s*(\w+)\.(\w+)\s*)?[,)]"
+)
+CLAUSE_RE = re.compile(r"\.(where|orderBy|groupBy)\(|\bwhere\s*:")
+CALL_RE = re.compile(r"\s*\w+\(")
+STRING_OR_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"", re.S)
+
+
+def balanced(text: str, start: int, open_char: str, close_char: str) -> int:
+    """Index just past the bracket matching text[start] (strings skipped)"""
+    depth = 0
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char in "'\"`":
+            end = text.find(char, i + 1)
+            while end != -1 and text[end - 1] == "\\":
+                end = text.find(char, end + 1)
+            i = len(text) if end == -1 else end + 1
+            continue
+        if char == open_char:
+            depth += 1
+        elif char == close_char:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(text)
+
+
+def split_top_level(body: str) -> list:
+    """Split an object/array body on commas that are not nested"""
+    parts = []
+    depth = 0
+    current = 0
+    for i, char in enumerate(body):
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(body[current:i])
+            current = i + 1
+    parts.append(body[current:])
+    return [p for p in parts if p.strip()]
+
+
+def snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def parse_schema() -> dict:
+    """
+    Tables keyed by their exported variable name
+
+    Each table records its SQL name, defining file, columns with their
+    types, the leading column sets that existing indexes (primary key,
+    unique, index, uniqueIndex, foreign key) already cover, and the columns
+    that are unique on their own.
+    """
+    tables = {}
+    for schema_file in sorted(REPO_ROOT.glob(SCHEMA_GLOB)):
+        content = STRING_OR_COMMENT_RE.sub(
+            lambda m: m.group() if m.group()[0] in "'\"" else " " * len(m.group()),
+            schema_file.read_text()
+        )
+        for match in TABLE_RE.finditer(content):
+            var_name, sql_name = match.groups()
+            columns_start = match.end() - 1
+            columns_end = balanced(content, columns_start, "{", "}")
+            call_end = balanced(content, content.rfind("(", 0, columns_start), "(", ")")
+
+            columns = {}
+            types = {}
+            covered = set()
+            unique = set()
+            for entry in split_top_level(content[columns_start + 1:columns_end - 1]):
+                column = COLUMN_RE.match(entry)
+                if not column:
+                    continue
+                name, column_type, sql_column = column.groups()
+                columns[name] = sql_column
+                types[name] = column_type
+                if ".primaryKey()" in entry or ".unique()" in entry:
+                    unique.add(name)
+                # InnoDB indexes foreign keys on its own
+                if name in unique or ".references(" in entry:
+                    covered.add((name,))
+
+            for index in INDEX_RE.finditer(content[columns_end:call_end]):
+                kind, args, on = index.groups()
+                source = on if on is not None else args
+                refs = tuple(col for _, col in TABLE_REF_RE.findall(source) if col in columns)
+                if kind in ("primaryKey", "unique") and not refs:
+                    continue
+                # An index covers every leading prefix of its columns
+                for length in range(1, len(refs) + 1):
+                    covered.add(refs[:length])
+                if kind in ("primaryKey", "unique", "uniqueIndex") and len(refs) == 1:
+                    unique.add(refs[0])
+
+            tables[var_name] = {
+                "sql_name": sql_name,
+                "file": str(schema_file.relative_to(REPO_ROOT)),
+                "columns": columns,
+                "types": types,
+                "covered": covered,
+                "unique": unique
+            }
+    return tables
+
+
+def server_files() -> list:
+    files = []
+    for path in sorted((REPO_ROOT / SERVER_DIR).rglob("*.ts")):
+        if SKIP_PARTS.intersection(path.parts) or path.name.endswith(SKIP_SUFFIXES):
+            continue
+        files.append(path)
+    return files
+
+
+def collect_usage(tables: dict) -> tuple:
+    """
+    Count filter / join / order uses per (table, column)
+
+    Returns (uses, pairs, examples): uses maps (table, column) to a Counter
+    of use kinds, pairs counts columns filtered together in one where
+    clause, and examples keeps the first few file:line locations.
+    """
+    uses = defaultdict(Counter)
+    pairs = Counter()
+    examples = defaultdict(list)
+
+    def known(table, column):
+        return table in tables and column in tables[table]["columns"]
+
+    for path in server_files():
+        content = path.read_text(errors="ignore")
+        if "eq(" not in content and ".orderBy(" not in content:
+            continue
+        rel = str(path.relative_to(REPO_ROOT))
+
+        for clause in CLAUSE_RE.finditer(content):
+            kind = clause.group(1) or "where"
+            if content[clause.end() - 1] == "(":
+                body = content[clause.end():balanced(content, clause.end() - 1, "(", ")") - 1]
+            else:
+                # Relational query API: where: and(...) / where: eq(...)
+                call = CALL_RE.match(content, clause.end())
+                if not call:
+                    continue
+                open_paren = call.end() - 1
+                body = content[open_paren:balanced(content, open_paren, "(", ")")]
+            line = content.count("\n", 0, clause.start()) + 1
+
+            if kind == "where":
+                filtered = defaultdict(list)
+                for ref in FILTER_RE.finditer(body):
+                    left = (ref.group(2), ref.group(3))
+                    right = (ref.group(4), ref.group(5))
+                    if known(*left) and right[0] and known(*right):
+                        use = "join"
+                    elif ref.group(1) in ("isNull", "isNotNull"):
+                        use = "null_check"
+                    else:
+                        use = "filter"
+                    for table, column in (left, right):
+                        if table and known(table, column):
+                            uses[(table, column)][use] += 1
+                            location = f"{rel}:{line}"
+                            if len(examples[(table, column)]) < 3 and location not in examples[(table, column)]:
+                                examples[(table, column)].append(location)
+                            if use == "filter" and column not in filtered[table]:
+                                filtered[table].append(column)
+                for table, columns in filtered.items():
+                    for i, first in enumerate(columns):
+                        for second in columns[i + 1:]:
+                            pairs[(table, first, second)] += 1
+            else:
+                for table, column in TABLE_REF_RE.findall(body):
+                    if known(table, column):
+                        uses[(table, column)]["order"] += 1
+
+        # Join conditions outside where(): .innerJoin(t, eq(a.x, t.y))
+        for join in re.finditer(r"\.(?:inner|left|right|full)Join\(", content):
+            body = content[join.end():balanced(content, join.end() - 1, "(", ")") - 1]
+            for ref in FILTER_RE.finditer(body):
+                for table, column in ((ref.group(2), ref.group(3)), (ref.group(4), ref.group(5))):
+                    if table and known(table, column):
+                        uses[(table, column)]["join"] += 1
+
+    return uses, pairs, examples
+
+
+def index_definition(table: dict, columns: tuple) -> str:
+    """Drizzle index entry in the style used by drizzle/schema.ts"""
+    key = columns[0] + "".join(c[:1].upper() + c[1:] for c in columns[1:]) + "Idx"
+    sql_columns = "_".join(snake_case(table["columns"][c]) for c in columns)
+    refs = ", ".join(f"table.{c}" for c in columns)
+    return f'{key}: index("idx_{snake_case(table["sql_name"])}_{sql_columns}").on({refs})'
+
+
+def build_plan(tables: dict, uses: dict, pairs: Counter, examples: dict,
+               min_uses: int, top: int) -> dict:
+    """Rank unindexed columns (and co-filtered pairs) by weighted use"""
+    candidates = []
+    for (table_name, column), counts in uses.items():
+        table = tables[table_name]
+        if (column,) in table["covered"]:
+            continue
+        total = sum(counts.values())
+        if total < min_uses:
+            continue
+        score = sum(USE_WEIGHTS[kind] * n for kind, n in counts.items())
+        if table["types"].get(column) in LOW_SELECTIVITY_TYPES:
+            score *= LOW_SELECTIVITY_WEIGHT
+        candidates.append({
+            "table": table_name,
+            "columns": [column],
+            "score": score,
+            "uses": dict(counts),
+            "examples": examples[(table_name, column)],
+            "index": index_definition(table, (column,))
+        })
+
+    for (table_name, first, second), count in pairs.items():
+        if count < max(min_uses, MIN_PAIR_USES):
+            continue
+        table = tables[table_name]
+        # A unique column already pins the row
+        if first in table["unique"] or second in table["unique"]:
+            continue
+        # Lead with the column filtered on more often
+        if uses[(table_name, second)]["filter"] > uses[(table_name, first)]["filter"]:
+            first, second = second, first
+        if (first, second) in table["covered"]:
+            continue
+        candidates.append({
+            "table": table_name,
+            "columns": [first, second],
+            "score": float(count),
+            "uses": {"filter_together": count},
+            "examples": [],
+            "index": index_definition(table, (first, second))
+        })
+
+    candidates.sort(key=lambda c: (-c["score"], c["table"], c["columns"]))
+    candidates = candidates[:top]
+
+    # Same shape as TABLES_TO_UPDATE in smart-add-indexes.py
+    plan_tables = {}
+    for candidate in candidates:
+        entry = plan_tables.setdefault(candidate["table"], {
+            "file": tables[candidate["table"]]["file"],
+            "indexes": []
+        })
+        entry["indexes"].append(candidate["index"])
+
+    return {
+        "generated": datetime.now().isoformat(),
+        "tables_parsed": len(tables),
+        "candidates": candidates,
+        "tables": plan_tables
+    }
+
+
+def print_plan(plan: dict):
+    print("=" * 80)
+    print("INDEX ADVISOR")
+    print("=" * 80)
+    print(f"\nParsed {plan['tables_parsed']} tables; "
+          f"{len(plan['candidates'])} unindexed column set(s) ranked by use\n")
+
+    for rank, candidate in enumerate(plan["candidates"], 1):
+        columns = ", ".join(candidate["columns"])
+        uses = ", ".join(f"{kind} {n}" for kind, n in sorted(candidate["uses"].items()))
+        print(f"{rank:>3}. {candidate['table']}({columns})  score {candidate['score']:g}  [{uses}]")
+        print(f"     {candidate['index']}")
+        for example in candidate["examples"]:
+            print(f"       e.g. {example}")
+
+    print(f"\n{'=' * 80}")
+    print("Review each entry before applying; small lookup tables rarely need one.")
+    print(f"{'=' * 80}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank missing indexes by query usage")
+    parser.add_argument("--top", type=int, default=25, help="Candidates to list (default: 25)")
+    parser.add_argument("--min-uses", type=int, default=2,
+                        help="Ignore columns used fewer times than this (default: 2)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the plan as JSON")
+    args = parser.parse_args()
+
+    tables = parse_schema()
+    uses, pairs, examples = collect_usage(tables)
+    plan = build_plan(tables, uses, pairs, examples, args.min_uses, args.top)
+    print_plan(plan)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(plan, f, indent=2)
+        print(f"Plan written to {args.json}")
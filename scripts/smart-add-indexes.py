@@ -1,10 +1,21 @@
 #!/usr/bin/env python3
 """
 Smart index addition using AST-like parsing
-Adds indexes to the 10 priority tables
+Adds indexes to the 10 priority tables, or to the tables in an index plan
+written by index-advisor.py:
+
+    python3 scripts/index-advisor.py --json index-plan.json
+    python3 scripts/smart-add-indexes.py --plan index-plan.json
 """
 
+import argparse
+import json
 import re
+from collections import defaultdict
+
+# Splits a line into code and an optional trailing // comment, skipping
+# "//" inside string literals
+LINE_COMMENT_RE = re.compile(r"""((?:[^/"'\n]|"[^"\n]*"|'[^'\n]*'|/(?!/))*)(\s*//.*)?$""")
 
 # Priority tables with their indexes
 TABLES_TO_UPDATE = {
@@ -60,23 +71,21 @@ TABLES_TO_UPDATE = {
     },
 }
 
-def add_indexes_to_schema():
+def add_indexes_to_schema(tables_to_update=TABLES_TO_UPDATE, schema_path="drizzle/schema.ts"):
     """Add indexes to all priority tables."""
     
-    schema_path = "drizzle/schema.ts"
-    
     with open(schema_path, 'r') as f:
         content = f.read()
     
     print("="*80)
     print("SMART INDEX ADDITION")
     print("="*80)
-    print(f"\nProcessing {len(TABLES_TO_UPDATE)} tables...\n")
+    print(f"\nProcessing {len(tables_to_update)} tables in {schema_path}...\n")
     
     modified_content = content
     success_count = 0
     
-    for table_name, table_info in TABLES_TO_UPDATE.items():
+    for table_name, table_info in tables_to_update.items():
         print(f"Processing: {table_name}")
         
         # Pattern to match the table definition
@@ -126,31 +135,40 @@ def add_indexes_to_schema():
         
         table_def = modified_content[start_pos:end_pos + 1]
         
-        # Check if it already has indexes
-        if '(table) => ({' in table_def and 'index(' in table_def:
-            print(f"  ⚠️  Table already has indexes, skipping")
-            continue
-        
-        # Check if it has the index parameter but no indexes
-        if '(table) => ({' in table_def and 'index(' not in table_def:
-            # Add to existing index section
-            # Find the closing })
-            index_section_match = re.search(r'\(table\) => \(\{([^}]*)\}\)', table_def, re.DOTALL)
-            if index_section_match:
-                existing_content = index_section_match.group(1)
-                new_indexes = '\n    ' + ',\n    '.join(table_info['indexes'])
-                new_index_section = f'(table) => ({{{existing_content}{new_indexes}\n  }})'
-                new_table_def = table_def.replace(index_section_match.group(), new_index_section)
-                modified_content = modified_content.replace(table_def, new_table_def)
-                print(f"  ✅ Added {len(table_info['indexes'])} index(es) to existing section")
+        # Append to an existing index section, skipping indexes whose
+        # name is already declared
+        index_section_match = re.search(r'\(?table\)? => \(\{(.*)\}\)\s*\);?\s*$', table_def, re.DOTALL)
+        if index_section_match:
+            new_indexes = [
+                definition for definition in table_info['indexes']
+                if re.search(r'index\("(\w+)"\)', definition).group(1) not in table_def
+            ]
+            if not new_indexes:
+                print(f"  ⚠️  Table already has these indexes, skipping")
                 success_count += 1
                 continue
+            existing_content = index_section_match.group(1).rstrip()
+            # A trailing // comment on the last index hides its real line
+            # end; the separator goes before the comment, not inside it
+            comment = LINE_COMMENT_RE.match(existing_content.rsplit('\n', 1)[-1]).group(2) or ''
+            code = existing_content[:len(existing_content) - len(comment)].rstrip()
+            separator = '' if code.endswith(('{', ',')) else ','
+            if comment:
+                comment = ' ' + comment.strip()
+            new_content = (code + separator + comment + '\n    '
+                           + ',\n    '.join(new_indexes) + ',\n  ')
+            start, end = index_section_match.span(1)
+            new_table_def = table_def[:start] + new_content + table_def[end:]
+            modified_content = modified_content.replace(table_def, new_table_def)
+            print(f"  ✅ Added {len(new_indexes)} index(es) to existing section")
+            success_count += 1
+            continue
         
         # No indexes at all - add new index section
         # Find the closing }); and insert before it
         # The pattern is: }, \n);  or just });
         
-        closing_pattern = r'(\s*}\s*,?\s*)\);'
+        closing_pattern = r'\}\s*\);(\s*)$'
         closing_match = re.search(closing_pattern, table_def)
         
         if not closing_match:
@@ -159,10 +177,10 @@ def add_indexes_to_schema():
         
         # Build the index section
         index_lines = ',\n    '.join(table_info['indexes'])
-        index_section = f'}},\n  (table) => ({{\n    {index_lines}\n  }}\n);'
+        index_section = f'}},\n  table => ({{\n    {index_lines},\n  }})\n);{closing_match.group(1)}'
         
         # Replace the closing
-        new_table_def = re.sub(closing_pattern, index_section, table_def)
+        new_table_def = table_def[:closing_match.start()] + index_section
         
         # Replace in content
         modified_content = modified_content.replace(table_def, new_table_def)
@@ -170,16 +188,35 @@ def add_indexes_to_schema():
         print(f"  ✅ Added {len(table_info['indexes'])} index(es)")
         success_count += 1
     
+    # index() has to be imported from drizzle-orm/mysql-core
+    core_import = re.search(r'import \{([^}]*)\} from "drizzle-orm/mysql-core";', modified_content)
+    if success_count and core_import and not re.search(r'\bindex\b', core_import.group(1)):
+        names = core_import.group(1).rstrip().rstrip(',')
+        modified_content = (modified_content[:core_import.start(1)] + names + ',\n  index,\n'
+                            + modified_content[core_import.end(1):])
+    
     # Write back
     with open(schema_path, 'w') as f:
         f.write(modified_content)
     
     print(f"\n{'='*80}")
-    print(f"COMPLETE: Successfully updated {success_count}/{len(TABLES_TO_UPDATE)} tables")
+    print(f"COMPLETE: Successfully updated {success_count}/{len(tables_to_update)} tables")
     print(f"{'='*80}\n")
     
-    return success_count == len(TABLES_TO_UPDATE)
+    return success_count == len(tables_to_update)
 
 if __name__ == "__main__":
-    success = add_indexes_to_schema()
+    parser = argparse.ArgumentParser(description="Add indexes to drizzle schema tables")
+    parser.add_argument("--plan", help="Index plan JSON from index-advisor.py (default: built-in list)")
+    args = parser.parse_args()
+    
+    if args.plan:
+        with open(args.plan) as f:
+            plan = json.load(f)
+        by_file = defaultdict(dict)
+        for table_name, table_info in plan["tables"].items():
+            by_file[table_info.get("file", "drizzle/schema.ts")][table_name] = table_info
+        success = all([add_indexes_to_schema(tables, path) for path, tables in sorted(by_file.items())])
+    else:
+        success = add_indexes_to_schema()
     exit(0 if success else 1)